@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Assessment Throughput Harness
+
+This script:
+1. Generates a seeded benchmark_questions.csv.
+2. Puts a mock `claude` (mock_claude.py) first on PATH, optionally backed by
+   the persistent mock daemon, with the requested latency distribution and
+   failure/timeout rates.
+3. Runs tools/benchmark_assessor.py on it unchanged, as the pipeline would.
+4. Reads the mock's call log and the results CSV and reports questions/second,
+   per-call latency percentiles, outcomes, retries and error rows.
+
+Arguments after `--` are passed to the assessor.
+
+Usage:
+    python benchmarks/assessment_throughput.py --questions 50 --median-ms 200 --failure-rate 0.05
+    python benchmarks/assessment_throughput.py --daemon --max-concurrency 4 -- --timeout 5
+    python benchmarks/assessment_throughput.py --startup-ms 1500 -- --backend pool --workers 4
+    python benchmarks/assessment_throughput.py --batch-drop-rate 0.1 -- --workers 4 --judge-batch 8
+"""
+
+import os
+import sys
+import csv
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_DIR / "tools"))
+
+from generators import make_notebook, make_questions  # noqa: E402
+from json_backend import dump_path, loads  # noqa: E402
+from llm_metrics import load_metrics, percentile, summarize_by  # noqa: E402
+from mock_claude import write_shim  # noqa: E402
+
+QUESTION_FIELDS = [
+    "question_id",
+    "tutorial_id",
+    "tutorial_path",
+    "question",
+    "ground_truth",
+    "answer_type",
+    "cell_id",
+]
+
+
+def latency_summary(values: List[float]) -> Dict[str, Any]:
+    return {
+        "count": len(values),
+        **{f"p{p}": round(percentile(values, p), 4) if values else None for p in (50, 95, 99)},
+        "max": round(max(values), 4) if values else None,
+    }
+
+
+def write_questions(path: Path, count: int, seed: int):
+    notebook = make_notebook(cells=max(8, count), output_lines=5, images=0, seed=seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=QUESTION_FIELDS)
+        writer.writeheader()
+        for i, q in enumerate(make_questions(notebook, count=count, seed=seed)):
+            writer.writerow(
+                {
+                    "question_id": f"q{i + 1:04d}",
+                    "tutorial_id": f"tutorial_{i % 5}",
+                    "tutorial_path": f"notebooks/tutorial_{i % 5}",
+                    "question": f"{q['question']} (question {i + 1})",
+                    "ground_truth": q["ground_truth"],
+                    "answer_type": "numeric",
+                    "cell_id": q["cell_id"],
+                }
+            )
+
+
+def max_concurrency(calls: List[Dict[str, Any]]) -> int:
+    """Most calls in flight at once (hanging calls are left out: the caller kills them)."""
+    events = []
+    for call in calls:
+        events.append((call["start"], 1))
+        events.append((call["end"], -1))
+    level = peak = 0
+    for _, delta in sorted(events):
+        level += delta
+        peak = max(peak, level)
+    return peak
+
+
+def analyze(calls: List[Dict[str, Any]], rows: List[Dict[str, str]], wall: float) -> Dict[str, Any]:
+    seen: Dict[str, int] = {}
+    for call in calls:
+        seen[call["prompt_sha256"]] = seen.get(call["prompt_sha256"], 0) + 1
+    outcomes: Dict[str, int] = {}
+    for call in calls:
+        outcomes[call["outcome"]] = outcomes.get(call["outcome"], 0) + 1
+    completed = [c for c in calls if c["end"] is not None]
+    by_kind = {}
+    for kind in sorted({c["kind"] for c in completed}):
+        by_kind[kind] = latency_summary([c["end"] - c["start"] for c in completed if c["kind"] == kind])
+
+    return {
+        "wall_seconds": round(wall, 3),
+        "questions": len(rows),
+        "questions_per_second": round(len(rows) / wall, 3) if wall else None,
+        "calls": len(calls),
+        "calls_per_question": round(len(calls) / len(rows), 3) if rows else None,
+        "calls_by_kind": {
+            kind: sum(1 for c in calls if c["kind"] == kind) for kind in sorted({c["kind"] for c in calls})
+        },
+        "outcomes": outcomes,
+        "retried_calls": sum(count - 1 for count in seen.values()),
+        "prompts_retried": sum(1 for count in seen.values() if count > 1),
+        "max_concurrency": max_concurrency(completed),
+        "queued_p95": latency_summary([c["queued"] for c in calls])["p95"],
+        "latency": latency_summary([c["end"] - c["start"] for c in completed]),
+        "latency_by_kind": by_kind,
+        "question_seconds": latency_summary(
+            [float(r["duration_seconds"]) for r in rows if r.get("duration_seconds")]
+        ),
+        "statuses": {
+            status: sum(1 for r in rows if r.get("status") == status)
+            for status in sorted({r.get("status", "") for r in rows})
+        },
+        "agent_errors": sum(1 for r in rows if r.get("status") == "agent_failed"),
+        "judge_failures": sum(
+            1 for r in rows if r.get("reasoning", "").startswith("Judge output parsing failed")
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test benchmark_assessor.py against a mock Claude CLI.")
+    parser.add_argument("--questions", type=int, default=50, help="Number of questions (default: 50)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for questions and the mock")
+    parser.add_argument(
+        "--distribution",
+        choices=["fixed", "lognormal", "exponential", "uniform"],
+        default="lognormal",
+        help="Mock latency distribution",
+    )
+    parser.add_argument("--median-ms", type=float, default=200, help="Median mock latency")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Lognormal sigma")
+    parser.add_argument("--min-ms", type=float, default=0, help="Uniform lower bound")
+    parser.add_argument("--max-ms", type=float, default=400, help="Uniform upper bound")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of calls that fail")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Share of calls that hang")
+    parser.add_argument("--hang-seconds", type=float, default=30, help="How long a hanging call hangs")
+    parser.add_argument(
+        "--startup-ms", type=float, default=0, help="Mock CLI start-up + MCP connect cost per process"
+    )
+    parser.add_argument(
+        "--batch-drop-rate", type=float, default=0.0, help="Share of items a batched judge answer omits"
+    )
+    parser.add_argument("--recordings", type=Path, help="Recorded responses (JSONL) to replay")
+    parser.add_argument("--daemon", action="store_true", help="Serve the mock from a persistent daemon")
+    parser.add_argument(
+        "--max-concurrency", type=int, default=0, help="Daemon: concurrent calls served (0 = unlimited)"
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--keep", action="store_true", help="Keep the work directory")
+    parser.add_argument("assessor_args", nargs=argparse.REMAINDER, help="-- extra assessor arguments")
+
+    args = parser.parse_args()
+    extra = args.assessor_args[1:] if args.assessor_args[:1] == ["--"] else args.assessor_args
+
+    work = Path(tempfile.mkdtemp(prefix="p2a_throughput_"))
+    log_path = work / "mock_calls.jsonl"
+    config = {
+        "log": str(log_path),
+        "seed": args.seed,
+        "latency": {
+            "distribution": args.distribution,
+            "median_ms": args.median_ms,
+            "sigma": args.sigma,
+            "min_ms": args.min_ms,
+            "max_ms": args.max_ms,
+        },
+        "failure_rate": args.failure_rate,
+        "timeout_rate": args.timeout_rate,
+        "hang_seconds": args.hang_seconds,
+        "max_concurrency": args.max_concurrency,
+        "startup_ms": args.startup_ms,
+        "batch_drop_rate": args.batch_drop_rate,
+    }
+    if args.recordings:
+        config["recordings"] = str(args.recordings.resolve())
+    config_path = work / "mock.json"
+    dump_path(config, config_path)
+
+    questions_csv = work / "benchmark_questions.csv"
+    results_csv = work / "results.csv"
+    write_questions(questions_csv, args.questions, args.seed)
+    write_shim(work / "bin")
+
+    env = {
+        **os.environ,
+        "PATH": f"{work / 'bin'}{os.pathsep}{os.environ.get('PATH', '')}",
+        "MOCK_CLAUDE_CONFIG": str(config_path),
+    }
+    daemon = None
+    if args.daemon:
+        socket_path = work / "mock.sock"
+        env["MOCK_CLAUDE_SOCKET"] = str(socket_path)
+        daemon = subprocess.Popen(
+            [sys.executable, str(BENCH_DIR / "mock_claude.py"), "serve", "--socket", str(socket_path)],
+            env=env,
+        )
+        deadline = time.time() + 10
+        while not socket_path.exists() and time.time() < deadline:
+            time.sleep(0.05)
+        if not socket_path.exists():
+            daemon.kill()
+            print("Error: mock daemon did not start", file=sys.stderr)
+            sys.exit(1)
+
+    cmd = [
+        sys.executable,
+        str(REPO_DIR / "tools" / "benchmark_assessor.py"),
+        "--input",
+        str(questions_csv),
+        "--output",
+        str(results_csv),
+        "--judge-agent",
+        str(REPO_DIR / "agents" / "benchmark-judge.md"),
+        "--agent-def",
+        str(REPO_DIR / "agents" / "benchmark-solver.md"),
+        *extra,
+    ]
+    print(f"Running assessor on {args.questions} questions against the mock ({work})...")
+    start = time.time()
+    try:
+        result = subprocess.run(cmd, env=env, cwd=work, capture_output=True, text=True)
+    finally:
+        wall_end = time.time()
+        if daemon:
+            daemon.terminate()
+            daemon.wait()
+    if result.returncode != 0:
+        print(f"Error: assessor exited with {result.returncode}:\n{result.stderr[-2000:]}", file=sys.stderr)
+        sys.exit(1)
+
+    calls = []
+    if log_path.exists():
+        calls = [loads(line) for line in log_path.read_text().splitlines() if line.strip()]
+    rows: List[Dict[str, str]] = []
+    if results_csv.exists():
+        with open(results_csv, "r", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+
+    report = analyze(calls, rows, wall_end - start)
+    metrics_path = work / "results_metrics.jsonl"
+    if metrics_path.exists():
+        report["metrics"] = summarize_by(load_metrics(metrics_path), "component")
+    report["config"] = {**config, "daemon": args.daemon, "assessor_args": extra}
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        dump_path(report, args.output)
+
+    latency = report["latency"]
+    print("\nSummary:")
+    print(f"  Questions:         {report['questions']} in {report['wall_seconds']:.2f}s")
+    print(f"  Throughput:        {report['questions_per_second']} questions/s")
+    print(f"  Calls:             {report['calls']} ({report['calls_per_question']} per question)")
+    print(f"  Calls by kind:     {report['calls_by_kind']}")
+    print(f"  Outcomes:          {report['outcomes']}")
+    print(f"  Retries:           {report['retried_calls']} calls for {report['prompts_retried']} prompts")
+    print(f"  Max concurrency:   {report['max_concurrency']}")
+    print(f"  Call latency:      p50 {latency['p50']}s  p95 {latency['p95']}s  p99 {latency['p99']}s")
+    print(f"  Row statuses:      {report['statuses']}")
+    if "metrics" in report:
+        totals = report["metrics"]["overall"]["totals"]
+        print(
+            f"  Tokens / cost:     {totals['input_tokens']} in, {totals['output_tokens']} out, "
+            f"${totals['cost_usd']:.4f}, {totals['tool_calls']} tool calls"
+        )
+    print(f"  Agent errors:      {report['agent_errors']}")
+    print(f"  Judge failures:    {report['judge_failures']}")
+    for line in result.stdout.splitlines():
+        for prefix in ("LLM backend:", "Scheduler:", "Judge batches:", "Sequential:"):
+            if prefix in line:
+                print(f"  {prefix:19s}{line.split(prefix, 1)[1].strip()}")
+
+    if args.keep:
+        print(f"  Work directory:    {work}")
+    else:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
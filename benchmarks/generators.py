@@ -0,0 +1,203 @@
+"""
+Seeded synthetic inputs for the tools/ benchmarks.
+
+Every generator takes a `seed` and returns the same content for the same
+arguments, so results are comparable across runs and machines.
+`notebook_postprocess.py benchmark` builds its fixture with make_notebook too.
+
+- make_notebook: executed notebook with markdown/code cells, stream and
+  execute_result outputs, PNG images, HTML and a few papermill error cells
+- make_module: Python tool module with configurable PII density (home paths,
+  emails, usernames, API keys, IP addresses) and scattered imports
+- make_questions: benchmark questions against a generated notebook, a mix of
+  exact, numeric and wrong ground truths
+"""
+
+import base64
+import random
+import string
+from typing import Any, Dict, List
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+def make_notebook(
+    cells: int = 200,
+    output_lines: int = 50,
+    images: int = 50,
+    image_kb: int = 64,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Executed notebook with `cells` cells (every fourth is markdown).
+
+    Each code cell has a stdout stream of `output_lines` lines and an
+    execute_result; `images` of them (spread evenly) also display a PNG of
+    roughly `image_kb` KB.
+    """
+    rng = random.Random(seed)
+    code_indices = [i for i in range(cells) if i % 4 != 0]
+    step = max(1, len(code_indices) // images) if images else 0
+    image_cells = set(code_indices[::step][:images]) if images else set()
+
+    nb_cells: List[Dict[str, Any]] = []
+    execution_count = 0
+    for i in range(cells):
+        if i % 4 == 0:
+            nb_cells.append(
+                {
+                    "cell_type": "markdown",
+                    "metadata": {},
+                    "source": [f"## Step {i}\n", "Some <b>bold</b> and <i>italic</i> text.\n"],
+                }
+            )
+            continue
+
+        execution_count += 1
+        outputs: List[Dict[str, Any]] = [
+            {
+                "output_type": "stream",
+                "name": "stdout",
+                "text": [
+                    f"epoch={j} loss={rng.random():.6f} acc={rng.uniform(0.5, 1):.4f}\n"
+                    for j in range(output_lines)
+                ]
+                + [f"saved to /home/user{rng.randint(1, 9)}/project/out_{i}.csv\n"],
+            },
+            {
+                "output_type": "execute_result",
+                "execution_count": execution_count,
+                "metadata": {},
+                "data": {
+                    "text/plain": [f"{rng.uniform(0, 1000):.4f}"],
+                    "text/html": [f"<div><table><tr><td>{i}</td></tr></table></div>"],
+                },
+            },
+        ]
+        if i in image_cells:
+            payload = PNG_HEADER + rng.randbytes(image_kb * 1024)
+            outputs.append(
+                {
+                    "output_type": "display_data",
+                    "metadata": {},
+                    "data": {
+                        "image/png": base64.b64encode(payload).decode("ascii"),
+                        "text/plain": ["<Figure size 640x480 with 1 Axes>"],
+                    },
+                }
+            )
+        cell: Dict[str, Any] = {
+            "cell_type": "code",
+            "execution_count": execution_count,
+            "metadata": {},
+            "outputs": outputs,
+            "source": [f"result_{i} = model.fit(data[{i}])\n", f"result_{i}.score()"],
+        }
+        if i % 50 == 49:
+            cell["metadata"]["papermill"] = {"exception": True}
+            cell["outputs"] = [
+                {
+                    "output_type": "error",
+                    "ename": "ValueError",
+                    "evalue": "bad input",
+                    "traceback": ["Traceback (most recent call last)", "ValueError: bad input"],
+                }
+            ]
+        nb_cells.append(cell)
+
+    return {
+        "cells": nb_cells,
+        "metadata": {
+            "kernelspec": {"display_name": "Python 3", "language": "python", "name": "python3"},
+            "language_info": {"name": "python"},
+        },
+        "nbformat": 4,
+        "nbformat_minor": 5,
+    }
+
+
+def _pii_line(rng: random.Random) -> str:
+    kind = rng.randrange(5)
+    name = "".join(rng.choices(string.ascii_lowercase, k=6))
+    if kind == 0:
+        return f'DATA_DIR = "/home/{name}/projects/data/{name}.h5ad"'
+    if kind == 1:
+        return f"# Contact: {name}.{name[:3]}@example-lab.org"
+    if kind == 2:
+        return f"# Maintained by @{name} (user: {name})"
+    if kind == 3:
+        key = "".join(rng.choices(string.ascii_letters + string.digits, k=48))
+        return f'API_TOKEN = "sk-{key}"'
+    return f'SERVER = "10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"'
+
+
+def make_module(functions: int = 100, pii_density: float = 0.05, seed: int = 0) -> str:
+    """
+    Python module of `functions` MCP-style tool functions.
+
+    About `pii_density` of all lines carry personal information; imports are
+    scattered between functions as generated tool code often has them.
+    """
+    rng = random.Random(seed)
+    modules = ["os", "sys", "json", "re", "pathlib", "typing", "numpy as np", "pandas as pd"]
+    lines: List[str] = ['"""Generated tools module."""', ""]
+    for i in range(functions):
+        if i % 10 == 0:
+            lines.append(f"import {rng.choice(modules)}")
+            lines.append("")
+        body = [
+            f"def tool_{i}(input_path: str, threshold: float = {rng.random():.3f}) -> dict:",
+            f'    """Run analysis step {i} on the input data."""',
+            "    data = load(input_path)",
+            f"    filtered = [x for x in data if x > threshold * {i + 1}]",
+            "    summary = {",
+            '        "count": len(filtered),',
+            f'        "name": "tool_{i}",',
+            "    }",
+            "    return summary",
+        ]
+        for line in body:
+            lines.append(line)
+            if pii_density and rng.random() < pii_density:
+                indent = "    " if line.startswith(" ") or line.startswith("def ") else ""
+                lines.append(indent + _pii_line(rng))
+        lines.extend(["", "", ""])
+    return "\n".join(lines) + "\n"
+
+
+def make_questions(notebook: Dict[str, Any], count: int = 100, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Questions against `notebook`'s code cells: exact ground truths taken from
+    the output, numeric ones that need the float fallback, and wrong ones.
+    """
+    rng = random.Random(seed)
+    code_cells = [
+        cell
+        for cell in notebook.get("cells", [])
+        if cell.get("cell_type") == "code" and cell.get("execution_count") is not None
+    ]
+    questions = []
+    for q in range(count):
+        cell = rng.choice(code_cells)
+        lines = [line for output in cell.get("outputs", []) for line in output.get("text", [])]
+        kind = q % 3
+        if kind == 0 and lines:
+            ground_truth = rng.choice(lines).strip()
+        elif kind == 1:
+            results = [
+                output["data"]["text/plain"][0]
+                for output in cell.get("outputs", [])
+                if output.get("output_type") == "execute_result"
+            ]
+            # Extra digits, so only the numeric comparison can match it
+            ground_truth = f"{float(results[0]):.6f}" if results else "0.000000"
+        else:
+            ground_truth = f"not present {rng.random():.8f}"
+        questions.append(
+            {
+                "question": f"What is reported in cell {cell['execution_count']}?",
+                "ground_truth": ground_truth,
+                "cell_id": cell["execution_count"],
+            }
+        )
+    return questions
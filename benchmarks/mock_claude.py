@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Mock Claude CLI
+
+A local stand-in for the `claude` binary used by benchmark_assessor.py and
+benchmark_reviewer.py, for offline load tests:
+1. Accepts the same command line (`--print --output-format json ... PROMPT`)
+   and prints a `--output-format json` style result object.
+2. Replays recorded responses: by exact prompt hash first, then by prompt kind
+   (solver / judge / judge_batch / reviewer), falling back to built-in canned answers.
+3. Sleeps for a latency drawn from a configurable distribution and fails or
+   hangs at configurable rates.
+4. Appends one JSON line per call (start, end, kind, outcome, prompt hash) to
+   a log, so harnesses can compute throughput, tail latency and retries.
+
+With `serve`, a persistent daemon holds the recordings and random state and
+answers over a Unix socket; the `claude` shim then only forwards its argv.
+The daemon can also cap concurrent calls to model a rate-limited backend.
+
+Configuration comes from the JSON file in MOCK_CLAUDE_CONFIG:
+    {"recordings": "calls.jsonl", "log": "mock_calls.jsonl", "seed": 0,
+     "latency": {"distribution": "lognormal", "median_ms": 800, "sigma": 0.5},
+     "failure_rate": 0.02, "timeout_rate": 0.01, "hang_seconds": 30,
+     "max_concurrency": 0, "startup_ms": 0, "tool_calls": 2,
+     "price_per_mtok": {"input": 3.0, "output": 15.0}, "batch_drop_rate": 0.0}
+"tool_calls" is the mean number of tool round trips in a solver answer.
+"batch_drop_rate" is the share of items a batched judge answer leaves out.
+"startup_ms" is paid once per process, like CLI start-up and the MCP server
+connection; with `--input-format stream-json` one process answers a message
+per stdin line, as the sessions of llm_backend.WorkerPoolBackend expect.
+MOCK_CLAUDE_SOCKET (or "socket" in the config) routes calls to the daemon.
+MOCK_CLAUDE_REAL + MOCK_CLAUDE_RECORD record real CLI calls for later replay.
+
+Usage:
+    python benchmarks/mock_claude.py --print --output-format json "prompt"
+    python benchmarks/mock_claude.py serve --config mock.json --socket /tmp/mock_claude.sock
+    python benchmarks/mock_claude.py shim bin/   # writes bin/claude for PATH
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import uuid
+import random
+import socket
+import hashlib
+import argparse
+import threading
+import subprocess
+import socketserver
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+CANNED = {
+    "solver": "Using the available tools, I ran the analysis. Final answer: 42",
+    "judge": '```json\n{"score": 1.0, "reasoning": "Mock judge: response matches."}\n```',
+}
+FAILURE_STDERR = "API Error: 529 {\"type\":\"error\",\"error\":{\"type\":\"overloaded_error\"}}"
+CANDIDATES_RE = re.compile(r"Candidate Questions:\s*(\[.*\])", re.DOTALL)
+BATCH_ITEMS_RE = re.compile(r"Items:\s*(\[.*\])\s*Return a JSON array", re.DOTALL)
+
+
+def prompt_kind(prompt: str) -> str:
+    if "Evaluate each of the following Agent Responses" in prompt:
+        return "judge_batch"
+    if "Evaluate the following Agent Response" in prompt:
+        return "judge"
+    if "Candidate Questions:" in prompt:
+        return "reviewer"
+    return "solver"
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def parse_cli_args(argv: List[str], read_stdin: bool = True) -> Tuple[str, str]:
+    """(prompt, output format) from a `claude` command line."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--model")
+    parser.add_argument("--output-format", default="text")
+    parser.add_argument("-p", "--print", action="store_true")
+    parser.add_argument("--dangerously-skip-permissions", action="store_true")
+    parser.add_argument("prompt", nargs="?", default="")
+    args, _ = parser.parse_known_args(argv)
+    prompt = args.prompt
+    if not prompt and read_stdin and not sys.stdin.isatty():
+        prompt = sys.stdin.read()
+    return prompt, args.output_format
+
+
+def load_config() -> Dict[str, Any]:
+    path = os.environ.get("MOCK_CLAUDE_CONFIG")
+    if not path:
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def draw_latency(rng: random.Random, latency: Dict[str, Any]) -> float:
+    """Seconds for one call."""
+    distribution = latency.get("distribution", "fixed")
+    median = latency.get("median_ms", 0) / 1000
+    if distribution == "lognormal":
+        return rng.lognormvariate(math.log(median), latency.get("sigma", 0.5)) if median else 0.0
+    if distribution == "exponential":
+        return rng.expovariate(math.log(2) / median) if median else 0.0
+    if distribution == "uniform":
+        return rng.uniform(latency.get("min_ms", 0) / 1000, latency.get("max_ms", 0) / 1000)
+    return median
+
+
+class Responder:
+    """Picks responses, latencies and outcomes for calls."""
+
+    def __init__(self, config: Dict[str, Any], seed_salt: int = 0):
+        self.config = config
+        self.rng = random.Random(config.get("seed", 0) * 1_000_003 + seed_salt)
+        self.by_hash: Dict[str, str] = {}
+        self.by_kind: Dict[str, List[str]] = {}
+        recordings = config.get("recordings")
+        if recordings and Path(recordings).exists():
+            with open(recordings, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    self.by_hash[entry["prompt_sha256"]] = entry["stdout"]
+                    self.by_kind.setdefault(entry.get("kind", "solver"), []).append(entry["stdout"])
+        self.lock = threading.Lock()
+
+    def plan(self, prompt: str) -> Dict[str, Any]:
+        """Decide outcome and latency of a call (thread-safe)."""
+        with self.lock:
+            roll = self.rng.random()
+            latency = draw_latency(self.rng, self.config.get("latency", {}))
+            pick = self.rng.random()
+            mean_tools = self.config.get("tool_calls", 2) if prompt_kind(prompt) == "solver" else 0
+            tools = self.rng.randint(0, 2 * mean_tools)
+        failure_rate = self.config.get("failure_rate", 0.0)
+        if roll < failure_rate:
+            outcome = "failure"
+        elif roll < failure_rate + self.config.get("timeout_rate", 0.0):
+            outcome = "timeout"
+            latency = self.config.get("hang_seconds", 3600)
+        else:
+            outcome = "ok"
+        return {"outcome": outcome, "latency": latency, "pick": pick, "tools": tools}
+
+    def respond(self, prompt: str, output_format: str, plan: Dict[str, Any]) -> Tuple[int, str, str]:
+        """(exit code, stdout, stderr) for a planned call."""
+        if plan["outcome"] == "failure":
+            return 1, "", FAILURE_STDERR
+        if plan["outcome"] == "timeout":
+            return 124, "", "Request timed out"
+
+        key = prompt_hash(prompt)
+        if key in self.by_hash:
+            return 0, self.by_hash[key], ""
+        kind = prompt_kind(prompt)
+        recorded = self.by_kind.get(kind)
+        if recorded:
+            return 0, recorded[int(plan["pick"] * len(recorded))], ""
+
+        text = self.canned(kind, prompt, plan)
+        if output_format == "stream-json":
+            return 0, "".join(json.dumps(event) + "\n" for event in self.events(prompt, text, plan)), ""
+        if output_format == "json":
+            return 0, json.dumps(self.events(prompt, text, plan)[-1]), ""
+        return 0, text + "\n", ""
+
+    def events(self, prompt: str, text: str, plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """stream-json events of a canned answer: init, tool round trips, text, result."""
+        session_id = str(uuid.UUID(int=int(prompt_hash(prompt)[:32], 16)))
+        events: List[Dict[str, Any]] = [{"type": "system", "subtype": "init", "session_id": session_id}]
+        for i in range(plan["tools"]):
+            tool_id = f"toolu_{i:04d}"
+            events.append(
+                {
+                    "type": "assistant",
+                    "message": {
+                        "role": "assistant",
+                        "content": [
+                            {"type": "tool_use", "id": tool_id, "name": "mcp__tools__run", "input": {}}
+                        ],
+                    },
+                }
+            )
+            events.append(
+                {
+                    "type": "user",
+                    "message": {
+                        "role": "user",
+                        "content": [{"type": "tool_result", "tool_use_id": tool_id, "content": "ok"}],
+                    },
+                }
+            )
+        events.append(
+            {"type": "assistant", "message": {"role": "assistant", "content": [{"type": "text", "text": text}]}}
+        )
+        # Every turn resends the prompt; tool calls add some output each
+        input_tokens = len(prompt) // 4 * (plan["tools"] + 1)
+        output_tokens = len(text) // 4 + 40 * plan["tools"]
+        prices = self.config.get("price_per_mtok", {"input": 3.0, "output": 15.0})
+        events.append(
+            {
+                "type": "result",
+                "subtype": "success",
+                "is_error": False,
+                "duration_ms": int(plan["latency"] * 1000),
+                "num_turns": plan["tools"] + 1,
+                "result": text,
+                "session_id": session_id,
+                "total_cost_usd": round(
+                    (input_tokens * prices["input"] + output_tokens * prices["output"]) / 1e6, 6
+                ),
+                "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens},
+            }
+        )
+        return events
+
+    def canned(self, kind: str, prompt: str, plan: Dict[str, Any]) -> str:
+        if kind == "judge_batch":
+            return self.canned_batch(prompt, random.Random(plan["pick"]))
+        if kind != "reviewer":
+            return CANNED[kind]
+        # Keep the first ten candidates, as a well-behaved reviewer would
+        match = CANDIDATES_RE.search(prompt)
+        try:
+            candidates = json.loads(match.group(1)) if match else []
+        except ValueError:
+            candidates = []
+        return json.dumps({"selected_questions": candidates[:10]})
+
+    def canned_batch(self, prompt: str, rng: random.Random) -> str:
+        # Score every item, leaving out some to exercise the individual fallback
+        match = BATCH_ITEMS_RE.search(prompt)
+        try:
+            items = json.loads(match.group(1)) if match else []
+        except ValueError:
+            items = []
+        drop_rate = self.config.get("batch_drop_rate", 0.0)
+        scores = [
+            {"question_id": item.get("question_id"), "score": 1.0, "reasoning": "Mock judge: response matches."}
+            for item in items
+            if rng.random() >= drop_rate
+        ]
+        return "```json\n" + json.dumps(scores) + "\n```"
+
+
+def previous_attempts(log_path: Optional[str], key: str) -> int:
+    """Calls already logged for this prompt (so a retry draws a new outcome)."""
+    if not log_path or not os.path.exists(log_path):
+        return 0
+    with open(log_path, "r", encoding="utf-8") as f:
+        return sum(1 for line in f if key in line)
+
+
+def append_log(path: Optional[str], record: Dict[str, Any]):
+    if not path:
+        return
+    line = (json.dumps(record) + "\n").encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def handle_call(
+    responder: Responder,
+    argv: List[str],
+    log_path: Optional[str],
+    prompt: Optional[str] = None,
+    semaphore: Optional[threading.Semaphore] = None,
+) -> Tuple[int, str, str]:
+    """Plan, wait out the latency, respond and log one call."""
+    if prompt is None:
+        prompt, output_format = parse_cli_args(argv)
+    else:
+        _, output_format = parse_cli_args(argv, read_stdin=False)
+    start = time.time()
+    if semaphore:
+        semaphore.acquire()
+    try:
+        began = time.time()
+        plan = responder.plan(prompt)
+        record = {
+            "pid": os.getpid(),
+            "start": round(start, 4),
+            "end": None,
+            "queued": round(began - start, 4),
+            "kind": prompt_kind(prompt),
+            "outcome": plan["outcome"],
+            "prompt_sha256": prompt_hash(prompt),
+        }
+        if plan["outcome"] == "timeout":
+            # Logged up front: the caller usually kills a hanging call
+            append_log(log_path, record)
+        time.sleep(plan["latency"])
+        code, stdout, stderr = responder.respond(prompt, output_format, plan)
+    finally:
+        if semaphore:
+            semaphore.release()
+    if plan["outcome"] != "timeout":
+        record["end"] = round(time.time(), 4)
+        append_log(log_path, record)
+    return code, stdout, stderr
+
+
+def call_daemon(socket_path: str, argv: List[str], prompt: str) -> Tuple[int, str, str]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps({"argv": argv, "prompt": prompt}).encode("utf-8"))
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    reply = json.loads(b"".join(chunks))
+    return reply["code"], reply["stdout"], reply["stderr"]
+
+
+def record_real_call(real: str, argv: List[str], record_path: str) -> int:
+    """Run the real CLI and append its output for replay."""
+    result = subprocess.run([real, *argv], capture_output=True, text=True)
+    sys.stdout.write(result.stdout)
+    sys.stderr.write(result.stderr)
+    if result.returncode == 0:
+        prompt, _ = parse_cli_args(argv)
+        append_log(
+            record_path,
+            {
+                "prompt_sha256": prompt_hash(prompt),
+                "kind": prompt_kind(prompt),
+                "stdout": result.stdout,
+            },
+        )
+    return result.returncode
+
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        request = json.loads(self.rfile.read())
+        server = self.server
+        code, stdout, stderr = handle_call(
+            server.responder, request["argv"], server.log_path, request["prompt"], server.semaphore
+        )
+        self.wfile.write(json.dumps({"code": code, "stdout": stdout, "stderr": stderr}).encode("utf-8"))
+
+
+class MockDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, config: Dict[str, Any]):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, DaemonHandler)
+        self.responder = Responder(config)
+        self.log_path = config.get("log")
+        limit = config.get("max_concurrency", 0)
+        self.semaphore = threading.BoundedSemaphore(limit) if limit else None
+
+
+def write_shim(bin_dir: Path, python: str = sys.executable) -> Path:
+    """Write an executable `claude` that runs this mock; put bin_dir first on PATH."""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    shim = bin_dir / "claude"
+    shim.write_text(f'#!/bin/sh\nexec "{python}" "{Path(__file__).resolve()}" "$@"\n')
+    shim.chmod(0o755)
+    return shim
+
+
+def serve(argv: List[str]):
+    parser = argparse.ArgumentParser(description="Run the mock Claude daemon.")
+    parser.add_argument("--config", help="Config JSON (default: MOCK_CLAUDE_CONFIG)")
+    parser.add_argument("--socket", required=True, help="Unix socket path")
+    args = parser.parse_args(argv)
+    if args.config:
+        os.environ["MOCK_CLAUDE_CONFIG"] = args.config
+    server = MockDaemon(args.socket, load_config())
+    print(f"Mock Claude daemon listening on {args.socket}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(args.socket)
+
+
+def run_session(answer: Callable[[List[str], str], Tuple[int, str, str]]):
+    """`--input-format stream-json`: the events of one call per user message on stdin."""
+    print(json.dumps({"type": "system", "subtype": "init", "session_id": str(uuid.uuid4())}), flush=True)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        content = json.loads(line).get("message", {}).get("content", "")
+        if isinstance(content, list):
+            content = "".join(part.get("text", "") for part in content)
+        code, stdout, stderr = answer(["--output-format", "stream-json"], content)
+        if code != 0:
+            error = {"type": "result", "subtype": "error_during_execution", "is_error": True, "result": stderr}
+            stdout = json.dumps(error) + "\n"
+        for event_line in stdout.splitlines():
+            if '"subtype": "init"' not in event_line:
+                print(event_line, flush=True)
+
+
+def main():
+    argv = sys.argv[1:]
+    if argv[:1] == ["serve"]:
+        serve(argv[1:])
+        return
+    if argv[:1] == ["shim"]:
+        if len(argv) != 2:
+            print("Usage: mock_claude.py shim <bin_dir>", file=sys.stderr)
+            sys.exit(1)
+        print(write_shim(Path(argv[1])))
+        return
+
+    real, record_path = os.environ.get("MOCK_CLAUDE_REAL"), os.environ.get("MOCK_CLAUDE_RECORD")
+    if real and record_path:
+        sys.exit(record_real_call(real, argv, record_path))
+
+    config = load_config()
+    socket_path = os.environ.get("MOCK_CLAUDE_SOCKET") or config.get("socket")
+
+    def answer(call_argv: List[str], prompt: str) -> Tuple[int, str, str]:
+        if socket_path:
+            try:
+                return call_daemon(socket_path, call_argv, prompt)
+            except OSError as e:
+                return 1, "", f"Error: mock daemon at {socket_path} unavailable: {e}"
+        # Seed per prompt and attempt: reproducible however calls interleave.
+        # Attempts are counted from the log; without one, retries need fresh draws.
+        key = prompt_hash(prompt)
+        attempt = previous_attempts(config.get("log"), key) if config.get("log") else os.getpid()
+        salt = int(key[:12], 16) + attempt
+        return handle_call(Responder(config, salt), call_argv, config.get("log"), prompt)
+
+    # CLI start-up, auth and MCP server connection, paid once per process
+    time.sleep(config.get("startup_ms", 0) / 1000)
+
+    if "stream-json" in argv and "--input-format" in argv:
+        run_session(answer)
+        return
+
+    prompt, _ = parse_cli_args(argv)
+    code, stdout, stderr = answer(argv, prompt)
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
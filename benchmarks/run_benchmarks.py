@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Tools Hot-path Benchmarks
+
+This script:
+1. Generates seeded notebooks, tool modules and questions (generators.py) at
+   each requested size.
+2. Times preprocess_notebook, extract_notebook_images,
+   PersonalInfoSanitizer.sanitize_code, code_postprocessor.format_code and
+   benchmark_extractor.validate_question (best and median of --repeat runs).
+3. Runs each case once more under tracemalloc to record peak memory.
+4. Writes a JSON report and compares it against a stored baseline; exits 1
+   if any case got slower or bigger than the tolerance allows.
+
+Everything runs offline on generated data.
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 100,400 --save-baseline
+    python benchmarks/run_benchmarks.py --sizes 100,400
+"""
+
+import io
+import sys
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import contextlib
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "tools"))
+
+from benchmark_extractor import extract_cell_outputs, validate_question  # noqa: E402
+from code_postprocessor import format_code  # noqa: E402
+from extract_notebook_images import extract_images_from_notebook  # noqa: E402
+from generators import make_module, make_notebook, make_questions  # noqa: E402
+from json_backend import BACKEND, dump_path, load_path  # noqa: E402
+from personal_info_sanitizer import PersonalInfoSanitizer  # noqa: E402
+from preprocess_notebook import preprocess_notebook  # noqa: E402
+
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+DEFAULT_OUTPUT = BENCH_DIR / "results" / "latest.json"
+
+HOT_PATHS = [
+    "preprocess_notebook",
+    "extract_notebook_images",
+    "sanitize_code",
+    "format_code",
+    "validate_question",
+]
+
+
+def build_cases(size: int, args: argparse.Namespace, work: Path) -> Dict[str, Callable[[], Any]]:
+    """Generate inputs for one size and return a no-argument callable per hot path."""
+    notebook = make_notebook(
+        cells=size,
+        output_lines=args.output_lines,
+        images=int(size * args.image_ratio),
+        image_kb=args.image_kb,
+        seed=args.seed,
+    )
+    notebook_path = work / f"notebook_{size}.ipynb"
+    dump_path(notebook, notebook_path)
+    module = make_module(functions=size, pii_density=args.pii_density, seed=args.seed)
+    questions = make_questions(notebook, count=size, seed=args.seed)
+    cell_outputs = extract_cell_outputs(notebook)
+    sanitizer = PersonalInfoSanitizer()
+
+    return {
+        "preprocess_notebook": lambda: preprocess_notebook(
+            str(notebook_path), str(work / f"cleaned_{size}.ipynb")
+        ),
+        "extract_notebook_images": lambda: extract_images_from_notebook(
+            str(notebook_path), str(work / f"images_{size}")
+        ),
+        "sanitize_code": lambda: sanitizer.sanitize_code(module),
+        "format_code": lambda: format_code(module),
+        "validate_question": lambda: [validate_question(q, cell_outputs) for q in questions],
+    }
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """Best/median wall time over `repeat` runs, then one tracemalloc run."""
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {
+        "seconds_best": round(min(times), 5),
+        "seconds_median": round(statistics.median(times), 5),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    time_tolerance: float,
+    memory_tolerance: float,
+    min_seconds: float,
+) -> List[str]:
+    """Regressions of `results` against `baseline`, as printable lines."""
+    regressions = []
+    for name, current in results["cases"].items():
+        previous = baseline.get("cases", {}).get(name)
+        if not previous:
+            continue
+        before, after = previous["seconds_best"], current["seconds_best"]
+        if after > before * (1 + time_tolerance) and after - before > min_seconds:
+            regressions.append(f"{name}: time {before:.4f}s -> {after:.4f}s ({after / before:.2f}x)")
+        before, after = previous["peak_kb"], current["peak_kb"]
+        if before and after > before * (1 + memory_tolerance):
+            regressions.append(f"{name}: peak {before:.0f} KB -> {after:.0f} KB ({after / before:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the tools/ hot paths on generated data.")
+    parser.add_argument("--sizes", default="100,400", help="Comma-separated cell/function/question counts")
+    parser.add_argument("--only", nargs="+", choices=HOT_PATHS, help="Benchmark only these hot paths")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (default: 5)")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    parser.add_argument("--output-lines", type=int, default=50, help="Stdout lines per code cell")
+    parser.add_argument("--image-ratio", type=float, default=0.25, help="Images per notebook cell")
+    parser.add_argument("--image-kb", type=int, default=64, help="Size of each image")
+    parser.add_argument("--pii-density", type=float, default=0.05, help="Share of module lines with PII")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Where to write the JSON report")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline report to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="Allowed slowdown (default: 0.25)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.10, help="Allowed peak growth (default: 0.10)")
+    parser.add_argument(
+        "--min-seconds", type=float, default=0.002, help="Ignore slowdowns smaller than this (timer noise)"
+    )
+
+    args = parser.parse_args()
+    try:
+        sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    except ValueError:
+        print(f"Error: --sizes must be comma-separated integers, got {args.sizes!r}", file=sys.stderr)
+        sys.exit(1)
+    hot_paths = args.only or HOT_PATHS
+
+    results: Dict[str, Any] = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_backend": BACKEND,
+        },
+        "params": {
+            "sizes": sizes,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "output_lines": args.output_lines,
+            "image_ratio": args.image_ratio,
+            "image_kb": args.image_kb,
+            "pii_density": args.pii_density,
+        },
+        "cases": {},
+    }
+
+    print(f"Tools Benchmarks (best of {args.repeat}, json backend: {BACKEND}):")
+    with tempfile.TemporaryDirectory(prefix="p2a_bench_") as tmp:
+        for size in sizes:
+            cases = build_cases(size, args, Path(tmp))
+            for hot_path in hot_paths:
+                name = f"{hot_path}[{size}]"
+                result = measure(cases[hot_path], args.repeat)
+                results["cases"][name] = result
+                print(
+                    f"  {name:32s} {result['seconds_best']:9.4f}s  "
+                    f"median {result['seconds_median']:9.4f}s  peak {result['peak_kb']:10.1f} KB"
+                )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    dump_path(results, args.output)
+    print(f"\nReport: {args.output}")
+
+    if args.save_baseline:
+        dump_path(results, args.baseline)
+        print(f"Baseline saved: {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline} (create one with --save-baseline)")
+        return
+
+    baseline = load_path(args.baseline)
+    if baseline.get("params") != results["params"]:
+        print("Warning: baseline was recorded with different parameters", file=sys.stderr)
+    regressions = compare(
+        results, baseline, args.time_tolerance, args.memory_tolerance, args.min_seconds
+    )
+    if regressions:
+        print(f"\nRegressions against {args.baseline}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
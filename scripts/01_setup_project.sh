@@ -1,24 +1,45 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
-# Usage: 01_setup_project.sh <SCRIPT_DIR> <FOLDER_NAME>
+# Usage: 01_setup_project.sh <SCRIPT_DIR> <FOLDER_NAME> [LINK_MODE]
+# LINK_MODE (or $PAPER2AGENT_LINK_MODE): copy (default) | hardlink | symlink | reflink
+# PAPER2AGENT_FORCE_SYNC=1 discards local edits to the project's shared-asset copies
 if [[ $# -lt 2 ]]; then
-  echo "Usage: $0 <SCRIPT_DIR> <FOLDER_NAME>" >&2
+  echo "Usage: $0 <SCRIPT_DIR> <FOLDER_NAME> [copy|hardlink|symlink|reflink]" >&2
   exit 1
 fi
 
+source "$(dirname "${BASH_SOURCE[0]}")/common.sh"
+
 SCRIPT_DIR="$1"
 FOLDER_NAME="$2"
+LINK_MODE="${3:-${PAPER2AGENT_LINK_MODE:-copy}}"
 MAIN_DIR="$SCRIPT_DIR/$FOLDER_NAME"
 PIPELINE_DIR="$MAIN_DIR/.pipeline"
 MARKER="$PIPELINE_DIR/01_setup_done"
+SHARED_DIRS=(.claude templates tools)
 
 mkdir -p "$PIPELINE_DIR"
 
-# Log to stderr; final stdout is MAIN_DIR only.
-echo "01: SCRIPT_DIR=$SCRIPT_DIR FOLDER_NAME=$FOLDER_NAME" >&2
+if [[ "$(cd "$MAIN_DIR" && pwd -P)" == "$(cd "$SCRIPT_DIR" && pwd -P)" ]]; then
+  echo "01: FOLDER_NAME must be a subdirectory, not SCRIPT_DIR itself" >&2
+  exit 1
+fi
 
-if [[ -f "$MARKER" ]]; then
+# Log to stderr; final stdout is MAIN_DIR only.
+echo "01: SCRIPT_DIR=$SCRIPT_DIR FOLDER_NAME=$FOLDER_NAME LINK_MODE=$LINK_MODE" >&2
+
+# The marker records hashes of the shared sources and of the project copies,
+# so the stage reruns when either side changes. Project files edited since the
+# last sync are reported and left alone (the stage fails) unless forced.
+MARKER_ARGS=(--input "${BASH_SOURCE[0]}" --value "link_mode=$LINK_MODE")
+for d in "${SHARED_DIRS[@]}"; do
+  if [[ -d "$SCRIPT_DIR/$d" ]]; then
+    MARKER_ARGS+=(--input "$SCRIPT_DIR/$d" --output "$MAIN_DIR/$d")
+  fi
+done
+
+if stage_marker check "$MARKER" "${MARKER_ARGS[@]}"; then
   echo "$MAIN_DIR"
   exit 0
 fi
@@ -26,30 +47,16 @@ fi
 # Create project dir if needed
 mkdir -p "$MAIN_DIR"
 
-# Copy configs/templates only if not already present
-if [[ ! -d "$MAIN_DIR/.claude" && -d "$SCRIPT_DIR/.claude" ]]; then
-  cp -R "$SCRIPT_DIR/.claude" "$MAIN_DIR/.claude"
-else
-  echo "01: .claude already exists or source missing" >&2
-fi
-
-if [[ ! -d "$MAIN_DIR/templates" && -d "$SCRIPT_DIR/templates" ]]; then
-  cp -R "$SCRIPT_DIR/templates" "$MAIN_DIR/templates"
-else
-  echo "01: templates already exists or source missing" >&2
-fi
-
-if [[ ! -d "$MAIN_DIR/tools" && -d "$SCRIPT_DIR/tools" ]]; then
-  cp -R "$SCRIPT_DIR/tools" "$MAIN_DIR/tools"
-else
-  echo "01: tools already exists or source missing" >&2
+# Link or copy configs/templates/tools, only touching files that differ.
+# Check for drift later with: python tools/link_assets.py verify <SCRIPT_DIR> <MAIN_DIR>
+SYNC_ARGS=(--mode "$LINK_MODE" --dirs "${SHARED_DIRS[@]}")
+if [[ "${PAPER2AGENT_FORCE_SYNC:-0}" == "1" ]]; then
+  SYNC_ARGS+=(--force)
 fi
+"$PYTHON_BIN" "$PAPER2AGENT_ROOT/tools/link_assets.py" sync "$SCRIPT_DIR" "$MAIN_DIR" "${SYNC_ARGS[@]}"
 
 # mark success
-touch "$MARKER"
+stage_marker record "$MARKER" "${MARKER_ARGS[@]}"
 
 # final output (stdout) that wrapper will capture
 echo "$MAIN_DIR"
-
-
-
@@ -1,28 +1,148 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
-# Usage: 02_clone_repo.sh <MAIN_DIR> <GITHUB_REPO_URL>
+# Usage: 02_clone_repo.sh <MAIN_DIR> <GITHUB_REPO_URL> [CLONE_MODE]
+#
+# CLONE_MODE (or $PAPER2AGENT_CLONE_MODE):
+#   mirror   (default) keep a bare mirror per URL in $PAPER2AGENT_GIT_CACHE and
+#            clone from it with --reference; later projects take seconds and
+#            work offline
+#   shallow  --depth=1 clone straight from the URL
+#   blobless --filter=blob:none clone straight from the URL
+#   full     plain clone
+# Any failure falls back to shallow, then full.
+#
+# PAPER2AGENT_SUBMODULES: shallow (default) | full | none
+# PAPER2AGENT_OFFLINE=1 skips refreshing an existing mirror.
 if [[ $# -lt 2 ]]; then
-  echo "Usage: $0 <MAIN_DIR> <GITHUB_REPO_URL>" >&2
+  echo "Usage: $0 <MAIN_DIR> <GITHUB_REPO_URL> [mirror|shallow|blobless|full]" >&2
   exit 1
 fi
 
-MAIN_DIR="$1"
+source "$(dirname "${BASH_SOURCE[0]}")/common.sh"
+
+MAIN_DIR="$(cd "$1" && pwd)"
 GITHUB_REPO_URL="$2"
+CLONE_MODE="${3:-${PAPER2AGENT_CLONE_MODE:-mirror}}"
+SUBMODULES="${PAPER2AGENT_SUBMODULES:-shallow}"
+GIT_CACHE="${PAPER2AGENT_GIT_CACHE:-${XDG_CACHE_HOME:-$HOME/.cache}/paper2agent/git}"
 repo_name=$(basename "$GITHUB_REPO_URL" .git)
-REPO_DIR="$MAIN_DIR/$repo_name"
+REPO_DIR="$MAIN_DIR/repo/$repo_name"
 PIPELINE_DIR="$MAIN_DIR/.pipeline"
 MARKER="$PIPELINE_DIR/02_clone_done"
 mkdir -p "$PIPELINE_DIR"
 
 
-echo "02: clone target=$GITHUB_REPO_URL into $REPO_DIR" >&2
+echo "02: clone target=$GITHUB_REPO_URL into $REPO_DIR (mode=$CLONE_MODE)" >&2
+
+repo_head() {
+  git -C "$REPO_DIR" rev-parse HEAD 2>/dev/null || echo none
+}
 
-if [[ -f "$MARKER" && -d "$REPO_DIR" ]]; then
+# Up to date only if the same URL is checked out at the recorded HEAD commit
+if [[ -d "$REPO_DIR" ]] && stage_marker check "$MARKER" \
+    --value "url=$GITHUB_REPO_URL" --value "head=$(repo_head)"; then
   echo "repo/$repo_name"
   exit 0
 fi
 
+# Create or refresh the bare mirror for this URL; prints its path
+ensure_mirror() {
+  local key mirror lock waited=0
+  key=$("$PYTHON_BIN" -c 'import hashlib, sys; print(hashlib.sha256(sys.argv[1].encode()).hexdigest()[:16])' "$GITHUB_REPO_URL")
+  mirror="$GIT_CACHE/${repo_name}-${key}.git"
+  lock="$mirror.lock"
+  mkdir -p "$GIT_CACHE"
+
+  # mkdir is atomic, so it doubles as a portable lock between concurrent setups.
+  # The owner writes "<pid> <host>" into it; a lock whose owner process is gone
+  # (a killed run on this host) is broken instead of waited out.
+  until mkdir "$lock" 2>/dev/null; do
+    if lock_is_stale "$lock" && mkdir "$lock.break" 2>/dev/null; then
+      # One breaker at a time, re-checking under the guard: a waiter that saw the
+      # same dead owner must not remove the lock another waiter has since taken.
+      # mv first, so the lock disappears atomically before it is deleted.
+      if lock_is_stale "$lock" && mv "$lock" "$lock.stale.$BASHPID" 2>/dev/null; then
+        echo "02: removed stale lock $lock" >&2
+        rm -rf "$lock.stale.$BASHPID"
+      fi
+      rmdir "$lock.break"
+      continue
+    fi
+    if (( waited >= 600 )); then
+      echo "02: timed out waiting for $lock" >&2
+      return 1
+    fi
+    sleep 1
+    waited=$((waited + 1))
+  done
+  echo "$BASHPID $(hostname)" > "$lock/owner"
+  local status=0
+  update_mirror "$mirror" || status=$?
+  rm -rf "$lock"
+  (( status == 0 )) || return "$status"
+  echo "$mirror"
+}
+
+# True if the lock's owner ran on this host and has exited
+lock_is_stale() {
+  local lock="$1" pid host
+  read -r pid host < "$lock/owner" 2>/dev/null || return 1
+  [[ -n "$pid" && "$host" == "$(hostname)" ]] || return 1
+  # Not kill -0: it also fails for live processes of other users
+  if [[ -d /proc/self ]]; then
+    [[ ! -d "/proc/$pid" ]]
+  else
+    ! ps -p "$pid" >/dev/null 2>&1
+  fi
+}
+
+update_mirror() {
+  local mirror="$1"
+  if [[ -d "$mirror" ]]; then
+    if [[ "${PAPER2AGENT_OFFLINE:-0}" != "1" ]]; then
+      echo "02: refreshing mirror $mirror" >&2
+      git -C "$mirror" fetch --prune --quiet origin >&2 \
+        || echo "02: mirror refresh failed, using cached refs" >&2
+    fi
+  else
+    echo "02: creating mirror $mirror" >&2
+    rm -rf "$mirror.tmp"
+    git clone --mirror --quiet "$GITHUB_REPO_URL" "$mirror.tmp" >&2 || return 1
+    # Clones borrow objects from the mirror, so it must never drop them
+    git -C "$mirror.tmp" config gc.auto 0
+    git -C "$mirror.tmp" config gc.pruneExpire never
+    mv "$mirror.tmp" "$mirror"
+  fi
+}
+
+clone_with_mode() {
+  local mode="$1" target="repo/$repo_name" mirror
+  case "$mode" in
+    mirror)
+      mirror=$(ensure_mirror) || return 1
+      git clone --quiet --reference "$mirror" "file://$mirror" "$target" || return 1
+      git -C "$target" remote set-url origin "$GITHUB_REPO_URL"
+      ;;
+    shallow)  git clone --quiet --depth=1 "$GITHUB_REPO_URL" "$target" ;;
+    blobless) git clone --quiet --filter=blob:none "$GITHUB_REPO_URL" "$target" ;;
+    full)     git clone --quiet "$GITHUB_REPO_URL" "$target" ;;
+    *)
+      echo "02: unknown clone mode: $mode" >&2
+      return 1
+      ;;
+  esac
+}
+
+update_submodules() {
+  [[ -f "$REPO_DIR/.gitmodules" && "$SUBMODULES" != "none" ]] || return 0
+  local depth=()
+  [[ "$SUBMODULES" == "shallow" ]] && depth=(--depth=1)
+  echo "02: updating submodules ($SUBMODULES)" >&2
+  git -C "$REPO_DIR" submodule update --init --recursive --jobs 8 ${depth[@]+"${depth[@]}"} >&2 \
+    || echo "02: submodule update failed, continuing without them" >&2
+}
+
 cd "$MAIN_DIR"
 mkdir -p "repo"
 
@@ -30,23 +150,25 @@ mkdir -p "repo"
 if [[ -d "$REPO_DIR" ]]; then
   echo "02: repo dir already exists: $REPO_DIR" >&2
 else
-  if git clone --recurse-submodules "$GITHUB_REPO_URL" "repo/$repo_name"; then
-    echo "02: cloned with submodules" >&2
-  else
-    echo "02: main clone failed, trying --depth=1" >&2
-    if git clone --depth=1 "$GITHUB_REPO_URL" "repo/$repo_name"; then
-      echo "02: shallow clone ok" >&2
-    else
-      echo "02: shallow clone failed, trying plain clone" >&2
-      git clone "$GITHUB_REPO_URL" "repo/$repo_name"
+  start=$SECONDS
+  cloned=""
+  for mode in "$CLONE_MODE" shallow full; do
+    if clone_with_mode "$mode"; then
+      cloned="$mode"
+      break
     fi
+    echo "02: $mode clone failed" >&2
+    rm -rf "repo/$repo_name"
+  done
+  if [[ -z "$cloned" ]]; then
+    echo "02: all clone strategies failed" >&2
+    exit 1
   fi
+  update_submodules
+  echo "02: cloned with mode=$cloned in $((SECONDS - start))s" >&2
 fi
 
 # mark success
-touch "$MARKER"
+stage_marker record "$MARKER" --value "url=$GITHUB_REPO_URL" --value "head=$(repo_head)"
 
 echo "repo/$repo_name"
-
-
-
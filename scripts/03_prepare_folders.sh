@@ -7,6 +7,8 @@ if [[ $# -lt 1 ]]; then
   exit 1
 fi
 
+source "$(dirname "${BASH_SOURCE[0]}")/common.sh"
+
 MAIN_DIR="$1"
 PIPELINE_DIR="$MAIN_DIR/.pipeline"
 MARKER="$PIPELINE_DIR/03_folders_done"
@@ -14,23 +16,31 @@ mkdir -p "$PIPELINE_DIR"
 
 echo "03: preparing folder structure under $MAIN_DIR" >&2
 
-if [[ -f "$MARKER" ]]; then
+FOLDERS=("$MAIN_DIR/reports"
+         "$MAIN_DIR/src/tools"
+         "$MAIN_DIR/tests/code"
+         "$MAIN_DIR/tests/data"
+         "$MAIN_DIR/notebooks"
+         "$MAIN_DIR/tests/results"
+         "$MAIN_DIR/tests/logs"
+         "$MAIN_DIR/tests/summary"
+         "$MAIN_DIR/tmp/inputs"
+         "$MAIN_DIR/tmp/outputs"
+         "$MAIN_DIR/claude_outputs")
+
+# Folder contents change as the workflow runs, so only their presence is tracked
+MARKER_ARGS=(--input "${BASH_SOURCE[0]}")
+for folder in "${FOLDERS[@]}"; do
+  MARKER_ARGS+=(--exists "$folder")
+done
+
+if stage_marker check "$MARKER" "${MARKER_ARGS[@]}"; then
   exit 0
 fi
 
-mkdir -p "$MAIN_DIR/reports" \
-         "$MAIN_DIR/src/tools" \
-         "$MAIN_DIR/tests/code" \
-         "$MAIN_DIR/tests/data" \
-         "$MAIN_DIR/notebooks" \
-         "$MAIN_DIR/tests/results" \
-         "$MAIN_DIR/tests/logs" \
-         "$MAIN_DIR/tests/summary" \
-         "$MAIN_DIR/tmp/inputs" \
-         "$MAIN_DIR/tmp/outputs" \
-         "$MAIN_DIR/claude_outputs"
-
-touch "$MARKER"
+mkdir -p "${FOLDERS[@]}"
+
+stage_marker record "$MARKER" "${MARKER_ARGS[@]}"
 
 
 
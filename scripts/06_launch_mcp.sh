@@ -9,6 +9,8 @@ if [[ $# -lt 2 ]]; then
   exit 1
 fi
 
+source "$(dirname "${BASH_SOURCE[0]}")/common.sh"
+
 MAIN_DIR="$1"
 repo_name="$2"
 PIPELINE_DIR="$MAIN_DIR/.pipeline"
@@ -36,15 +38,35 @@ fi
 
 echo "06: launching MCP for $project_dir" >&2
 
-if [[ -f "$MARKER" ]]; then
-  echo "06: already launched (marker exists)" >&2
+# Lazy servers register tools from a manifest; keep it in sync with src/tools
+if [[ -f "$MAIN_DIR/src/tools_manifest.json" ]]; then
+  "$PYTHON_BIN" "$PAPER2AGENT_ROOT/tools/mcp_manifest.py" build "$MAIN_DIR/src/tools" \
+    --output "$MAIN_DIR/src/tools_manifest.json" >&2
+fi
+
+ENV_PY="${MAIN_DIR}/${repo_name}-env/bin/python"
+FASTMCP_VERSION=$("$ENV_PY" -c "from importlib.metadata import version; print(version('fastmcp'))" 2>/dev/null || echo unknown)
+
+# Reinstall when the server, its tool modules, the env python or fastmcp change
+MARKER_ARGS=(--input "$TOOL_PY" --input "$MAIN_DIR/src/tools"
+             --input "$MAIN_DIR/src/tools_manifest.json"
+             --value "python=$(readlink -f "$ENV_PY" 2>/dev/null || echo "$ENV_PY")"
+             --value "fastmcp=$FASTMCP_VERSION")
+# Envs materialized by tools/env_cache.py record their lock hash; a new lock means a new env
+ENV_CACHE_MARKER="${MAIN_DIR}/${repo_name}-env/.env-cache.json"
+if [[ -f "$ENV_CACHE_MARKER" ]]; then
+  MARKER_ARGS+=(--input "$ENV_CACHE_MARKER")
+fi
+
+if stage_marker check "$MARKER" "${MARKER_ARGS[@]}"; then
+  echo "06: already launched (inputs unchanged)" >&2
   exit 0
 fi
 
 echo "06: found ${TOOL_PY}, adding to local mcp connected to claude-code" >&2
 
 # Add (idempotent enough for our purpose) and then call gemini
-fastmcp install claude-code "$TOOL_PY" --python "${MAIN_DIR}/${repo_name}-env/bin/python"
+fastmcp install claude-code "$TOOL_PY" --python "$ENV_PY"
 
 # Launch client (this is interactive - we still call it)
 # Note: This calls 'claude' CLI which is optional for Cursor workflow
@@ -54,7 +76,7 @@ else
   echo "06: 'claude' CLI not found - skipping launch (optional for Cursor workflow)" >&2
 fi
 
-touch "$MARKER"
+stage_marker record "$MARKER" "${MARKER_ARGS[@]}"
 
 
 
@@ -0,0 +1,11 @@
+#!/usr/bin/env bash
+# Shared helpers sourced by the numbered pipeline scripts.
+
+PAPER2AGENT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+PYTHON_BIN="${PYTHON:-python3}"
+
+# stage_marker check|record <marker> [--input PATH] [--value k=v] [--output PATH] [--exists PATH]
+# check exits 0 when the recorded input/output hashes still match.
+stage_marker() {
+  "$PYTHON_BIN" "$PAPER2AGENT_ROOT/tools/stage_marker.py" "$@"
+}
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Batched judging for benchmark_assessor.py.
+
+Instead of one judge call per question, up to `batch_size` (question, ground
+truth, response) items are packed into one call, as long as their estimated
+prompt tokens stay within `token_budget`. The judge system prompt is sent
+once per batch instead of once per question.
+
+The judge returns a JSON array of {question_id, score, reasoning}. Each entry
+is validated against BATCH_ITEM_SCHEMA; items that are missing, duplicated or
+invalid, and every item of a batch whose call failed or could not be parsed,
+are re-judged individually.
+
+Usage:
+    python tools/benchmark_assessor.py ... --judge-batch 8 --judge-token-budget 24000
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from json_backend import dumps, loads
+
+# Expected shape of each entry of the judge's JSON array
+BATCH_ITEM_SCHEMA = {
+    "type": "object",
+    "required": ["question_id", "score", "reasoning"],
+    "properties": {
+        "question_id": {"type": "string"},
+        "score": {"type": "number", "minimum": 0.0, "maximum": 1.0},
+        "reasoning": {"type": "string"},
+    },
+}
+
+# Rough prompt-token estimate (about 4 characters per token)
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def item_payload(item: Dict[str, Any]) -> Dict[str, Any]:
+    payload = {
+        "question_id": item["key"],
+        "question": item["question"]["question"],
+        "ground_truth": item["question"]["ground_truth"],
+        "agent_response": item["response"],
+    }
+    if item.get("cell_output"):
+        payload["source_notebook_cell_output"] = item["cell_output"]
+    return payload
+
+
+def build_batch_prompt(items: List[Dict[str, Any]]) -> str:
+    return f"""
+Task: Evaluate each of the following Agent Responses against its Ground Truth.
+Score every item independently, using the same criteria as for a single response.
+
+Items:
+{dumps([item_payload(item) for item in items], indent=2)}
+
+Return a JSON array with exactly one object per item:
+[{{"question_id": "<question_id>", "score": 1.0, "reasoning": "..."}}]
+"""
+
+
+def validate_entry(entry: Any) -> Optional[str]:
+    """Why an array entry does not match BATCH_ITEM_SCHEMA (None if it does)."""
+    if not isinstance(entry, dict):
+        return "not an object"
+    for key in BATCH_ITEM_SCHEMA["required"]:
+        if key not in entry:
+            return f"missing {key}"
+    if not isinstance(entry["question_id"], (str, int)):
+        return "question_id is not a string"
+    score = entry["score"]
+    if isinstance(score, bool) or not isinstance(score, (int, float)):
+        return "score is not a number"
+    bounds = BATCH_ITEM_SCHEMA["properties"]["score"]
+    if not bounds["minimum"] <= score <= bounds["maximum"]:
+        return f"score {score} out of range"
+    if not isinstance(entry["reasoning"], str):
+        return "reasoning is not a string"
+    return None
+
+
+def parse_batch_response(text: str, keys: List[str]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """
+    Valid results by question_id, and why each other key failed.
+
+    Only keys of the batch are accepted; the first valid entry per key wins.
+    """
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end < start:
+        return {}, {key: "no JSON array in response" for key in keys}
+    try:
+        entries = loads(text[start : end + 1])
+    except ValueError as e:
+        return {}, {key: f"unparseable response: {e}" for key in keys}
+    if not isinstance(entries, list):
+        return {}, {key: "response is not an array" for key in keys}
+
+    wanted = set(keys)
+    results: Dict[str, Dict[str, Any]] = {}
+    problems: Dict[str, str] = {}
+    for entry in entries:
+        problem = validate_entry(entry)
+        key = str(entry.get("question_id")) if isinstance(entry, dict) else None
+        if key not in wanted or key in results:
+            continue
+        if problem:
+            problems[key] = problem
+        else:
+            results[key] = {"score": float(entry["score"]), "reasoning": entry["reasoning"]}
+            problems.pop(key, None)
+    for key in keys:
+        if key not in results and key not in problems:
+            problems[key] = "missing from response"
+    return results, problems
+
+
+class BatchJudge:
+    """
+    Collects solved questions and judges them in batches.
+
+    `call` sends a prompt (with the judge system prompt) and returns a
+    CallScheduler outcome; `judge_single` judges one item the usual way and
+    returns (judge result, call outcome); `on_result(item, result, call,
+    batch_size)` receives every judged item.
+    """
+
+    def __init__(
+        self,
+        call: Callable[[str], Dict[str, Any]],
+        judge_single: Callable[[Dict[str, Any]], Tuple[Dict[str, Any], Dict[str, Any]]],
+        on_result: Callable[[Dict[str, Any], Dict[str, Any], Dict[str, Any], int], None],
+        batch_size: int = 8,
+        token_budget: int = 24000,
+        on_batch: Optional[Callable[[List[Dict[str, Any]], Dict[str, Any]], None]] = None,
+    ):
+        self.call = call
+        self.judge_single = judge_single
+        self.on_result = on_result
+        self.on_batch = on_batch
+        self.batch_size = batch_size
+        self.token_budget = token_budget
+        self.lock = threading.Lock()
+        self.pending: List[Dict[str, Any]] = []
+        self.pending_tokens = 0
+        self.counts = {"batches": 0, "batched_items": 0, "rejudged": 0}
+
+    def add(self, item: Dict[str, Any]):
+        """Queue an item ({key, question, response, cell_output, ...}); may judge a batch."""
+        tokens = estimate_tokens(dumps(item_payload(item), indent=None))
+        batch = None
+        with self.lock:
+            if self.pending and self.pending_tokens + tokens > self.token_budget:
+                batch, self.pending, self.pending_tokens = self.pending, [], 0
+            self.pending.append(item)
+            self.pending_tokens += tokens
+            if len(self.pending) >= self.batch_size and batch is None:
+                batch, self.pending, self.pending_tokens = self.pending, [], 0
+        if batch:
+            self.judge(batch)
+
+    def flush(self):
+        with self.lock:
+            batch, self.pending, self.pending_tokens = self.pending, [], 0
+        if batch:
+            self.judge(batch)
+
+    def judge(self, batch: List[Dict[str, Any]]):
+        if len(batch) == 1:
+            result, call = self.judge_single(batch[0])
+            self.on_result(batch[0], result, call, 1)
+            return
+
+        call = self.call(build_batch_prompt(batch))
+        if self.on_batch:
+            self.on_batch(batch, call)
+        keys = [item["key"] for item in batch]
+        if call["status"] == "failed":
+            results, problems = {}, {key: "batch call failed" for key in keys}
+        else:
+            results, problems = parse_batch_response(call["text"], keys)
+        with self.lock:
+            self.counts["batches"] += 1
+            self.counts["batched_items"] += len(results)
+            self.counts["rejudged"] += len(problems)
+
+        for item in batch:
+            if item["key"] in results:
+                self.on_result(item, results[item["key"]], call, len(batch))
+            else:
+                result, single_call = self.judge_single(item)
+                single_call = dict(
+                    single_call, errors=[f"batch: {problems[item['key']]}"] + single_call["errors"]
+                )
+                self.on_result(item, result, single_call, 1)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return dict(self.counts)
@@ -4,22 +4,48 @@ Benchmark Assessor Script
 
 This script:
 1. Loads benchmark questions from CSV.
-2. Runs each question through the Claude CLI (connected to the MCP).
+2. Runs each question through the Claude CLI (connected to the MCP), one process
+   per call or a pool of pre-started sessions (llm_backend.py), --workers at a time.
+   Transient failures are retried with backoff under a shared rate limit and
+   adaptive timeouts (llm_scheduler.py).
 3. Collects the agent's response.
 4. Uses a second LLM call (Judge) to evaluate the response against the ground truth.
-5. Saves the results to a new CSV.
+5. Saves the results to a new CSV; `status` tells first-try successes ("ok")
+   from successes after retries ("retried") and failed calls, which are left
+   unscored instead of being judged as 0. Responses and transcripts go to a
+   compressed content-addressed store (transcript_store.py); the CSV keeps
+   their sha256 references and a short preview.
+
+With --judge-batch K, up to K solved questions are judged in one call (within
+--judge-token-budget); items the batch answer leaves out or gets wrong are
+re-judged individually (batch_judge.py).
+
+With --baseline, questions run most informative first and the run stops early
+once the paired score difference to the baseline run is significant or
+clearly null (sequential_assessment.py); skipped questions and the calls they
+would have cost are logged.
 """
 
 import os
 import sys
 import argparse
-import subprocess
 import time
-import json
 import csv
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple
 
+from batch_judge import BatchJudge
+from cell_output_index import IndexCache
+from json_backend import loads
+from llm_backend import BACKENDS, LLMBackend, SubprocessBackend, get_backend
+from llm_metrics import MetricsWriter
+from llm_scheduler import CallScheduler
+from sequential_assessment import SequentialMonitor, load_scores, order_questions
+from transcript_store import TranscriptStore, preview, store_for
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -28,6 +54,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DEFAULT_BACKEND = SubprocessBackend()
+
 
 def load_benchmark_csv(csv_path: str) -> List[Dict[str, Any]]:
     """Load the benchmark CSV file."""
@@ -41,77 +69,36 @@ def load_benchmark_csv(csv_path: str) -> List[Dict[str, Any]]:
 
 
 def run_claude_cli(
-    prompt: str, system_prompt: Optional[str] = None, timeout: int = 600
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    timeout: int = 600,
+    backend: Optional[LLMBackend] = None,
 ) -> Tuple[str, str]:
-    """Run the Claude CLI with the given prompt."""
-    cmd = [
-        "claude",
-        "--model",
-        "claude-sonnet-4-20250514",
-        "--print",
-        "--output-format",
-        "json",
-        "--dangerously-skip-permissions",  # Skip permissions for automated run
-        prompt,
-    ]
-
-    # If we have a system prompt (e.g. for the Judge), we might need to prepend it or pass it differently.
-    # The `claude` CLI usually takes the prompt as an argument.
-    # For the Judge, we'll include the system instructions in the main prompt text for simplicity,
-    # or use a specific flag if available. `claude` CLI doesn't have a --system flag documented here,
-    # so we'll prepend it to the prompt.
-
-    if system_prompt:
-        cmd[-1] = f"{system_prompt}\n\n---\n\n{prompt}"
-
-    try:
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=timeout, cwd=os.getcwd()
-        )
-
-        if result.returncode != 0:
-            logger.warning(f"Claude CLI failed: {result.stderr}")
-            return f"ERROR: {result.stderr}", ""
-
-        # Parse JSON output
-        try:
-            output_json = json.loads(result.stdout)
-            # Handle list or dict
-            if isinstance(output_json, list) and len(output_json) > 0:
-                return output_json[0].get("result", str(output_json)), result.stdout
-            elif isinstance(output_json, dict):
-                return output_json.get("result", str(output_json)), result.stdout
-            else:
-                return result.stdout.strip(), result.stdout
-        except json.JSONDecodeError:
-            return result.stdout.strip(), result.stdout
-
-    except subprocess.TimeoutExpired:
-        return "ERROR: Timeout", ""
-    except Exception as e:
-        return f"ERROR: {e}", ""
+    """Run a prompt through the LLM backend (one Claude CLI process by default)."""
+    return (backend or DEFAULT_BACKEND).complete(prompt, system_prompt, timeout)
 
 
-def judge_response(
-    question: str, ground_truth: str, agent_response: str, judge_agent_def: str
-) -> Dict[str, Any]:
-    """Run the Judge Agent to evaluate the response."""
+def build_judge_prompt(
+    question: str, ground_truth: str, agent_response: str, cell_output: Optional[str] = None
+) -> str:
+    # The tutorial output the ground truth was taken from, when indexed
+    context = f"\nSource Notebook Cell Output:\n{cell_output}\n" if cell_output else ""
 
-    prompt = f"""
+    return f"""
 Task: Evaluate the following Agent Response against the Ground Truth.
 
 Question: {question}
 
 Ground Truth: {ground_truth}
-
+{context}
 Agent Response: {agent_response}
 
 Return your evaluation in the specified JSON format.
 """
 
-    response_text, _ = run_claude_cli(prompt, system_prompt=judge_agent_def)
 
-    # Try to parse JSON from the judge's response
+def parse_judge_response(response_text: str) -> Dict[str, Any]:
+    """Parse the judge's JSON evaluation (score 0 if it cannot be parsed)."""
     try:
         # Find JSON block if embedded in text
         if "```json" in response_text:
@@ -123,7 +110,7 @@ Return your evaluation in the specified JSON format.
         else:
             json_str = response_text
 
-        return json.loads(json_str)
+        return loads(json_str)
     except Exception as e:
         logger.warning(
             f"Failed to parse Judge response: {e}. Response was: {response_text}"
@@ -134,6 +121,34 @@ Return your evaluation in the specified JSON format.
         }
 
 
+def judge_response(
+    question: str,
+    ground_truth: str,
+    agent_response: str,
+    judge_agent_def: str,
+    cell_output: Optional[str] = None,
+    timeout: int = 600,
+    backend: Optional[LLMBackend] = None,
+) -> Dict[str, Any]:
+    """Run the Judge Agent to evaluate the response."""
+    prompt = build_judge_prompt(question, ground_truth, agent_response, cell_output)
+    response_text, _ = run_claude_cli(
+        prompt, system_prompt=judge_agent_def, timeout=timeout, backend=backend
+    )
+    return parse_judge_response(response_text)
+
+
+def row_status(agent_call: Dict[str, Any], judge_call: Optional[Dict[str, Any]]) -> str:
+    """ok / retried (succeeded after transient errors) / agent_failed / judge_failed."""
+    if agent_call["status"] == "failed":
+        return "agent_failed"
+    if judge_call["status"] == "failed":
+        return "judge_failed"
+    if agent_call["status"] == "retried" or judge_call["status"] == "retried":
+        return "retried"
+    return "ok"
+
+
 def main():
     parser = argparse.ArgumentParser(description="Run benchmark assessment.")
     parser.add_argument(
@@ -146,6 +161,93 @@ def main():
     parser.add_argument(
         "--agent-def", required=True, help="Path to benchmark-solver.md"
     )
+    parser.add_argument(
+        "--notebooks-dir",
+        help="notebooks/ directory; gives the judge each question's source cell output",
+    )
+    parser.add_argument(
+        "--timeout", type=int, default=600, help="Seconds per Claude CLI call (default: 600)"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="subprocess",
+        help="subprocess: one CLI process per call; pool: pre-started single-use CLI sessions",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Questions assessed concurrently (default: 1)"
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=3,
+        help="Retries of a call after transient errors (timeout, overload; default: 3)",
+    )
+    parser.add_argument(
+        "--backoff", type=float, default=2.0, help="Base retry delay in seconds (default: 2)"
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0,
+        help="Max Claude calls per minute across all workers (default: unlimited)",
+    )
+    parser.add_argument(
+        "--min-timeout",
+        type=int,
+        default=60,
+        help="Lower bound of the adaptive per-call timeout; --timeout is the upper bound",
+    )
+    parser.add_argument(
+        "--metrics",
+        help="Per-call token/cost/latency JSONL (default: <output>_metrics.jsonl); "
+        "summarize with tools/llm_metrics.py summary",
+    )
+    parser.add_argument(
+        "--transcripts",
+        help="Compressed transcript store (default: <output>_transcripts/); "
+        "read with transcript_store.load_results",
+    )
+    parser.add_argument(
+        "--judge-batch",
+        type=int,
+        default=1,
+        help="Responses judged per judge call (default: 1 = one call per question)",
+    )
+    parser.add_argument(
+        "--judge-token-budget",
+        type=int,
+        default=24000,
+        help="Max estimated prompt tokens of the items in one batched judge call (default: 24000)",
+    )
+    parser.add_argument(
+        "--baseline",
+        help="Results CSV of an earlier run; stop early once the change against it is clear",
+    )
+    parser.add_argument(
+        "--history",
+        nargs="*",
+        default=[],
+        help="More earlier results CSVs, used (with --baseline) to order questions",
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.99,
+        help="--baseline: confidence of the interval on the score change (default: 0.99)",
+    )
+    parser.add_argument(
+        "--margin",
+        type=float,
+        default=0.05,
+        help="--baseline: score changes within +/- this count as no change (default: 0.05)",
+    )
+    parser.add_argument(
+        "--min-questions",
+        type=int,
+        default=20,
+        help="--baseline: paired scores needed before stopping (default: 20)",
+    )
 
     args = parser.parse_args()
 
@@ -158,11 +260,115 @@ def main():
         solver_def = f.read()
 
     questions = load_benchmark_csv(args.input)
-    results = []
+    results: List[Optional[Dict[str, Any]]] = [None] * len(questions)
+    results_lock = threading.Lock()
+    indexes = IndexCache(Path(args.notebooks_dir) if args.notebooks_dir else None)
+    indexes_lock = threading.Lock()
+    backend = get_backend(args.backend, args.workers)
+    scheduler = CallScheduler(
+        backend,
+        max_retries=args.max_retries,
+        base_delay=args.backoff,
+        rate_per_minute=args.rate_limit,
+        burst=args.workers,
+        max_timeout=args.timeout,
+        min_timeout=args.min_timeout,
+    )
+    output_path = Path(args.output)
+    metrics_path = Path(args.metrics or output_path.with_name(f"{output_path.stem}_metrics.jsonl"))
+    metrics_path.unlink(missing_ok=True)
+    metrics = MetricsWriter(metrics_path)
+    transcripts = TranscriptStore(Path(args.transcripts) if args.transcripts else store_for(output_path))
+
+    # Sequential mode: informative questions first, stop once the change is clear
+    order = list(range(len(questions)))
+    monitor = None
+    stop = threading.Event()
+    skipped: List[int] = []
+    if args.baseline:
+        for path in [args.baseline] + args.history:
+            if not os.path.exists(path):
+                logger.error(f"Earlier results CSV not found: {path}")
+                sys.exit(1)
+        baseline = load_scores(Path(args.baseline))
+        order = order_questions(questions, [baseline] + [load_scores(Path(p)) for p in args.history])
+        monitor = SequentialMonitor(baseline, args.confidence, args.margin, args.min_questions)
+
+    logger.info(
+        f"Starting assessment of {len(questions)} questions "
+        f"({args.backend} backend, {args.workers} worker(s))..."
+    )
 
-    logger.info(f"Starting assessment of {len(questions)} questions...")
+    def judge_single(item: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        q = item["question"]
+        judge_prompt = build_judge_prompt(
+            q["question"], q["ground_truth"], item["response"], item["cell_output"]
+        )
+        judge_call = scheduler.call(judge_prompt, system_prompt=judge_def)
+        metrics.record(q, "judge", judge_call)
+        if judge_call["status"] == "failed":
+            return {"score": "", "reasoning": "Not judged: judge call failed"}, judge_call
+        return parse_judge_response(judge_call["text"]), judge_call
+
+    def record(
+        item: Dict[str, Any],
+        judge_result: Dict[str, Any],
+        judge_call: Optional[Dict[str, Any]],
+        batch_size: int,
+    ):
+        agent_call = item["agent_call"]
+        result_row = item["question"].copy()
+        # Full texts go to the transcript store; the CSV keeps references and a preview
+        result_row["agent_response_preview"] = preview(item["response"])
+        result_row["agent_response_ref"] = transcripts.put(item["response"])
+        result_row["transcript_ref"] = transcripts.put(agent_call["raw"])
+        result_row["score"] = judge_result.get("score", 0.0)
+        result_row["reasoning"] = judge_result.get("reasoning", "")
+        result_row["duration_seconds"] = round(item["duration"], 2)
+        result_row["status"] = row_status(agent_call, judge_call)
+        result_row["agent_attempts"] = agent_call["attempts"]
+        result_row["judge_attempts"] = judge_call["attempts"] if judge_call else 0
+        result_row["judge_batch"] = batch_size if judge_call else 0
+        result_row["call_errors"] = " | ".join(
+            agent_call["errors"] + (judge_call["errors"] if judge_call else [])
+        )
 
-    for i, q in enumerate(questions):
+        # Save after each question for incremental progress (in input order)
+        with results_lock:
+            results[item["index"]] = result_row
+            save_results([r for r in results if r is not None], args.output)
+
+        if monitor and monitor.add(result_row.get("question_id", ""), result_row["score"]):
+            if not stop.is_set():
+                stop.set()
+                ci = monitor.interval()
+                logger.info(
+                    f"Early stop: {monitor.decision} after {ci['n']} paired questions "
+                    f"(mean change {ci['mean']:+.3f}, CI {ci['low']:+.3f} .. {ci['high']:+.3f})"
+                )
+
+    def record_batch(batch: List[Dict[str, Any]], judge_call: Dict[str, Any]):
+        tutorials = {item["question"].get("tutorial_id", "") for item in batch}
+        batch_question = {
+            "question_id": ",".join(item["key"] for item in batch),
+            "tutorial_id": tutorials.pop() if len(tutorials) == 1 else "",
+        }
+        metrics.record(batch_question, "judge_batch", judge_call)
+
+    batch_judge = BatchJudge(
+        call=lambda prompt: scheduler.call(prompt, system_prompt=judge_def),
+        judge_single=judge_single,
+        on_result=record,
+        batch_size=max(1, args.judge_batch),
+        token_budget=args.judge_token_budget,
+        on_batch=record_batch,
+    )
+
+    def assess(i: int, q: Dict[str, Any]):
+        if stop.is_set():
+            with results_lock:
+                skipped.append(i)
+            return
         logger.info(
             f"Processing {i+1}/{len(questions)}: {q.get('question_id', 'unknown')}"
         )
@@ -170,30 +376,70 @@ def main():
         # 1. Run Agent
         agent_prompt = f"Please answer the following question using the available tools. Provide your full reasoning, the code you executed, and the final answer.\n\nQuestion: {q['question']}"
         start_time = time.time()
-        agent_response, full_agent_response = run_claude_cli(
-            agent_prompt, system_prompt=solver_def
-        )
-        duration = time.time() - start_time
-
-        # 2. Run Judge
-        judge_result = judge_response(
-            q["question"], q["ground_truth"], agent_response, judge_def
-        )
-
-        # 3. Record Result
-        result_row = q.copy()
-        result_row["agent_response"] = agent_response
-        result_row["full_agent_response"] = full_agent_response
-        result_row["score"] = judge_result.get("score", 0.0)
-        result_row["reasoning"] = judge_result.get("reasoning", "")
-        result_row["duration_seconds"] = round(duration, 2)
-
-        results.append(result_row)
+        agent_call = scheduler.call(agent_prompt, system_prompt=solver_def)
+        metrics.record(q, "solver", agent_call)
+        item = {
+            "index": i,
+            "key": q.get("question_id") or f"row{i + 1}",
+            "question": q,
+            "response": agent_call["text"],
+            "agent_call": agent_call,
+            "duration": time.time() - start_time,
+        }
 
-        # Save after each question for incremental progress
-        save_results(results, args.output)
+        # 2. Run Judge (a failed agent call is recorded, not scored)
+        if agent_call["status"] == "failed":
+            record(item, {"score": "", "reasoning": "Not judged: agent call failed"}, None, 0)
+            return
+        with indexes_lock:
+            item["cell_output"] = indexes.lookup(q.get("tutorial_id", ""), q.get("cell_id"))
+        if args.judge_batch > 1:
+            batch_judge.add(item)
+        else:
+            record(item, *judge_single(item), 1)
 
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+            for future in [executor.submit(assess, i, questions[i]) for i in order]:
+                future.result()
+        batch_judge.flush()
+    finally:
+        backend.close()
+        indexes.close()
+
+    stats = backend.stats()
+    logger.info(
+        f"LLM backend: {stats['calls']} calls, {stats.get('processes_started', 0)} CLI "
+        f"processes started, mean {stats['mean_call_seconds']}s per call"
+    )
+    stats = call_stats = scheduler.stats()
+    logger.info(
+        f"Scheduler: {stats['retries']} retries, {stats['failed']} failed calls, "
+        f"{stats['rate_wait_seconds']}s rate-limited, adaptive timeout {stats['timeout']}s"
+    )
+    if args.judge_batch > 1:
+        stats = batch_judge.stats()
+        logger.info(
+            f"Judge batches: {stats['batches']} batched calls scored {stats['batched_items']} "
+            f"responses, {stats['rejudged']} re-judged individually"
+        )
+    if monitor:
+        summary = monitor.summary()
+        assessed = len(questions) - len(skipped)
+        calls_per_question = call_stats["attempts"] / assessed if assessed else 0
+        interval = (
+            f"mean change {summary['mean']:+.3f}, CI {summary['low']:+.3f} .. {summary['high']:+.3f}"
+            if summary["n"]
+            else "no paired scores"
+        )
+        logger.info(
+            f"Sequential: {summary['decision']} against {args.baseline} ({interval}, "
+            f"{summary['n']} paired); skipped {len(skipped)}/{len(questions)} questions, "
+            f"~{round(len(skipped) * calls_per_question)} calls saved"
+        )
     logger.info(f"Assessment complete. Results saved to {args.output}")
+    logger.info(f"Call metrics saved to {metrics_path}")
+    logger.info(f"Transcripts stored in {transcripts.root}")
 
 
 def save_results(results: List[Dict[str, Any]], output_path: str):
@@ -7,11 +7,13 @@ import csv
 import os
 from typing import Dict, Any
 
+from cell_output_index import CellOutputIndex, cell_output_text, normalize_cell_id
+from json_backend import load_path, loads
+
 
 def load_notebook(notebook_path: str) -> Dict[str, Any]:
     """Load a Jupyter notebook."""
-    with open(notebook_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return load_path(notebook_path)
 
 
 def extract_cell_outputs(notebook: Dict[str, Any]) -> Dict[int, str]:
@@ -38,20 +40,9 @@ def extract_cell_outputs(notebook: Dict[str, Any]) -> Dict[int, str]:
             continue
 
         # Combine all text outputs for this cell
-        text_content = []
-        for output in cell_outputs:
-            if "text" in output:
-                text_content.extend(output["text"])
-            elif "data" in output and "text/plain" in output["data"]:
-                text_content.extend(output["data"]["text/plain"])
-            elif "text/plain" in output:  # Some formats might have it directly
-                text_content.extend(output["text/plain"])
-
-        if text_content:
-            # Join and clean up
-            full_text = "".join(text_content).strip()
-            if full_text:
-                outputs[cell_id] = full_text
+        full_text = cell_output_text(cell)
+        if full_text:
+            outputs[cell_id] = full_text
 
     return outputs
 
@@ -108,10 +99,12 @@ def validate_question(
     if cell_id is None:
         return {"valid": False, "reason": "Missing cell_id"}
 
-    if cell_id not in cell_outputs:
+    # Normalized as the --index lookup does, so "12" finds cell 12 with --notebook too
+    cell_id = normalize_cell_id(cell_id)
+    if cell_id is None or cell_id not in cell_outputs:
         return {
             "valid": False,
-            "reason": f"Cell ID {cell_id} has no output or does not exist",
+            "reason": f"Cell ID {question_data['cell_id']} has no output or does not exist",
         }
 
     output_text = cell_outputs[cell_id]
@@ -148,8 +141,11 @@ def main():
     parser = argparse.ArgumentParser(
         description="Validate benchmark questions against notebook execution."
     )
-    parser.add_argument(
-        "--notebook", required=True, help="Path to the executed notebook"
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--notebook", help="Path to the executed notebook")
+    source.add_argument(
+        "--index",
+        help="Cell output index (.idx) from notebook_postprocess.py or cell_output_index.py",
     )
     parser.add_argument(
         "--questions",
@@ -164,11 +160,14 @@ def main():
 
     # Load data
     try:
-        notebook = load_notebook(args.notebook)
+        if args.index:
+            # Memory-mapped; validate_question uses it like the extracted dict
+            cell_outputs = CellOutputIndex(args.index)
+        else:
+            cell_outputs = extract_cell_outputs(load_notebook(args.notebook))
 
         # Load questions - handle potential CLI output wrapping
-        with open(args.questions, "r") as f:
-            raw_data = json.load(f)
+        raw_data = load_path(args.questions)
 
         # Check if it's wrapped in CLI output format
         if isinstance(raw_data, dict) and "result" in raw_data:
@@ -183,11 +182,11 @@ def main():
 
                 if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
                     json_str = content[start_idx : end_idx + 1]
-                    questions_data = json.loads(json_str)
+                    questions_data = loads(json_str)
                 else:
                     # No JSON object found
                     print(
-                        f"Warning: No JSON object found in result for {args.notebook}. Content preview: {content[:100]}...",
+                        f"Warning: No JSON object found in result for {args.notebook or args.index}. Content preview: {content[:100]}...",
                         file=sys.stderr,
                     )
                     questions_data = {"questions": []}  # Return empty to avoid crash
@@ -203,8 +202,6 @@ def main():
         print(f"Error loading files: {e}", file=sys.stderr)
         sys.exit(1)
 
-    cell_outputs = extract_cell_outputs(notebook)
-
     valid_questions = []
 
     # Process questions
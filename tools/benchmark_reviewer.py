@@ -4,58 +4,48 @@ import sys
 import argparse
 import csv
 import os
-import subprocess
+from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+from cell_output_index import IndexCache
+from json_backend import loads
+from llm_backend import BACKENDS, LLMBackend, SubprocessBackend, get_backend
+from llm_scheduler import CallScheduler
+
+# Characters of the source cell output shown to the reviewer per question
+CELL_CONTEXT_CHARS = 500
+
 
 def run_claude_cli(
-    prompt: str, system_prompt: Optional[str] = None, timeout: int = 600
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    timeout: int = 600,
+    backend: Optional[LLMBackend] = None,
 ) -> str:
-    """Run the Claude CLI with the given prompt."""
-    cmd = [
-        "claude",
-        "--model",
-        "claude-sonnet-4-20250514",
-        "--print",
-        "--output-format",
-        "json",
-        "--dangerously-skip-permissions",  # Skip permissions for automated run
-        prompt,
-    ]
+    """Run a prompt through the LLM backend (one Claude CLI process by default)."""
+    text, _ = (backend or SubprocessBackend()).complete(prompt, system_prompt, timeout)
+    return text
 
-    if system_prompt:
-        cmd[-1] = f"{system_prompt}\n\n---\n\n{prompt}"
-
-    try:
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=timeout, cwd=os.getcwd()
-        )
 
-        if result.returncode != 0:
-            print(f"Claude CLI failed: {result.stderr}", file=sys.stderr)
-            return f"ERROR: {result.stderr}"
-
-        # Parse JSON output
-        try:
-            output_json = json.loads(result.stdout)
-            # Handle list or dict
-            if isinstance(output_json, list) and len(output_json) > 0:
-                return output_json[0].get("result", str(output_json))
-            elif isinstance(output_json, dict):
-                return output_json.get("result", str(output_json))
-            else:
-                return result.stdout.strip()
-        except json.JSONDecodeError:
-            return result.stdout.strip()
-
-    except subprocess.TimeoutExpired:
-        return "ERROR: Timeout"
-    except Exception as e:
-        return f"ERROR: {e}"
+def add_cell_context(
+    questions: List[Dict[str, Any]], indexes: IndexCache
+) -> List[Dict[str, Any]]:
+    """Copy of the questions with the output of their source cell attached."""
+    with_context = []
+    for q in questions:
+        text = indexes.lookup(q.get("tutorial_id", ""), q.get("cell_id"))
+        if text:
+            q = dict(q, cell_output=text[:CELL_CONTEXT_CHARS])
+        with_context.append(q)
+    return with_context
 
 
 def review_questions(
-    questions: List[Dict[str, Any]], reviewer_def: str
+    questions: List[Dict[str, Any]],
+    reviewer_def: str,
+    indexes: Optional[IndexCache] = None,
+    timeout: int = 600,
+    backend: Optional[LLMBackend] = None,
 ) -> List[Dict[str, Any]]:
     """
     Run the reviewer agent to filter and refine questions.
@@ -63,6 +53,8 @@ def review_questions(
     if not questions:
         return []
 
+    candidates = add_cell_context(questions, indexes) if indexes else questions
+
     print(
         f"Reviewing {len(questions)} candidate questions globally...", file=sys.stderr
     )
@@ -77,10 +69,12 @@ Ensure diversity across different tutorials if possible, but prioritize quality.
 Return the selected questions in the specified JSON format.
 
 Candidate Questions:
-{json.dumps(questions, indent=2)}
+{json.dumps(candidates, indent=2)}
 """
 
-    response = run_claude_cli(prompt, system_prompt=reviewer_def)
+    response = run_claude_cli(
+        prompt, system_prompt=reviewer_def, timeout=timeout, backend=backend
+    )
 
     # Parse response
     try:
@@ -90,7 +84,7 @@ Candidate Questions:
 
         if start_idx != -1 and end_idx != -1:
             json_str = response[start_idx : end_idx + 1]
-            data = json.loads(json_str)
+            data = loads(json_str)
             return data.get("selected_questions", [])
         else:
             print(
@@ -124,6 +118,26 @@ def main():
         required=False,
         help="Path to save the filtered questions (CSV). Defaults to input path.",
     )
+    parser.add_argument(
+        "--notebooks-dir",
+        help="notebooks/ directory; shows each question's source cell output from its "
+        "<tutorial>_cell_outputs.idx",
+    )
+    parser.add_argument(
+        "--timeout", type=int, default=600, help="Seconds for the Claude CLI call (default: 600)"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="subprocess",
+        help="subprocess: one CLI process per call; pool: pre-started single-use CLI sessions",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=3,
+        help="Retries after transient errors (timeout, overload; default: 3)",
+    )
 
     args = parser.parse_args()
     output_path = args.output if args.output else args.input
@@ -152,7 +166,22 @@ def main():
         sys.exit(1)
 
     # Run review
-    reviewed_questions = review_questions(questions, reviewer_def)
+    indexes = IndexCache(Path(args.notebooks_dir)) if args.notebooks_dir else None
+    # A single call, so its timeout stays fixed at --timeout
+    backend = CallScheduler(
+        get_backend(args.backend),
+        max_retries=args.max_retries,
+        max_timeout=args.timeout,
+        min_timeout=args.timeout,
+    )
+    try:
+        reviewed_questions = review_questions(
+            questions, reviewer_def, indexes, args.timeout, backend
+        )
+    finally:
+        backend.close()
+    if indexes:
+        indexes.close()
 
     if not reviewed_questions:
         print(
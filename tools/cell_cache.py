@@ -0,0 +1,144 @@
+"""
+Cell-level execution cache for tutorial re-runs.
+
+Each code cell gets a key chained from its source and the keys of every code
+cell above it, so editing one cell invalidates it and everything below while
+the prefix stays cached. A cache entry holds the cell's outputs and execution
+metadata; after expensive cells the kernel state can also be checkpointed with
+dill (when installed in the project environment).
+
+On a re-run, execution resumes after the latest checkpoint that precedes the
+first changed or failed cell; cells up to that checkpoint get their outputs
+from the cache. If every cell is cached, no kernel is started at all. Execution
+counts are renumbered afterwards so the notebook matches a cold run.
+
+Used by tutorial_executor.py (`--cell-cache`).
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+CACHE_VERSION = 1
+
+# Run inside the kernel. dill >= 0.3.6 renamed *_session to *_module.
+DUMP_CODE = """
+import dill as _p2a_dill
+(getattr(_p2a_dill, "dump_module", None) or _p2a_dill.dump_session)({path!r})
+del _p2a_dill
+"""
+LOAD_CODE = """
+import dill as _p2a_dill
+(getattr(_p2a_dill, "load_module", None) or _p2a_dill.load_session)({path!r})
+del _p2a_dill
+"""
+
+
+def cell_keys(cells: List[Dict[str, Any]], kernel_name: str) -> List[Optional[str]]:
+    """Chained sha256 key per code cell (None for markdown/raw cells)."""
+    chain = hashlib.sha256(f"v{CACHE_VERSION}:{kernel_name}".encode()).hexdigest()
+    keys: List[Optional[str]] = []
+    for cell in cells:
+        if cell.get("cell_type") != "code":
+            keys.append(None)
+            continue
+        source = cell.get("source", "")
+        if isinstance(source, list):
+            source = "".join(source)
+        chain = hashlib.sha256(f"{chain}\0{source}".encode()).hexdigest()
+        keys.append(chain)
+    return keys
+
+
+class CellCache:
+    """Outputs and kernel checkpoints stored as <key>.json / <key>.pkl files."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def checkpoint_path(self, key: str) -> Path:
+        return self.root / f"{key}.pkl"
+
+    def get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        if key is None:
+            return None
+        try:
+            with open(self._entry_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, cell: Dict[str, Any], seconds: float):
+        entry = {
+            "outputs": cell.get("outputs", []),
+            "execution_count": cell.get("execution_count"),
+            "execution": cell.get("metadata", {}).get("execution"),
+            "seconds": round(seconds, 3),
+        }
+        path = self._entry_path(key)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    def has_checkpoint(self, key: Optional[str]) -> bool:
+        return key is not None and self.checkpoint_path(key).exists()
+
+    def prune(self, keep: List[str]):
+        """Drop entries and checkpoints of cells no longer in the notebook."""
+        wanted = set(keep) | {"language_info"}
+        for path in self.root.iterdir():
+            if path.suffix in (".json", ".pkl") and path.stem not in wanted:
+                path.unlink(missing_ok=True)
+
+    def get_language_info(self) -> Optional[Dict[str, Any]]:
+        return self.get("language_info")
+
+    def put_language_info(self, info: Dict[str, Any]):
+        with open(self._entry_path("language_info"), "w", encoding="utf-8") as f:
+            json.dump(info, f)
+
+
+def plan_resume(keys: List[Optional[str]], cache: CellCache) -> Tuple[int, Optional[Path]]:
+    """
+    Return (last restored index, checkpoint to load).
+
+    Cells up to and including the returned index are restored from the cache.
+    -1 means nothing is restored and the notebook runs from the top.
+    """
+    first_miss = next(
+        (i for i, key in enumerate(keys) if key is not None and cache.get(key) is None),
+        len(keys),
+    )
+    if first_miss == len(keys):
+        return len(keys) - 1, None
+    for index in range(first_miss - 1, -1, -1):
+        if cache.has_checkpoint(keys[index]):
+            return index, cache.checkpoint_path(keys[index])
+    return -1, None
+
+
+def restore_cell(cell: Dict[str, Any], entry: Dict[str, Any]):
+    cell["outputs"] = entry["outputs"]
+    cell["execution_count"] = entry["execution_count"]
+    if entry.get("execution"):
+        cell.setdefault("metadata", {})["execution"] = entry["execution"]
+
+
+def renumber_execution_counts(cells: List[Dict[str, Any]]):
+    """Sequential execution counts, as a single cold run would produce."""
+    count = 0
+    for cell in cells:
+        if cell.get("cell_type") != "code" or cell.get("execution_count") is None:
+            continue
+        count += 1
+        cell["execution_count"] = count
+        for output in cell.get("outputs", []):
+            if output.get("output_type") == "execute_result":
+                output["execution_count"] = count
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Binary cell output index for executed notebooks.
+
+Stores the text output of every code cell (as benchmark_extractor.py sees it)
+in a file that can be memory-mapped and queried in O(1) without parsing JSON:
+
+    header   magic "P2ACOIX1", u32 cell count, u32 execution-count slots,
+             u64 blob offset
+    cells    per cell index: u64 blob offset, u32 byte length, i32 execution_count
+    counts   per execution_count: i32 cell index (-1 if unused)
+    blob     UTF-8 output text of all cells, back to back
+
+All integers are little-endian. Lookups read the tables straight from the
+mapping and decode only the requested slice of the blob.
+
+Usage:
+    python tools/cell_output_index.py build notebooks/<t>/<t>_execution_final.ipynb notebooks/<t>/<t>_cell_outputs.idx
+    python tools/cell_output_index.py get notebooks/<t>/<t>_cell_outputs.idx 12
+"""
+
+import sys
+import mmap
+import struct
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from json_backend import load_path
+
+MAGIC = b"P2ACOIX1"
+HEADER = struct.Struct("<8sIIQ")
+CELL_ENTRY = struct.Struct("<QIi")
+COUNT_ENTRY = struct.Struct("<i")
+
+# benchmark_extractor ids cells without an execution count as index + 10000
+UNNUMBERED_OFFSET = 10000
+
+
+def normalize_cell_id(cell_id: Any) -> Optional[int]:
+    """A benchmark cell_id as an int (questions may give "12" or 12.0); None if invalid."""
+    try:
+        return int(cell_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def cell_output_text(cell: Dict[str, Any]) -> str:
+    """Combined text output of a code cell, stripped ("" if none)."""
+    text_content = []
+    for output in cell.get("outputs", []):
+        if "text" in output:
+            text_content.extend(output["text"])
+        elif "data" in output and "text/plain" in output["data"]:
+            text_content.extend(output["data"]["text/plain"])
+        elif "text/plain" in output:  # Some formats might have it directly
+            text_content.extend(output["text/plain"])
+    return "".join(text_content).strip()
+
+
+def build_index(notebook: Dict[str, Any]) -> bytes:
+    """Serialize the cell output index of a parsed notebook."""
+    cells = notebook.get("cells", [])
+    texts: List[bytes] = []
+    counts: List[int] = []
+    for cell in cells:
+        if cell.get("cell_type") == "code":
+            texts.append(cell_output_text(cell).encode("utf-8"))
+            count = cell.get("execution_count")
+            counts.append(int(count) if count is not None else -1)
+        else:
+            texts.append(b"")
+            counts.append(-1)
+
+    count_slots = max(counts, default=-1) + 1
+    blob_offset = HEADER.size + CELL_ENTRY.size * len(cells) + COUNT_ENTRY.size * count_slots
+
+    parts = [HEADER.pack(MAGIC, len(cells), count_slots, blob_offset)]
+    offset = 0
+    for text, count in zip(texts, counts):
+        parts.append(CELL_ENTRY.pack(offset, len(text), count))
+        offset += len(text)
+
+    # Same winner as the extractor's dict when an execution count repeats:
+    # the last cell with output, else the last cell
+    by_count = [-1] * count_slots
+    for with_output in (False, True):
+        for index, count in enumerate(counts):
+            if count >= 0 and (texts[index] or not with_output):
+                by_count[count] = index
+    parts.extend(COUNT_ENTRY.pack(index) for index in by_count)
+    parts.extend(texts)
+    return b"".join(parts)
+
+
+def write_index(notebook: Dict[str, Any], path: Path):
+    data = build_index(notebook)
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    tmp.replace(path)
+
+
+class CellOutputIndex:
+    """
+    Read-only, memory-mapped view of a cell output index.
+
+    Behaves like the {cell_id: text} dict from
+    benchmark_extractor.extract_cell_outputs (cells with empty output are
+    absent), so it can be passed to validate_question directly.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            size = f.seek(0, 2)
+            if size < HEADER.size:
+                raise ValueError(f"{self.path}: not a cell output index")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.cell_count, self.count_slots, self._blob = HEADER.unpack_from(
+            self._map, 0
+        )
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{self.path}: not a cell output index")
+        self._counts = HEADER.size + CELL_ENTRY.size * self.cell_count
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self) -> "CellOutputIndex":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _entry(self, cell_index: int) -> Tuple[int, int, int]:
+        return CELL_ENTRY.unpack_from(self._map, HEADER.size + CELL_ENTRY.size * cell_index)
+
+    def cell_bytes(self, cell_index: int) -> memoryview:
+        """Zero-copy view of a cell's UTF-8 output (empty if none)."""
+        if not 0 <= cell_index < self.cell_count:
+            raise IndexError(cell_index)
+        offset, length, _ = self._entry(cell_index)
+        start = self._blob + offset
+        return memoryview(self._map)[start : start + length]
+
+    def cell_for_execution_count(self, execution_count: int) -> Optional[int]:
+        if not 0 <= execution_count < self.count_slots:
+            return None
+        position = self._counts + COUNT_ENTRY.size * execution_count
+        (index,) = COUNT_ENTRY.unpack_from(self._map, position)
+        return index if index >= 0 else None
+
+    def by_cell(self, cell_index: int) -> str:
+        with self.cell_bytes(cell_index) as view:
+            return str(view, "utf-8")
+
+    def by_execution_count(self, execution_count: int) -> Optional[str]:
+        index = self.cell_for_execution_count(execution_count)
+        return None if index is None else self.by_cell(index)
+
+    def _resolve(self, cell_id: Any) -> Optional[int]:
+        """Cell index for a benchmark cell_id (execution count, or index + 10000)."""
+        cell_id = normalize_cell_id(cell_id)
+        if cell_id is None:
+            return None
+        index = self.cell_for_execution_count(cell_id)
+        if index is None and cell_id >= UNNUMBERED_OFFSET:
+            candidate = cell_id - UNNUMBERED_OFFSET
+            if candidate < self.cell_count and self._entry(candidate)[2] == -1:
+                index = candidate
+        return index
+
+    def get(self, cell_id: Any, default: Optional[str] = None) -> Optional[str]:
+        index = self._resolve(cell_id)
+        if index is None:
+            return default
+        text = self.by_cell(index)
+        return text if text else default
+
+    def __contains__(self, cell_id: Any) -> bool:
+        return self.get(cell_id) is not None
+
+    def __getitem__(self, cell_id: Any) -> str:
+        text = self.get(cell_id)
+        if text is None:
+            raise KeyError(cell_id)
+        return text
+
+    def _ids(self) -> Iterator[Tuple[int, int]]:
+        """(cell_id, cell index) of every cell with output, one per cell_id."""
+        for index in range(self.cell_count):
+            _, length, count = self._entry(index)
+            if not length:
+                continue
+            if count < 0:
+                yield index + UNNUMBERED_OFFSET, index
+            elif self.cell_for_execution_count(count) == index:
+                yield count, index
+
+    def items(self) -> Iterator[Tuple[int, str]]:
+        for cell_id, index in self._ids():
+            yield cell_id, self.by_cell(index)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._ids())
+
+
+def find_index(notebooks_dir: Path, tutorial_id: str) -> Optional[Path]:
+    """notebooks/<tutorial>/<tutorial>_cell_outputs.idx, if it exists."""
+    path = Path(notebooks_dir) / tutorial_id / f"{tutorial_id}_cell_outputs.idx"
+    return path if path.exists() else None
+
+
+class IndexCache:
+    """Opens each tutorial's index once and keeps it mapped."""
+
+    def __init__(self, notebooks_dir: Optional[Path]):
+        self.notebooks_dir = notebooks_dir
+        self._open: Dict[str, Optional[CellOutputIndex]] = {}
+
+    def lookup(self, tutorial_id: str, cell_id: Any) -> Optional[str]:
+        if not self.notebooks_dir or not tutorial_id:
+            return None
+        if tutorial_id not in self._open:
+            path = find_index(self.notebooks_dir, tutorial_id)
+            self._open[tutorial_id] = CellOutputIndex(path) if path else None
+        index = self._open[tutorial_id]
+        return index.get(cell_id) if index else None
+
+    def close(self):
+        for index in self._open.values():
+            if index:
+                index.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build or query a memory-mapped cell output index."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Index an executed notebook")
+    build.add_argument("notebook", help="Executed notebook")
+    build.add_argument("output", help="Index file to write (.idx)")
+    get = sub.add_parser("get", help="Print one cell's output")
+    get.add_argument("index", help="Index file")
+    get.add_argument("cell_id", type=int, help="Execution count (or cell index with --by-cell)")
+    get.add_argument("--by-cell", action="store_true", help="Look up by cell index")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        notebook = load_path(args.notebook)
+        write_index(notebook, Path(args.output))
+        print(f"Indexed {len(notebook.get('cells', []))} cells to {args.output}")
+        return
+
+    try:
+        with CellOutputIndex(Path(args.index)) as index:
+            if args.by_cell:
+                text = index.by_cell(args.cell_id) if args.cell_id < index.cell_count else None
+            else:
+                text = index.get(args.cell_id)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not text:
+        print(f"No output for cell {args.cell_id}", file=sys.stderr)
+        sys.exit(1)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Parallel Coverage Runner
+
+Produces the reports Step 5 analyzes, with the test files split across worker
+processes instead of one serial pytest run:
+1. Collects tests/code/**/*_test.py and splits the files into --workers
+   shards of about equal expected duration (longest first onto the least
+   loaded shard), using the per-file durations recorded by earlier runs.
+2. Runs one pytest process per shard with pytest-cov, each writing its own
+   coverage data file, while pylint checks src/tools/*.py one file per
+   process in the same run.
+3. Combines the shard coverage data and writes reports/coverage/coverage.xml,
+   coverage.json, htmlcov/, coverage_summary.txt and pytest_output.txt, and
+   reports/quality/pylint/pylint_report.txt and pylint_scores.txt.
+4. Records per-file test durations in reports/coverage/test_durations.json
+   for the next run's sharding.
+5. With --contexts, records which test executed each line and builds the
+   test-impact index used by impacted_tests.py to rerun only affected tests.
+
+Usage:
+    python tools/coverage_runner.py run <PROJECT_DIR> --python <repo>-env/bin/python --workers 4
+    python tools/coverage_runner.py run <PROJECT_DIR> --python <repo>-env/bin/python --contexts
+"""
+
+import os
+import re
+import ast
+import sys
+import json
+import time
+import argparse
+import subprocess
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from impacted_tests import INDEX, find_test_files, write_index
+
+COVERAGE_DIR = Path("reports") / "coverage"
+PYLINT_DIR = Path("reports") / "quality" / "pylint"
+DURATIONS = COVERAGE_DIR / "test_durations.json"
+SCORE_RE = re.compile(r"rated at (-?[\d.]+)/10")
+# pytest exit codes that still mean "the tests ran": all passed, some failed, none collected
+PYTEST_RAN = {0, 1, 5}
+
+
+def load_durations(project_dir: Path) -> Dict[str, float]:
+    path = project_dir / DURATIONS
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def make_shards(files: List[str], durations: Dict[str, float], workers: int) -> List[List[str]]:
+    """Greedy longest-first balancing; files without history count as the median duration."""
+    known = sorted(durations[f] for f in files if f in durations)
+    default = known[len(known) // 2] if known else 1.0
+    shards: List[List[str]] = [[] for _ in range(max(1, min(workers, len(files))))]
+    totals = [0.0] * len(shards)
+    for f in sorted(files, key=lambda f: durations.get(f, default), reverse=True):
+        i = totals.index(min(totals))
+        shards[i].append(f)
+        totals[i] += durations.get(f, default)
+    return shards
+
+
+def junit_durations(junit_xml: Path, project_dir: Path) -> Dict[str, float]:
+    """Seconds per test file from a pytest JUnit XML report (xunit1 has the file)."""
+    totals: Dict[str, float] = {}
+    if not junit_xml.exists():
+        return totals
+    for case in ET.parse(junit_xml).getroot().iter("testcase"):
+        path = case.get("file")
+        if not path:
+            continue
+        path = os.path.relpath(project_dir / path, project_dir)
+        totals[path] = totals.get(path, 0.0) + float(case.get("time") or 0.0)
+    return totals
+
+
+def run_shard(
+    index: int, files: List[str], args: argparse.Namespace, project_dir: Path
+) -> Dict[str, Any]:
+    work = project_dir / COVERAGE_DIR / ".shards"
+    junit = work / f"junit_{index}.xml"
+    env = dict(os.environ, COVERAGE_FILE=str(work / f".coverage.shard{index}"))
+    cmd = [
+        args.python,
+        "-m",
+        "pytest",
+        *files,
+        f"--cov={args.source}",
+        "--cov-report=",
+        f"--junitxml={junit}",
+        "-o",
+        "junit_family=xunit1",
+        "-p",
+        "no:cacheprovider",
+        "-v",
+    ]
+    if args.contexts:
+        cmd.append("--cov-context=test")
+    start = time.perf_counter()
+    result = subprocess.run(cmd, cwd=project_dir, env=env, capture_output=True, text=True)
+    return {
+        "shard": index,
+        "files": files,
+        "returncode": result.returncode,
+        "wall_seconds": round(time.perf_counter() - start, 3),
+        "output": result.stdout + result.stderr,
+        "durations": junit_durations(junit, project_dir),
+    }
+
+
+def count_statements(path: Path) -> int:
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+    except (OSError, SyntaxError, ValueError):
+        return 1
+    return max(1, sum(1 for node in ast.walk(tree) if isinstance(node, ast.stmt)))
+
+
+def run_pylint(path: Path, args: argparse.Namespace, project_dir: Path) -> Dict[str, Any]:
+    cmd = [args.python, "-m", "pylint", str(path.relative_to(project_dir)), "--output-format=text"]
+    result = subprocess.run(cmd, cwd=project_dir, capture_output=True, text=True)
+    match = SCORE_RE.search(result.stdout)
+    return {
+        "file": str(path.relative_to(project_dir)),
+        "score": float(match.group(1)) if match else None,
+        "statements": count_statements(path),
+        "output": result.stdout + result.stderr,
+    }
+
+
+def coverage_reports(args: argparse.Namespace, project_dir: Path) -> List[str]:
+    """Combine shard data and write the XML/JSON/HTML/text reports; returns errors."""
+    out = project_dir / COVERAGE_DIR
+    shard_data = sorted(str(p) for p in (out / ".shards").glob(".coverage.shard*"))
+    env = dict(os.environ, COVERAGE_FILE=str(out / ".coverage"))
+    coverage = [args.python, "-m", "coverage"]
+    steps = [
+        ["combine", *shard_data],
+        ["xml", "-o", str(out / "coverage.xml")],
+        ["json", "-o", str(out / "coverage.json")] + (["--show-contexts"] if args.contexts else []),
+        ["html", "-d", str(out / "htmlcov")],
+        ["report"],
+    ]
+    errors = []
+    for step in steps:
+        result = subprocess.run(coverage + step, cwd=project_dir, env=env, capture_output=True, text=True)
+        if step[0] == "report":
+            (out / "coverage_summary.txt").write_text(result.stdout, encoding="utf-8")
+        if result.returncode != 0:
+            errors.append(f"coverage {step[0]}: {result.stderr.strip() or result.stdout.strip()}")
+            if step[0] == "combine":
+                break
+    return errors
+
+
+def write_pytest_output(path: Path, shards: List[Dict[str, Any]], wall: float):
+    with open(path, "w", encoding="utf-8") as f:
+        for shard in shards:
+            f.write(
+                f"===== shard {shard['shard'] + 1}/{len(shards)}: {len(shard['files'])} files, "
+                f"exit {shard['returncode']}, {shard['wall_seconds']:.1f}s =====\n"
+            )
+            f.write(shard["output"])
+            f.write("\n")
+        f.write(f"===== {len(shards)} shards finished in {wall:.1f}s =====\n")
+
+
+def write_pylint_reports(project_dir: Path, results: List[Dict[str, Any]]) -> Optional[float]:
+    """pylint_report.txt / pylint_scores.txt; returns the overall score."""
+    out = project_dir / PYLINT_DIR
+    out.mkdir(parents=True, exist_ok=True)
+    scored = [r for r in results if r["score"] is not None]
+    # pylint's score is 10 - 10 * penalty / statements, so the overall score is
+    # the statement-weighted mean of the per-file scores
+    overall = None
+    if scored:
+        overall = round(
+            sum(r["score"] * r["statements"] for r in scored) / sum(r["statements"] for r in scored), 2
+        )
+    with open(out / "pylint_report.txt", "w", encoding="utf-8") as f:
+        for r in results:
+            f.write(r["output"].rstrip() + "\n\n")
+        if overall is not None:
+            f.write(f"Your code has been rated at {overall:.2f}/10 (all files, statement-weighted)\n")
+    with open(out / "pylint_scores.txt", "w", encoding="utf-8") as f:
+        for r in results:
+            score = f"{r['score']:.2f}/10" if r["score"] is not None else "no score"
+            f.write(f"{r['file']}: {score}\n")
+        if overall is not None:
+            f.write(f"Overall: {overall:.2f}/10\n")
+    return overall
+
+
+def run_command(args: argparse.Namespace):
+    project_dir = Path(args.project_dir).resolve()
+    if args.workers < 1:
+        print("Error: --workers must be at least 1", file=sys.stderr)
+        sys.exit(1)
+    files = find_test_files(project_dir)
+    tool_files = sorted((project_dir / args.source).glob("*.py"))
+    tool_files = [p for p in tool_files if p.name != "__init__.py"]
+    if not files:
+        print(f"Error: no test files under {project_dir / 'tests' / 'code'}", file=sys.stderr)
+        sys.exit(1)
+
+    out = project_dir / COVERAGE_DIR
+    (out / ".shards").mkdir(parents=True, exist_ok=True)
+    for stale in (out / ".shards").glob("*"):
+        stale.unlink()
+    (out / ".coverage").unlink(missing_ok=True)
+
+    durations = load_durations(project_dir)
+    shards = make_shards(files, durations, args.workers)
+    print(
+        f"Running {len(files)} test files in {len(shards)} shards and pylint on "
+        f"{len(tool_files)} modules...",
+        file=sys.stderr,
+    )
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(shards)) as tests, ThreadPoolExecutor(
+        max_workers=max(1, args.pylint_workers)
+    ) as lint:
+        lint_futures = [] if args.no_pylint else [
+            lint.submit(run_pylint, path, args, project_dir) for path in tool_files
+        ]
+        shard_futures = [
+            tests.submit(run_shard, i, shard, args, project_dir) for i, shard in enumerate(shards)
+        ]
+        shard_results = [f.result() for f in shard_futures]
+        test_wall = time.perf_counter() - start
+        lint_results = [f.result() for f in lint_futures]
+
+    write_pytest_output(out / "pytest_output.txt", shard_results, test_wall)
+    errors = coverage_reports(args, project_dir)
+    overall = write_pylint_reports(project_dir, lint_results) if lint_results else None
+    index = None
+    if args.contexts and not errors:
+        index = write_index(project_dir, out / "coverage.json")
+
+    for shard in shard_results:
+        durations.update(shard["durations"])
+    with open(project_dir / DURATIONS, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(durations.items())), f, indent=2)
+
+    crashed = [s for s in shard_results if s["returncode"] not in PYTEST_RAN]
+    failed = [s for s in shard_results if s["returncode"] == 1]
+    serial = sum(sum(s["durations"].values()) for s in shard_results)
+    print(f"\nSummary:")
+    print(f"  Test files: {len(files)} in {len(shards)} shards")
+    print(
+        f"  Wall time: {time.perf_counter() - start:.1f}s "
+        f"(tests {test_wall:.1f}s, sum of test files {serial:.1f}s)"
+    )
+    print(f"  Shards with failing tests: {len(failed)}")
+    if overall is not None:
+        print(f"  Pylint: {overall:.2f}/10 over {len(lint_results)} modules")
+    for shard in crashed:
+        print(f"  SHARD {shard['shard'] + 1} exited with {shard['returncode']} (see pytest_output.txt)")
+    if index is not None:
+        print(f"  Test-impact index: {len(index['tests'])} test files -> {project_dir / INDEX}")
+    for error in errors:
+        print(f"  ERROR {error}")
+    print(f"  Coverage: {out}")
+    if crashed or errors:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the generated tests in parallel shards with combined coverage, and pylint."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Write the Step 5 coverage and pylint reports")
+    run.add_argument("project_dir", help="Project directory")
+    run.add_argument("--python", default=sys.executable, help="Project environment interpreter")
+    run.add_argument("--source", default="src/tools", help="Measured package (default: src/tools)")
+    run.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    run.add_argument("--pylint-workers", type=int, default=2, help="Concurrent pylint processes")
+    run.add_argument("--no-pylint", action="store_true", help="Only run the tests")
+    run.add_argument(
+        "--contexts",
+        action="store_true",
+        help="Record per-test coverage contexts and build the test-impact index",
+    )
+
+    args = parser.parse_args()
+    run_command(args)
+
+
+if __name__ == "__main__":
+    main()
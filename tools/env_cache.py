@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Environment snapshot cache for Step 1.
+
+Projects built from the same scientific stack install the same pinned
+packages into every <repo>-env. This script:
+1. Resolves the environment's requirements (the Step 1 base packages plus the
+   project's install spec) into a pinned lock file with `uv pip compile`.
+2. Hashes the lock: Python major.minor, platform, index options and every
+   pinned requirement (local/editable entries are left out of the key).
+3. On a cache hit, creates <repo>-env with `uv venv` and hard-links (or
+   reflinks/copies) the prebuilt snapshot's packages into it, rewriting the
+   console-script shebangs to the new location. No package is downloaded,
+   built or unpacked.
+4. On a miss, does the full install once into a new snapshot under the cache,
+   with uv's wheel cache shared between snapshots (--link-mode hardlink), and
+   then materializes the project env from it the same way.
+5. Installs local/editable entries of the lock into the project env only,
+   verifies the interpreter (and --import modules), and reports the time of
+   every phase.
+
+Hard-linked files are shared with the snapshot: uv and pip replace files
+instead of editing them, so installing into the project env later does not
+change the snapshot. Use --link-mode copy for a fully independent env.
+
+The cache lives in $PAPER2AGENT_ENV_CACHE (default: ~/.cache/paper2agent/envs).
+
+Usage:
+    python tools/env_cache.py lock --python 3.10 -r env.in --output reports/env.lock
+    python tools/env_cache.py materialize reports/env.lock <repo>-env --python 3.10 --import <package>
+    python tools/env_cache.py list
+    python tools/env_cache.py prune --max-gb 30
+"""
+
+import os
+import re
+import sys
+import time
+import shutil
+import hashlib
+import argparse
+import platform
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from json_backend import dump_path, load_path
+from link_assets import place_file
+
+CACHE_ROOT = Path(
+    os.environ.get("PAPER2AGENT_ENV_CACHE", Path.home() / ".cache" / "paper2agent" / "envs")
+)
+# Packages every Step 1 environment gets (environment-python-manager.md, Step 2.2)
+BASE_PACKAGES = ["fastmcp", "pytest", "pytest-asyncio", "papermill", "nbclient", "ipykernel", "imagehash"]
+LINK_MODES = ["hardlink", "reflink", "copy"]
+MARKER = ".env-cache.json"
+META = "meta.json"
+# Lock options that change what gets installed, so they are part of the key
+KEY_OPTIONS = (
+    "--index-url", "--extra-index-url", "--find-links", "-i ", "-f ", "--no-binary", "--only-binary"
+)
+LOCAL_RE = re.compile(r"^(-e\s|--editable\s|\.|/|~|file:)|\s@\s+file:")
+
+
+def uv(*args: str, env: Optional[Dict[str, str]] = None) -> subprocess.CompletedProcess:
+    return subprocess.run(["uv", *args], capture_output=True, text=True, env=env)
+
+
+def uv_env(cache_root: Path) -> Dict[str, str]:
+    """Environment for uv: a wheel cache shared by every snapshot unless UV_CACHE_DIR is set."""
+    env = dict(os.environ)
+    env.setdefault("UV_CACHE_DIR", str(cache_root / "uv"))
+    return env
+
+
+def find_python(version: str) -> Tuple[str, str]:
+    """(interpreter path, "cpython-3.10.14"-style version) for a Python request."""
+    result = uv("python", "find", version)
+    if result.returncode != 0:
+        raise RuntimeError(f"no Python {version}: {result.stderr.strip()}")
+    interpreter = result.stdout.strip()
+    probe = subprocess.run(
+        [
+            interpreter,
+            "-c",
+            "import platform; print(platform.python_implementation(), platform.python_version())",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    implementation, full = probe.stdout.split()
+    return interpreter, f"{implementation.lower()}-{full}"
+
+
+def parse_lock(text: str) -> Dict[str, List[str]]:
+    """Split a lock file into pinned requirements, local/editable entries and options."""
+    lines, current = [], ""
+    for raw in text.splitlines():
+        line = raw.split(" #", 1)[0].strip() if not raw.lstrip().startswith("#") else ""
+        if line.endswith("\\"):
+            current += line[:-1].strip() + " "
+            continue
+        current += line
+        if current.strip():
+            lines.append(" ".join(current.split()))
+        current = ""
+    if current.strip():
+        lines.append(" ".join(current.split()))
+
+    parts: Dict[str, List[str]] = {"pinned": [], "local": [], "options": []}
+    for line in lines:
+        if LOCAL_RE.search(line):
+            parts["local"].append(line)
+        elif line.startswith("-"):
+            parts["options"].append(line)
+        else:
+            parts["pinned"].append(line)
+    return parts
+
+
+def lock_key(parts: Dict[str, List[str]], python_version: str) -> str:
+    """Cache key: Python major.minor, platform, index options and pinned requirements."""
+    implementation, full = python_version.split("-", 1)
+    minor = ".".join(full.split(".")[:2])
+    digest = hashlib.sha256()
+    digest.update(f"python={implementation}-{minor}\n".encode())
+    digest.update(f"platform={sys.platform}-{platform.machine()}\n".encode())
+    for option in sorted(o for o in parts["options"] if o.startswith(KEY_OPTIONS)):
+        digest.update(f"option={option}\n".encode())
+    for requirement in sorted(parts["pinned"], key=str.lower):
+        digest.update(f"{requirement.lower()}\n".encode())
+    return f"{implementation}{minor.replace('.', '')}-{digest.hexdigest()[:20]}"
+
+
+def env_python(env_dir: Path) -> Path:
+    return env_dir / ("Scripts/python.exe" if os.name == "nt" else "bin/python")
+
+
+def build_snapshot(
+    cache_root: Path, key: str, parts: Dict[str, List[str]], interpreter: str, python_version: str
+) -> Dict[str, Any]:
+    """Full install of the pinned requirements into cache_root/<key>/env (a cache miss)."""
+    tmp = cache_root / f".{key}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    requirements = tmp / "requirements.lock"
+    requirements.write_text("\n".join(parts["options"] + parts["pinned"]) + "\n", encoding="utf-8")
+
+    env = uv_env(cache_root)
+    timings = {}
+    start = time.perf_counter()
+    result = uv("venv", "--python", interpreter, str(tmp / "env"), env=env)
+    timings["venv"] = time.perf_counter() - start
+    if result.returncode == 0:
+        start = time.perf_counter()
+        result = uv(
+            "pip",
+            "install",
+            "--python",
+            str(env_python(tmp / "env")),
+            "--link-mode",
+            "hardlink",
+            "--compile-bytecode",
+            "--no-deps",
+            "-r",
+            str(requirements),
+            env=env,
+        )
+        timings["install"] = time.perf_counter() - start
+    if result.returncode != 0:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise RuntimeError(f"full install failed: {result.stderr.strip()[-2000:]}")
+
+    meta = {
+        "key": key,
+        "python": python_version,
+        "interpreter": interpreter,
+        # Absolute path baked into the snapshot's console scripts
+        "built_at": str(tmp / "env"),
+        "packages": len(parts["pinned"]),
+        "created": time.time(),
+        "last_used": time.time(),
+        "build_seconds": round(sum(timings.values()), 3),
+    }
+    dump_path(meta, tmp / META)
+    entry = cache_root / key
+    try:
+        os.rename(tmp, entry)
+    except OSError:
+        # Another project built the same snapshot meanwhile; use that one
+        shutil.rmtree(tmp, ignore_errors=True)
+    return {k: round(v, 3) for k, v in timings.items()}
+
+
+def link_env(snapshot: Path, target: Path, mode: str, built_at: str) -> Dict[str, int]:
+    """
+    Place the snapshot's files into a fresh venv at target.
+
+    Files the new venv already has (pyvenv.cfg, the interpreter links, the
+    activate scripts) are kept; scripts with the path the snapshot was built
+    at (`built_at`) in their shebang are rewritten for target.
+    """
+    stats = {"linked": 0, "copied": 0, "rewritten": 0, "kept": 0}
+    old_prefix, new_prefix = built_at.encode(), str(target).encode()
+    for current, dirs, names in os.walk(snapshot):
+        rel_dir = Path(current).relative_to(snapshot)
+        (target / rel_dir).mkdir(exist_ok=True)
+        for name in dirs + names:
+            src, dst = Path(current) / name, target / rel_dir / name
+            if src.is_symlink():
+                if not (dst.exists() or dst.is_symlink()):
+                    link = os.readlink(src).replace(built_at, str(target))
+                    os.symlink(link, dst)
+                    stats["linked"] += 1
+                if name in dirs:
+                    dirs.remove(name)
+                continue
+            if name in dirs or dst.exists() or (rel_dir == Path(".") and name == "pyvenv.cfg"):
+                if name not in dirs:
+                    stats["kept"] += 1
+                continue
+            if rel_dir.parts[:1] in (("bin",), ("Scripts",)):
+                with open(src, "rb") as f:
+                    head = f.read(2)
+                    data = head + f.read() if head == b"#!" else b""
+                if old_prefix in data:
+                    dst.write_bytes(data.replace(old_prefix, new_prefix))
+                    shutil.copymode(src, dst)
+                    stats["rewritten"] += 1
+                    continue
+            method = place_file(src, dst, mode)
+            stats["copied" if method == "copy" else "linked"] += 1
+    return stats
+
+
+def materialize(
+    lock_path: Path,
+    target: Path,
+    python: str,
+    cache_root: Path = CACHE_ROOT,
+    mode: str = "hardlink",
+    imports: Optional[List[str]] = None,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """Create target from the snapshot for the lock's key, building the snapshot on a miss."""
+    total = time.perf_counter()
+    timings: Dict[str, float] = {}
+    target = target.absolute()
+    if target.exists():
+        if not force:
+            raise RuntimeError(f"{target} already exists (use --force to replace it)")
+        shutil.rmtree(target)
+
+    start = time.perf_counter()
+    parts = parse_lock(lock_path.read_text(encoding="utf-8"))
+    interpreter, python_version = find_python(python)
+    key = lock_key(parts, python_version)
+    timings["hash"] = time.perf_counter() - start
+
+    entry = cache_root / key
+    hit = (entry / META).exists()
+    if not hit:
+        timings.update(build_snapshot(cache_root, key, parts, interpreter, python_version))
+    meta = load_path(entry / META)
+
+    env = uv_env(cache_root)
+    start = time.perf_counter()
+    result = uv("venv", "--python", meta["interpreter"], str(target), env=env)
+    if result.returncode != 0:
+        raise RuntimeError(f"uv venv failed: {result.stderr.strip()}")
+    timings["target_venv"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stats = link_env(entry / "env", target, mode, meta["built_at"])
+    timings["link"] = time.perf_counter() - start
+
+    if parts["local"]:
+        start = time.perf_counter()
+        local = []
+        for line in parts["local"]:
+            local += line.split(None, 1) if line.startswith("-") else [line]
+        result = uv("pip", "install", "--python", str(env_python(target)), "--no-deps", *local, env=env)
+        if result.returncode != 0:
+            raise RuntimeError(f"local install failed: {result.stderr.strip()[-2000:]}")
+        timings["local_install"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    check = "import sys; " + "".join(f"import {m}; " for m in imports or []) + "print(sys.version)"
+    result = subprocess.run([str(env_python(target)), "-c", check], capture_output=True, text=True)
+    timings["verify"] = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"verification failed: {result.stderr.strip()[-2000:]}")
+
+    meta["last_used"] = time.time()
+    dump_path(meta, entry / META)
+    report = {
+        "key": key,
+        "cache": "hit" if hit else "miss",
+        "python": python_version,
+        "target": str(target),
+        "snapshot": str(entry),
+        "link_mode": mode,
+        "pinned": len(parts["pinned"]),
+        "local": parts["local"],
+        "files": stats,
+        "timings": {k: round(v, 3) for k, v in timings.items()},
+        "total_seconds": round(time.perf_counter() - total, 3),
+    }
+    dump_path({k: report[k] for k in ("key", "cache", "python", "snapshot", "pinned")}, target / MARKER)
+    return report
+
+
+def lock(
+    requirements: List[str], packages: List[str], python: str, output: Path, base: bool = True
+) -> Dict[str, Any]:
+    """Resolve requirement files and package specs into a pinned lock file."""
+    lines = (BASE_PACKAGES if base else []) + list(packages)
+    for path in requirements:
+        lines.append(f"-r {Path(path).absolute()}")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    result = subprocess.run(
+        ["uv", "pip", "compile", "-", "--python-version", python, "-o", str(output), "--quiet"],
+        input="\n".join(lines) + "\n",
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"resolution failed: {result.stderr.strip()[-2000:]}")
+    return {"output": str(output), "seconds": round(time.perf_counter() - start, 3)}
+
+
+def snapshot_bytes(path: Path) -> int:
+    """Disk use of a snapshot, counting each inode once."""
+    seen, total = set(), 0
+    for current, _, names in os.walk(path):
+        for name in names:
+            stat = os.lstat(os.path.join(current, name))
+            if (stat.st_dev, stat.st_ino) not in seen:
+                seen.add((stat.st_dev, stat.st_ino))
+                total += stat.st_size
+    return total
+
+
+def list_snapshots(cache_root: Path) -> List[Dict[str, Any]]:
+    """Snapshots in the cache, least recently used first."""
+    if not cache_root.is_dir():
+        return []
+    entries = []
+    for meta_path in cache_root.glob(f"*/{META}"):
+        meta = load_path(meta_path)
+        meta["bytes"] = snapshot_bytes(meta_path.parent / "env")
+        entries.append(meta)
+    return sorted(entries, key=lambda m: m["last_used"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Materialize Python environments from a lock-hash cache.")
+    parser.add_argument(
+        "--cache-dir", default=str(CACHE_ROOT), help=f"Snapshot cache (default: {CACHE_ROOT})"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    lock_cmd = sub.add_parser("lock", help="Resolve requirements into a pinned lock file")
+    lock_cmd.add_argument("--python", required=True, help="Python version (e.g. 3.10)")
+    lock_cmd.add_argument("-r", "--requirement", action="append", default=[], help="Requirements file")
+    lock_cmd.add_argument("-p", "--package", action="append", default=[], help="Package spec")
+    lock_cmd.add_argument("--no-base", action="store_true", help="Leave out the Step 1 base packages")
+    lock_cmd.add_argument(
+        "--output", default="reports/env.lock", help="Lock file (default: reports/env.lock)"
+    )
+
+    key_cmd = sub.add_parser("key", help="Print the cache key of a lock file")
+    key_cmd.add_argument("lock", help="Lock file")
+    key_cmd.add_argument("--python", required=True, help="Python version (e.g. 3.10)")
+
+    mat = sub.add_parser(
+        "materialize", help="Create an environment from the cache (full install on a miss)"
+    )
+    mat.add_argument("lock", help="Lock file")
+    mat.add_argument("target", help="Environment directory (e.g. <repo>-env)")
+    mat.add_argument("--python", required=True, help="Python version (e.g. 3.10)")
+    mat.add_argument(
+        "--link-mode", choices=LINK_MODES, default="hardlink", help="How snapshot files are placed"
+    )
+    mat.add_argument(
+        "--import", dest="imports", action="append", default=[], help="Module that must import"
+    )
+    mat.add_argument("--force", action="store_true", help="Replace an existing target")
+    mat.add_argument("--report", default="reports/env_cache.json", help="Timing report JSON")
+
+    sub.add_parser("list", help="List cached snapshots")
+    prune = sub.add_parser("prune", help="Remove least recently used snapshots")
+    prune.add_argument("--max-gb", type=float, required=True, help="Cache size to keep under")
+
+    args = parser.parse_args()
+    cache_root = Path(args.cache_dir)
+    if args.command in ("lock", "key", "materialize") and shutil.which("uv") is None:
+        print("Error: uv is not installed (pip install uv)", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        if args.command == "lock":
+            result = lock(
+                args.requirement, args.package, args.python, Path(args.output), not args.no_base
+            )
+            pinned = parse_lock(Path(result["output"]).read_text(encoding="utf-8"))["pinned"]
+            print(
+                f"Resolved {len(pinned)} pinned requirements in {result['seconds']:.1f}s "
+                f"-> {result['output']}"
+            )
+        elif args.command == "key":
+            _, python_version = find_python(args.python)
+            print(lock_key(parse_lock(Path(args.lock).read_text(encoding="utf-8")), python_version))
+        elif args.command == "materialize":
+            cache_root.mkdir(parents=True, exist_ok=True)
+            report = materialize(
+                Path(args.lock),
+                Path(args.target),
+                args.python,
+                cache_root,
+                args.link_mode,
+                args.imports,
+                args.force,
+            )
+            Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+            dump_path(report, args.report)
+            files = report["files"]
+            print(f"\nSummary:")
+            print(f"  Cache: {report['cache'].upper()} {report['key']} ({report['python']})")
+            print(
+                f"  Environment: {report['target']} "
+                f"({report['pinned']} pinned, {len(report['local'])} local)"
+            )
+            print(
+                f"  Files: {files['linked']} linked, {files['copied']} copied, "
+                f"{files['rewritten']} scripts rewritten ({report['link_mode']})"
+            )
+            print(f"  Timings: " + ", ".join(f"{k} {v:.2f}s" for k, v in report["timings"].items()))
+            print(f"  Total: {report['total_seconds']:.2f}s")
+            print(f"  Report: {args.report}")
+        elif args.command == "list":
+            snapshots = list_snapshots(cache_root)
+            for meta in snapshots:
+                used = time.strftime("%Y-%m-%d %H:%M", time.localtime(meta["last_used"]))
+                print(
+                    f"  {meta['key']}  {meta['python']}  {meta['packages']} packages  "
+                    f"{meta['bytes'] / 1e9:.2f} GB  last used {used}"
+                )
+            print(f"\nSummary:")
+            size = sum(m["bytes"] for m in snapshots) / 1e9
+            print(f"  Snapshots: {len(snapshots)}, {size:.2f} GB in {cache_root}")
+        else:
+            snapshots = list_snapshots(cache_root)
+            total = sum(m["bytes"] for m in snapshots)
+            removed = 0
+            for meta in snapshots:
+                if total <= args.max_gb * 1e9:
+                    break
+                shutil.rmtree(cache_root / meta["key"])
+                total -= meta["bytes"]
+                removed += 1
+            print(f"\nSummary:")
+            print(f"  Removed: {removed} snapshots, {total / 1e9:.2f} GB left in {cache_root}")
+    except (RuntimeError, OSError, subprocess.CalledProcessError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,80 @@
 #!/usr/bin/env python3
-"""Extract all images from a Jupyter notebook."""
+"""Extract all images from a Jupyter notebook.
 
-import json
+With --optimize, the extracted images are then given thumbnails, and PNGs
+(JPEGs only for WebP output or an explicit --quality) are recompressed and
+stripped of metadata (see image_optimizer.py).
+"""
+
+import argparse
 import base64
 import os
 from pathlib import Path
 import sys
 
+from image_optimizer import add_optimize_arguments, optimize_directory, print_report
+from json_backend import load_path
+
+def save_output_image(output, cell_idx, output_idx, image_count, output_dir):
+    """Save the image in one cell output, if any.
+
+    Args:
+        output: Notebook output dict
+        cell_idx: Zero-based cell index
+        output_idx: Zero-based output index within the cell
+        image_count: Images saved so far
+        output_dir: Directory to save extracted images
+
+    Returns:
+        The updated image count
+    """
+    # Check for image data in different formats
+    if 'data' not in output:
+        return image_count
+    data = output['data']
+    
+    # PNG images
+    if 'image/png' in data:
+        image_count += 1
+        image_data = data['image/png']
+        # Decode base64
+        image_bytes = base64.b64decode(image_data)
+        # Save image
+        filename = f"cell_{cell_idx+1}_output_{output_idx+1}_fig_{image_count}.png"
+        filepath = output_dir / filename
+        with open(filepath, 'wb') as img_file:
+            img_file.write(image_bytes)
+        print(f"Saved: {filename}")
+    
+    # JPEG images
+    elif 'image/jpeg' in data:
+        image_count += 1
+        image_data = data['image/jpeg']
+        # Decode base64
+        image_bytes = base64.b64decode(image_data)
+        # Save image
+        filename = f"cell_{cell_idx+1}_output_{output_idx+1}_fig_{image_count}.jpg"
+        filepath = output_dir / filename
+        with open(filepath, 'wb') as img_file:
+            img_file.write(image_bytes)
+        print(f"Saved: {filename}")
+    
+    # SVG images
+    elif 'image/svg+xml' in data:
+        image_count += 1
+        svg_data = data['image/svg+xml']
+        # SVG is usually not base64 encoded
+        if isinstance(svg_data, list):
+            svg_data = ''.join(svg_data)
+        filename = f"cell_{cell_idx+1}_output_{output_idx+1}_fig_{image_count}.svg"
+        filepath = output_dir / filename
+        with open(filepath, 'w') as img_file:
+            img_file.write(svg_data)
+        print(f"Saved: {filename}")
+
+    return image_count
+
+
 def extract_images_from_notebook(notebook_path, output_dir):
     """Extract all images from a Jupyter notebook.
     
@@ -19,8 +87,7 @@ def extract_images_from_notebook(notebook_path, output_dir):
     output_dir.mkdir(parents=True, exist_ok=True)
     
     # Load notebook
-    with open(notebook_path, 'r') as f:
-        notebook = json.load(f)
+    notebook = load_path(notebook_path)
     
     image_count = 0
     
@@ -28,58 +95,37 @@ def extract_images_from_notebook(notebook_path, output_dir):
     for cell_idx, cell in enumerate(notebook['cells']):
         if 'outputs' in cell:
             for output_idx, output in enumerate(cell['outputs']):
-                # Check for image data in different formats
-                if 'data' in output:
-                    data = output['data']
-                    
-                    # PNG images
-                    if 'image/png' in data:
-                        image_count += 1
-                        image_data = data['image/png']
-                        # Decode base64
-                        image_bytes = base64.b64decode(image_data)
-                        # Save image
-                        filename = f"cell_{cell_idx+1}_output_{output_idx+1}_fig_{image_count}.png"
-                        filepath = output_dir / filename
-                        with open(filepath, 'wb') as img_file:
-                            img_file.write(image_bytes)
-                        print(f"Saved: {filename}")
-                    
-                    # JPEG images
-                    elif 'image/jpeg' in data:
-                        image_count += 1
-                        image_data = data['image/jpeg']
-                        # Decode base64
-                        image_bytes = base64.b64decode(image_data)
-                        # Save image
-                        filename = f"cell_{cell_idx+1}_output_{output_idx+1}_fig_{image_count}.jpg"
-                        filepath = output_dir / filename
-                        with open(filepath, 'wb') as img_file:
-                            img_file.write(image_bytes)
-                        print(f"Saved: {filename}")
-                    
-                    # SVG images
-                    elif 'image/svg+xml' in data:
-                        image_count += 1
-                        svg_data = data['image/svg+xml']
-                        # SVG is usually not base64 encoded
-                        if isinstance(svg_data, list):
-                            svg_data = ''.join(svg_data)
-                        filename = f"cell_{cell_idx+1}_output_{output_idx+1}_fig_{image_count}.svg"
-                        filepath = output_dir / filename
-                        with open(filepath, 'w') as img_file:
-                            img_file.write(svg_data)
-                        print(f"Saved: {filename}")
+                image_count = save_output_image(
+                    output, cell_idx, output_idx, image_count, output_dir
+                )
     
     print(f"\nTotal images extracted: {image_count}")
     return image_count
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python extract_notebook_images.py <notebook.ipynb> <output_dir>")
-        sys.exit(1)
-    
-    notebook_path = sys.argv[1]
-    output_dir = sys.argv[2]
-    
-    extract_images_from_notebook(notebook_path, output_dir)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Extract all images from a Jupyter notebook.")
+    parser.add_argument("notebook_path", help="Path to the .ipynb file")
+    parser.add_argument("output_dir", help="Directory to save extracted images")
+    parser.add_argument(
+        "--optimize", action="store_true", help="Recompress images and write thumbnails"
+    )
+    add_optimize_arguments(parser)
+    args = parser.parse_args()
+
+    extract_images_from_notebook(args.notebook_path, args.output_dir)
+    if args.optimize:
+        try:
+            report = optimize_directory(
+                Path(args.output_dir),
+                args.format,
+                args.quality,
+                args.lossless,
+                args.thumbnail_size,
+                args.keep_originals,
+                args.workers,
+                args.report,
+            )
+        except RuntimeError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print_report(report)
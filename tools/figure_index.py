@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Perceptual-hash index of the tutorial figures.
+
+Tests check that tool-produced figures match the figures extracted from the
+executed tutorials (notebooks/<tutorial>/images/). Comparing every generated
+figure against every tutorial figure with imagehash reloads and rehashes the
+tutorial images each time. This script:
+1. Hashes every extracted PNG/JPEG/WebP once (64-bit pHash and dHash, computed
+   the way imagehash.phash/dhash compute them) and stores them as packed uint64
+   NumPy arrays with per-figure metadata in one .npz file. Rebuilding only
+   rehashes files whose size or mtime changed.
+2. Finds the nearest tutorial figure for any number of images with one
+   vectorized XOR + popcount over the whole array, so matching all test
+   outputs against all tutorial figures takes milliseconds.
+
+SVG outputs are not indexed (they would need a rasterizer).
+
+Usage:
+    python tools/figure_index.py build notebooks/ --output reports/figure_index.npz
+    python tools/figure_index.py match reports/figure_index.npz results/figure.png --max-distance 10
+
+In a test:
+    index = FigureIndex.load("reports/figure_index.npz")
+    match = index.nearest_paths(["<generated_figure.png>"], tutorial="<tutorial_name>")[0]
+    assert match["phash_distance"] < 20
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from PIL import Image
+
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+from json_backend import dumps, loads
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp"}
+HASH_SIZE = 8
+PHASH_SIZE = HASH_SIZE * 4
+
+# Popcount of every byte value, for NumPy versions without np.bitwise_count
+POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """Unnormalized DCT-II basis (scipy.fftpack.dct's default), as a matrix."""
+    k = np.arange(n)[:, None]
+    x = np.arange(n)[None, :]
+    return 2 * np.cos(np.pi * k * (2 * x + 1) / (2 * n))
+
+
+DCT = _dct_matrix(PHASH_SIZE)
+
+
+def pack_bits(bits: np.ndarray) -> int:
+    """64 booleans (row-major, first bit most significant) -> int, as imagehash orders them."""
+    return int.from_bytes(np.packbits(bits.astype(bool).ravel()).tobytes(), "big")
+
+
+def image_hashes(path: Path) -> Dict[str, int]:
+    """pHash and dHash of an image file as 64-bit integers."""
+    if not HAS_PIL:
+        raise RuntimeError("figure hashing needs Pillow: pip install pillow")
+    with Image.open(path) as image:
+        gray = image.convert("L")
+        small = np.asarray(gray.resize((PHASH_SIZE, PHASH_SIZE), Image.LANCZOS), dtype=np.float64)
+        wide = np.asarray(gray.resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS), dtype=np.float64)
+    low = (DCT @ small @ DCT.T)[:HASH_SIZE, :HASH_SIZE]
+    return {
+        "phash": pack_bits(low > np.median(low)),
+        "dhash": pack_bits(wide[:, 1:] > wide[:, :-1]),
+    }
+
+
+def popcount(values: np.ndarray) -> np.ndarray:
+    """Set bits of every uint64 in an array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values).astype(np.int64)
+    as_bytes = values.view(np.uint8).reshape(values.shape + (8,))
+    return POPCOUNT8[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+def hamming(queries: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """(len(queries), len(index)) Hamming distances between two uint64 hash arrays."""
+    return popcount(np.bitwise_xor(queries[:, None], index[None, :]))
+
+
+def find_figures(notebooks_dir: Path) -> List[Path]:
+    """Extracted figures: notebooks/<tutorial>/images/*.{png,jpg,jpeg,webp} (not thumbnails)."""
+    return sorted(
+        p for p in notebooks_dir.glob("*/images/*") if p.suffix.lower() in IMAGE_SUFFIXES and p.is_file()
+    )
+
+
+class FigureIndex:
+    """Packed pHash/dHash arrays plus metadata (path, tutorial, size, mtime) per figure."""
+
+    def __init__(self, phash: np.ndarray, dhash: np.ndarray, meta: List[Dict[str, Any]]):
+        self.phash = phash.astype(np.uint64)
+        self.dhash = dhash.astype(np.uint64)
+        self.meta = meta
+
+    def __len__(self) -> int:
+        return len(self.meta)
+
+    @classmethod
+    def load(cls, path: Path) -> "FigureIndex":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["phash"], data["dhash"], loads(str(data["meta"])))
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # np.savez appends .npz to other names; write to a temp name and rename
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp, phash=self.phash, dhash=self.dhash, meta=np.array(dumps(self.meta, indent=None)))
+        os.replace(tmp, path)
+
+    @classmethod
+    def build(
+        cls, notebooks_dir: Path, previous: Optional["FigureIndex"] = None
+    ) -> "FigureIndex":
+        """Index every extracted figure, reusing hashes of files that did not change."""
+        known = {}
+        if previous is not None:
+            for i, m in enumerate(previous.meta):
+                known[m["path"]] = (m, int(previous.phash[i]), int(previous.dhash[i]))
+        meta, phash, dhash = [], [], []
+        for path in find_figures(notebooks_dir):
+            stat = path.stat()
+            rel = os.path.relpath(path, notebooks_dir)
+            entry = {
+                "path": rel,
+                "tutorial": Path(rel).parts[0],
+                "bytes": stat.st_size,
+                "mtime": stat.st_mtime,
+            }
+            cached = known.get(rel)
+            if cached and cached[0]["bytes"] == entry["bytes"] and cached[0]["mtime"] == entry["mtime"]:
+                hashes = {"phash": cached[1], "dhash": cached[2]}
+            else:
+                try:
+                    hashes = image_hashes(path)
+                except (OSError, ValueError) as e:
+                    print(f"Warning: skipping {path}: {e}", file=sys.stderr)
+                    continue
+            meta.append(entry)
+            phash.append(hashes["phash"])
+            dhash.append(hashes["dhash"])
+        return cls(np.array(phash, dtype=np.uint64), np.array(dhash, dtype=np.uint64), meta)
+
+    def nearest(
+        self,
+        phash: Sequence[int],
+        dhash: Sequence[int],
+        tutorial: Optional[str] = None,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Nearest indexed figure (by pHash, ties broken by dHash) for each query.
+
+        Each match is the figure's metadata plus phash_distance and
+        dhash_distance; None when the index (or the tutorial) has no figures.
+        """
+        candidates = np.arange(len(self.meta))
+        if tutorial is not None:
+            candidates = np.array(
+                [i for i, m in enumerate(self.meta) if m["tutorial"] == tutorial], dtype=int
+            )
+        if len(candidates) == 0:
+            return [None] * len(phash)
+        p = hamming(np.array(phash, dtype=np.uint64), self.phash[candidates])
+        d = hamming(np.array(dhash, dtype=np.uint64), self.dhash[candidates])
+        best = np.argmin(p * 65 + d, axis=1)  # pHash first, dHash (< 65) breaks ties
+        rows = np.arange(len(best))
+        return [
+            {
+                **self.meta[candidates[b]],
+                "phash_distance": int(p[r, b]),
+                "dhash_distance": int(d[r, b]),
+            }
+            for r, b in zip(rows, best)
+        ]
+
+    def nearest_paths(
+        self, paths: Sequence[Path], tutorial: Optional[str] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Hash image files and return their nearest indexed figures."""
+        hashes = [image_hashes(Path(p)) for p in paths]
+        return self.nearest([h["phash"] for h in hashes], [h["dhash"] for h in hashes], tutorial)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perceptual-hash index of extracted tutorial figures.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Hash notebooks/<tutorial>/images/ into an index")
+    build.add_argument("notebooks_dir", help="notebooks/ directory")
+    build.add_argument("--output", default="reports/figure_index.npz", help="Index file (.npz)")
+    build.add_argument("--rebuild", action="store_true", help="Rehash every figure")
+    match = sub.add_parser("match", help="Nearest tutorial figure for each image")
+    match.add_argument("index", help="Index file (.npz)")
+    match.add_argument("images", nargs="+", help="Image files or directories")
+    match.add_argument("--tutorial", help="Only match figures of this tutorial")
+    match.add_argument(
+        "--max-distance", type=int, default=10, help="pHash distance counted as a match (default: 10)"
+    )
+
+    args = parser.parse_args()
+    if not HAS_PIL:
+        print("Error: figure hashing needs Pillow: pip install pillow", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == "build":
+        notebooks_dir = Path(args.notebooks_dir)
+        if not notebooks_dir.is_dir():
+            print(f"Error: {notebooks_dir} is not a directory", file=sys.stderr)
+            sys.exit(1)
+        output = Path(args.output)
+        previous = FigureIndex.load(output) if output.exists() and not args.rebuild else None
+        start = time.perf_counter()
+        index = FigureIndex.build(notebooks_dir, previous)
+        index.save(output)
+        tutorials = {m["tutorial"] for m in index.meta}
+        print(
+            f"Indexed {len(index)} figures from {len(tutorials)} tutorials "
+            f"in {time.perf_counter() - start:.2f}s -> {output}"
+        )
+        return
+
+    if not Path(args.index).exists():
+        print(f"Error: {args.index} does not exist", file=sys.stderr)
+        sys.exit(1)
+    index = FigureIndex.load(Path(args.index))
+    images: List[Path] = []
+    for item in args.images:
+        path = Path(item)
+        if path.is_dir():
+            images += sorted(p for p in path.rglob("*") if p.suffix.lower() in IMAGE_SUFFIXES)
+        else:
+            images.append(path)
+
+    start = time.perf_counter()
+    matches = index.nearest_paths(images, args.tutorial)
+    elapsed = time.perf_counter() - start
+    unmatched = 0
+    for image, match in zip(images, matches):
+        if match is None or match["phash_distance"] > args.max_distance:
+            unmatched += 1
+            nearest = f"nearest {match['path']} ({match['phash_distance']})" if match else "no figures"
+            print(f"  NO MATCH {image}: {nearest}")
+        else:
+            print(
+                f"  {image} -> {match['path']} "
+                f"(pHash {match['phash_distance']}, dHash {match['dhash_distance']})"
+            )
+
+    print(f"\nSummary:")
+    print(f"  Images: {len(images)} against {len(index)} figures in {elapsed * 1000:.1f}ms")
+    print(f"  Unmatched: {unmatched}")
+    if unmatched:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
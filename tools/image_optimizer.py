@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Image normalization and recompression for extracted notebook figures.
+
+Step 2 renders figures at 300 DPI, so extract_notebook_images.py writes
+multi-megabyte PNGs. This optional stage, run on an images/ directory in a
+process pool:
+1. Re-encodes every PNG with metadata stripped (text chunks, EXIF, ICC
+   profile): optimized PNG (lossless, the default) or WebP (lossy at
+   --quality, or lossless). The stripped encoding is written even when it is
+   not smaller. JPEGs are left byte-identical by default, since re-encoding
+   them is lossy; they are re-encoded (and stripped) only for WebP output or
+   with an explicit --quality.
+2. Writes a thumbnail no larger than --thumbnail-size pixels per side to
+   images/thumbnails/, for quick loading in tests and multimodal review.
+3. Moves originals to images/originals/ only with --keep-originals. A stored
+   original is replaced when the image was re-extracted (it differs from both
+   the stored original and the output written last time).
+4. Writes a JSON report with bytes before/after and processing time per image.
+
+Usage:
+    python tools/image_optimizer.py notebooks/<t>/images --workers 4
+    python tools/image_optimizer.py notebooks/<t>/images --format webp --quality 85 --keep-originals
+    python tools/extract_notebook_images.py <notebook.ipynb> <output_dir> --optimize
+"""
+
+import io
+import os
+import sys
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    from PIL import Image
+
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+from json_backend import dump_path
+
+SOURCE_SUFFIXES = {".png", ".jpg", ".jpeg"}
+FORMATS = ["png", "webp"]
+THUMBNAILS = "thumbnails"
+ORIGINALS = "originals"
+# Image.info keys that change how pixels read, so they survive metadata stripping
+PIXEL_INFO = ("transparency",)
+DEFAULT_QUALITY = 90
+
+
+def encode(image: "Image.Image", fmt: str, quality: int, lossless: bool) -> bytes:
+    """Encode without metadata in the given format ("png", "webp" or "jpeg")."""
+    image.info = {k: v for k, v in image.info.items() if k in PIXEL_INFO}
+    buf = io.BytesIO()
+    if fmt == "png":
+        image.save(buf, "PNG", optimize=True, icc_profile=None)
+    elif fmt == "webp":
+        if image.mode not in ("RGB", "RGBA"):
+            alpha = "A" in image.getbands() or "transparency" in image.info
+            image = image.convert("RGBA" if alpha else "RGB")
+        image.save(buf, "WEBP", quality=quality, lossless=lossless, method=6, icc_profile=None)
+    else:
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.save(buf, "JPEG", quality=quality, optimize=True, icc_profile=None)
+    return buf.getvalue()
+
+
+def keep_original_bytes(path: Path, original: bytes, output: bytes):
+    """
+    Store the pre-optimization bytes in originals/, next to the hash of the
+    output written for them, so a rerun on that output keeps the stored
+    original while a re-extracted image replaces it.
+    """
+    originals = path.parent / ORIGINALS
+    originals.mkdir(exist_ok=True)
+    stored, written = originals / path.name, originals / f".{path.name}.output.sha256"
+    previous_output = written.read_text().strip() if written.exists() else None
+    rerun = stored.exists() and hashlib.sha256(original).hexdigest() == previous_output
+    # On a rerun the source is our own last output, not an original
+    if not rerun and (not stored.exists() or stored.read_bytes() != original):
+        stored.write_bytes(original)
+    written.write_text(hashlib.sha256(output).hexdigest() + "\n")
+
+
+def optimize_image(
+    path: Path,
+    fmt: str = "png",
+    quality: Optional[int] = None,
+    lossless: bool = False,
+    thumbnail_size: int = 512,
+    keep_original: bool = False,
+) -> Dict[str, Any]:
+    """Re-encode one image and write its thumbnail; returns its report entry."""
+    start = time.perf_counter()
+    before = path.stat().st_size
+    original = path.read_bytes()
+    is_jpeg = path.suffix.lower() in (".jpg", ".jpeg")
+    target_fmt = "webp" if fmt == "webp" else ("jpeg" if is_jpeg else "png")
+    # Re-encoding a JPEG loses quality, so only do it when asked to
+    reencode = not (target_fmt == "jpeg" and quality is None)
+    quality = DEFAULT_QUALITY if quality is None else quality
+    with Image.open(io.BytesIO(original)) as image:
+        image.load()
+        data = encode(image.copy(), target_fmt, quality, lossless) if reencode else original
+        thumb = image.copy()
+        thumb.thumbnail((thumbnail_size, thumbnail_size), Image.LANCZOS)
+        thumb_data = encode(thumb, target_fmt, quality, lossless)
+        size = image.size
+
+    target = path.with_suffix(".webp") if target_fmt == "webp" else path
+    if keep_original:
+        keep_original_bytes(path, original, data)
+    if data != original or target != path:
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+    if target != path:
+        path.unlink()
+
+    thumbnails = path.parent / THUMBNAILS
+    thumbnails.mkdir(exist_ok=True)
+    thumb_path = thumbnails / f"{path.stem}{target.suffix}"
+    thumb_path.write_bytes(thumb_data)
+
+    return {
+        "image": path.name,
+        "output": target.name,
+        "thumbnail": f"{THUMBNAILS}/{thumb_path.name}",
+        "width": size[0],
+        "height": size[1],
+        "bytes_before": before,
+        "bytes_after": len(data),
+        "thumbnail_bytes": len(thumb_data),
+        "reencoded": reencode,
+        "seconds": round(time.perf_counter() - start, 4),
+    }
+
+
+def _optimize_worker(job: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        return optimize_image(**job)
+    except (OSError, ValueError) as e:
+        return {"image": Path(job["path"]).name, "error": str(e)}
+
+
+def optimize_directory(
+    images_dir: Path,
+    fmt: str = "png",
+    quality: Optional[int] = None,
+    lossless: bool = False,
+    thumbnail_size: int = 512,
+    keep_originals: bool = False,
+    workers: Optional[int] = None,
+    report_path: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Optimize every PNG/JPEG directly in images_dir; returns (and writes) the report."""
+    if not HAS_PIL:
+        raise RuntimeError("image optimization needs Pillow: pip install pillow")
+    images_dir = Path(images_dir)
+    files = sorted(
+        p for p in images_dir.iterdir() if p.is_file() and p.suffix.lower() in SOURCE_SUFFIXES
+    )
+    jobs = [
+        {
+            "path": p,
+            "fmt": fmt,
+            "quality": quality,
+            "lossless": lossless,
+            "thumbnail_size": thumbnail_size,
+            "keep_original": keep_originals,
+        }
+        for p in files
+    ]
+
+    start = time.perf_counter()
+    if len(jobs) > 1 and (workers is None or workers > 1):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            entries: List[Dict[str, Any]] = list(pool.map(_optimize_worker, jobs))
+    else:
+        entries = [_optimize_worker(job) for job in jobs]
+    wall = time.perf_counter() - start
+
+    done = [e for e in entries if "error" not in e]
+    report = {
+        "images_dir": str(images_dir),
+        "format": fmt,
+        "quality": quality,
+        "lossless": lossless,
+        "thumbnail_size": thumbnail_size,
+        "images": len(files),
+        "failed": len(entries) - len(done),
+        "bytes_before": sum(e["bytes_before"] for e in done),
+        "bytes_after": sum(e["bytes_after"] for e in done),
+        "thumbnail_bytes": sum(e["thumbnail_bytes"] for e in done),
+        "wall_seconds": round(wall, 3),
+        "entries": entries,
+    }
+    report["bytes_saved"] = report["bytes_before"] - report["bytes_after"]
+    report_path = report_path or images_dir.parent / "image_optimization.json"
+    dump_path(report, report_path)
+    report["report"] = str(report_path)
+    return report
+
+
+def add_optimize_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--format", choices=FORMATS, default="png", help="Output format (default: png)")
+    parser.add_argument(
+        "--quality",
+        type=int,
+        help=f"WebP/JPEG quality (default: {DEFAULT_QUALITY}); setting it also re-encodes JPEGs",
+    )
+    parser.add_argument("--lossless", action="store_true", help="Lossless WebP")
+    parser.add_argument(
+        "--thumbnail-size", type=int, default=512, help="Max thumbnail width/height (default: 512)"
+    )
+    parser.add_argument(
+        "--keep-originals", action="store_true", help="Move originals to images/originals/"
+    )
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument(
+        "--report", type=Path, help="Report JSON (default: <images>/../image_optimization.json)"
+    )
+
+
+def print_report(report: Dict[str, Any]):
+    before, after = report["bytes_before"], report["bytes_after"]
+    saved = 100 * (before - after) / before if before else 0.0
+    print(f"\nSummary:")
+    print(f"  Images: {report['images']} ({report['failed']} failed) in {report['wall_seconds']:.2f}s")
+    print(f"  Size: {before / 1e6:.2f} MB -> {after / 1e6:.2f} MB ({saved:.1f}% saved)")
+    print(f"  Thumbnails: {report['thumbnail_bytes'] / 1e6:.2f} MB")
+    for entry in report["entries"]:
+        if "error" in entry:
+            print(f"  FAILED {entry['image']}: {entry['error']}")
+    print(f"  Report: {report['report']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompress extracted figures and write thumbnails.")
+    parser.add_argument("images_dir", help="Directory of extracted images")
+    add_optimize_arguments(parser)
+    args = parser.parse_args()
+
+    if not HAS_PIL:
+        print("Error: image optimization needs Pillow: pip install pillow", file=sys.stderr)
+        sys.exit(1)
+    if not Path(args.images_dir).is_dir():
+        print(f"Error: {args.images_dir} is not a directory", file=sys.stderr)
+        sys.exit(1)
+    report = optimize_directory(
+        Path(args.images_dir),
+        args.format,
+        args.quality,
+        args.lossless,
+        args.thumbnail_size,
+        args.keep_originals,
+        args.workers,
+        args.report,
+    )
+    print_report(report)
+    if report["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
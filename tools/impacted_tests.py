@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Change-aware test selection for the generated tool modules.
+
+Rerunning every test after one edit to src/tools/<tutorial>.py is slow when
+tests execute heavy tutorial code. This script:
+1. Builds a test-impact index (reports/coverage/test_impact.json) from
+   coverage data recorded with per-test contexts
+   (`coverage_runner.py run --contexts`): for every test file, the src/tools
+   modules and functions its tests executed, plus content hashes of every
+   module, function and test file at indexing time.
+2. Finds what changed: modules whose hash differs from the index, plus (with
+   --since) the modules `git diff` reports against that revision, narrowed
+   down to the functions whose code changed since the index or the revision.
+   A change outside any function (imports, constants) counts against every
+   test touching the module.
+3. Selects the tests that executed a changed function, plus new or edited
+   test files. A full run is forced when a shared fixture (any conftest.py,
+   tests/data/) or the environment lockfile changed, or there is no index.
+
+Usage:
+    python tools/impacted_tests.py index <PROJECT_DIR>
+    python tools/impacted_tests.py select <PROJECT_DIR> [--since HEAD]
+    python tools/impacted_tests.py run <PROJECT_DIR> --python <repo>-env/bin/python
+    python tools/impacted_tests.py selfcheck
+"""
+
+import os
+import ast
+import sys
+import json
+import time
+import argparse
+import hashlib
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+INDEX = Path("reports") / "coverage" / "test_impact.json"
+COVERAGE_JSON = Path("reports") / "coverage" / "coverage.json"
+TESTS_DIR = Path("tests") / "code"
+TEST_PATTERNS = ["*_test.py", "test_*.py"]
+# Changes to these force a full run: fixtures every test may use, and the environment
+SHARED_GLOBS = ["tests/**/conftest.py", "tests/data/**/*"]
+LOCKFILES = [
+    "requirements.txt",
+    "requirements.lock",
+    "environment.yml",
+    "conda-lock.yml",
+    "poetry.lock",
+    "uv.lock",
+    "pylock.toml",
+    "Pipfile.lock",
+]
+MODULE_LEVEL = "<module>"
+
+
+def sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def function_hashes(path: Path) -> Dict[str, str]:
+    """
+    Hash of every top-level function and method (Class.method), plus
+    MODULE_LEVEL for all other top-level code. ast.dump leaves out line
+    numbers, so moving code around does not count as a change.
+    """
+    try:
+        source = path.read_text(encoding="utf-8")
+    except (OSError, ValueError):
+        return {MODULE_LEVEL: sha256(path) if path.exists() else ""}
+    return source_hashes(source)
+
+
+def source_hashes(source: str) -> Dict[str, str]:
+    """function_hashes() of module source text."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return {MODULE_LEVEL: hashlib.sha256(source.encode()).hexdigest()}
+    hashes: Dict[str, str] = {}
+    rest: List[str] = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            hashes[node.name] = hashlib.sha256(ast.dump(node).encode()).hexdigest()
+        elif isinstance(node, ast.ClassDef):
+            body = []
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    key = f"{node.name}.{item.name}"
+                    hashes[key] = hashlib.sha256(ast.dump(item).encode()).hexdigest()
+                else:
+                    body.append(ast.dump(item))
+            # ast.dump, not repr(): AST reprs hold memory addresses and differ per parse
+            header = ast.ClassDef(
+                name=node.name,
+                bases=node.bases,
+                keywords=node.keywords,
+                body=[],
+                decorator_list=node.decorator_list,
+            )
+            rest.append(ast.dump(header) + "".join(body))
+        else:
+            rest.append(ast.dump(node))
+    hashes[MODULE_LEVEL] = hashlib.sha256("\n".join(rest).encode()).hexdigest()
+    return hashes
+
+
+SELFCHECK_MODULE = """
+import os
+
+class Base:
+    pass
+
+@dataclass
+class Cfg(Base, metaclass=Meta):
+    size = 1
+
+    def scale(self):
+        return 20
+
+def f():
+    return 1
+
+def g():
+    return 2
+"""
+
+
+def selfcheck() -> List[str]:
+    """Regression checks of source_hashes(); returns the failures."""
+    failures = []
+    before = source_hashes(SELFCHECK_MODULE)
+    if source_hashes(SELFCHECK_MODULE) != before:
+        failures.append("hashes of a module with a subclass differ between two parses")
+    edits = {
+        "g() body": (SELFCHECK_MODULE.replace("return 2\n", "return 3\n"), {"g"}),
+        "Cfg.scale() body": (SELFCHECK_MODULE.replace("return 20", "return 40"), {"Cfg.scale"}),
+        "class base": (SELFCHECK_MODULE.replace("Cfg(Base,", "Cfg(object,"), {MODULE_LEVEL}),
+        "class decorator": (SELFCHECK_MODULE.replace("@dataclass", "@frozen"), {MODULE_LEVEL}),
+        "class keyword": (SELFCHECK_MODULE.replace("metaclass=Meta", "metaclass=Other"), {MODULE_LEVEL}),
+        "class attribute": (SELFCHECK_MODULE.replace("size = 1", "size = 2"), {MODULE_LEVEL}),
+        "code moved": ("\n\n" + SELFCHECK_MODULE, set()),
+    }
+    for label, (source, expected) in edits.items():
+        after = source_hashes(source)
+        changed = {n for n in set(before) | set(after) if before.get(n) != after.get(n)}
+        if changed != expected:
+            failures.append(f"{label}: changed {sorted(changed)}, expected {sorted(expected)}")
+    return failures
+
+
+def line_owners(path: Path) -> Dict[int, str]:
+    """Line number -> function (or Class.method) it belongs to."""
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+    except (OSError, SyntaxError, ValueError):
+        return {}
+    owners: Dict[int, str] = {}
+
+    def claim(node: ast.AST, name: str):
+        start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+        for line in range(start, node.end_lineno + 1):
+            owners[line] = name
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            claim(node, node.name)
+        elif isinstance(node, ast.ClassDef):
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    claim(item, f"{node.name}.{item.name}")
+    return owners
+
+
+def find_test_files(project_dir: Path) -> List[str]:
+    tests_dir = project_dir / TESTS_DIR
+    files = {p for pattern in TEST_PATTERNS for p in tests_dir.rglob(pattern)}
+    return sorted(os.path.relpath(p, project_dir) for p in files)
+
+
+def shared_hashes(project_dir: Path) -> Dict[str, str]:
+    files = {p for pattern in SHARED_GLOBS for p in project_dir.glob(pattern) if p.is_file()}
+    files |= {project_dir / name for name in LOCKFILES if (project_dir / name).is_file()}
+    return {os.path.relpath(p, project_dir): sha256(p) for p in sorted(files)}
+
+
+def build_index(project_dir: Path, coverage_json: Path) -> Dict[str, Any]:
+    """Test-impact index from a coverage JSON report written with --show-contexts."""
+    with open(coverage_json, "r", encoding="utf-8") as f:
+        report = json.load(f)
+
+    modules: Dict[str, Any] = {}
+    tests: Dict[str, Dict[str, Set[str]]] = {}
+    for module, data in report.get("files", {}).items():
+        path = project_dir / module
+        if not path.exists():
+            continue
+        module = os.path.relpath(path, project_dir)
+        modules[module] = {"sha256": sha256(path), "functions": function_hashes(path)}
+        owners = line_owners(path)
+        for line, contexts in data.get("contexts", {}).items():
+            for context in contexts:
+                # pytest-cov test contexts: "<test file>::<test>|run" ("" = import time)
+                test_file = context.split("::", 1)[0]
+                if not context or test_file == context:
+                    continue
+                touched = tests.setdefault(test_file, {}).setdefault(module, set())
+                touched.add(owners.get(int(line), MODULE_LEVEL))
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "modules": modules,
+        "tests": {
+            test: {
+                "sha256": sha256(project_dir / test) if (project_dir / test).exists() else "",
+                "modules": {m: sorted(funcs) for m, funcs in sorted(touched.items())},
+            }
+            for test, touched in sorted(tests.items())
+        },
+        "shared": shared_hashes(project_dir),
+    }
+
+
+def git_changed(project_dir: Path, since: str) -> Optional[Set[str]]:
+    """Files changed against `since` (committed, staged, unstaged and untracked)."""
+    try:
+        root, diff, untracked = (
+            subprocess.run(
+                ["git", *cmd], cwd=project_dir, capture_output=True, text=True, check=True
+            ).stdout
+            for cmd in (
+                ["rev-parse", "--show-toplevel"],
+                ["diff", "--name-only", since, "--"],
+                ["ls-files", "--others", "--exclude-standard", "--full-name"],
+            )
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return {
+        os.path.relpath(Path(root.strip()) / p, project_dir)
+        for p in diff.split() + untracked.split()
+    }
+
+
+def git_function_hashes(project_dir: Path, since: str, module: str) -> Optional[Dict[str, str]]:
+    """function_hashes() of `module` at revision `since` ({} if it did not exist, None on error)."""
+    try:
+        result = subprocess.run(
+            ["git", "show", f"{since}:./{module}"], cwd=project_dir, capture_output=True, text=True
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        exists = subprocess.run(
+            ["git", "cat-file", "-e", f"{since}^{{commit}}"], cwd=project_dir, capture_output=True
+        )
+        return {} if exists.returncode == 0 else None
+    return source_hashes(result.stdout)
+
+
+def select_tests(
+    project_dir: Path, index: Optional[Dict[str, Any]], since: Optional[str] = None
+) -> Tuple[List[str], Dict[str, Any]]:
+    """(test files to run, why) for the current tree."""
+    all_tests = find_test_files(project_dir)
+    if index is None:
+        return all_tests, {"full": "no test-impact index"}
+
+    shared = shared_hashes(project_dir)
+    if shared != index["shared"]:
+        changed = sorted(
+            p for p in set(shared) | set(index["shared"]) if shared.get(p) != index["shared"].get(p)
+        )
+        return all_tests, {"full": f"shared fixtures or lockfile changed: {', '.join(changed)}"}
+
+    candidates = None
+    if since:
+        candidates = git_changed(project_dir, since)
+        if candidates is None:
+            return all_tests, {"full": f"git diff against {since} failed"}
+
+    # A module counts as changed if its hash differs from the index OR git reports it
+    changed_functions: Dict[str, Set[str]] = {}
+    for module, recorded in index["modules"].items():
+        path = project_dir / module
+        now = None
+        changed: Set[str] = set()
+        if not path.exists() or sha256(path) != recorded["sha256"]:
+            now = function_hashes(path) if path.exists() else {}
+            changed |= {
+                n
+                for n in set(now) | set(recorded["functions"])
+                if now.get(n) != recorded["functions"].get(n)
+            }
+        if candidates is not None and module in candidates:
+            if now is None:
+                now = function_hashes(path) if path.exists() else {}
+            before = git_function_hashes(project_dir, since, module)
+            if before is None:
+                changed.add(MODULE_LEVEL)  # revision unreadable: assume everything changed
+            else:
+                changed |= {n for n in set(now) | set(before) if now.get(n) != before.get(n)}
+        if changed:
+            changed_functions[module] = changed
+
+    selected: Dict[str, str] = {}
+    for test in all_tests:
+        entry = index["tests"].get(test)
+        if entry is None:
+            selected[test] = "new test file"
+            continue
+        if sha256(project_dir / test) != entry["sha256"]:
+            selected[test] = "test file changed"
+            continue
+        for module, functions in entry["modules"].items():
+            changed = changed_functions.get(module, set())
+            if MODULE_LEVEL in changed or changed & set(functions):
+                names = sorted(changed & set(functions)) or [MODULE_LEVEL]
+                selected[test] = f"{module}: {', '.join(names)}"
+                break
+
+    return sorted(selected), {
+        "changed": {m: sorted(f) for m, f in changed_functions.items()},
+        "selected": selected,
+        "skipped": len(all_tests) - len(selected),
+    }
+
+
+def load_index(project_dir: Path) -> Optional[Dict[str, Any]]:
+    path = project_dir / INDEX
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_index(project_dir: Path, coverage_json: Path) -> Dict[str, Any]:
+    index = build_index(project_dir, coverage_json)
+    path = project_dir / INDEX
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Select the tests affected by changes to src/tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    index = sub.add_parser("index", help="Build the test-impact index from coverage contexts")
+    index.add_argument("project_dir", help="Project directory")
+    index.add_argument(
+        "--coverage-json",
+        help=f"Coverage JSON with contexts (default: <project>/{COVERAGE_JSON})",
+    )
+    sub.add_parser("selfcheck", help="Check that function/module hashes track edits correctly")
+    for name, help_text in (("select", "Print the affected test files"), ("run", "Run the affected tests")):
+        command = sub.add_parser(name, help=help_text)
+        command.add_argument("project_dir", help="Project directory")
+        command.add_argument("--since", help="Git revision whose changes also count (besides index hashes)")
+        if name == "run":
+            command.add_argument("--python", default=sys.executable, help="Project environment interpreter")
+
+    args = parser.parse_args()
+    if args.command == "selfcheck":
+        failures = selfcheck()
+        for failure in failures:
+            print(f"FAIL: {failure}", file=sys.stderr)
+        if failures:
+            sys.exit(1)
+        print("Hash self-check passed")
+        return
+    project_dir = Path(args.project_dir).resolve()
+
+    if args.command == "index":
+        coverage_json = Path(args.coverage_json) if args.coverage_json else project_dir / COVERAGE_JSON
+        if not coverage_json.exists():
+            print(f"Error: {coverage_json} does not exist", file=sys.stderr)
+            sys.exit(1)
+        built = write_index(project_dir, coverage_json)
+        if not built["tests"]:
+            print(
+                f"Warning: no test contexts in {coverage_json}; "
+                "record them with coverage_runner.py run --contexts",
+                file=sys.stderr,
+            )
+        print(
+            f"Indexed {len(built['tests'])} test files over {len(built['modules'])} modules "
+            f"-> {project_dir / INDEX}"
+        )
+        return
+
+    tests, reason = select_tests(project_dir, load_index(project_dir), args.since)
+    if "full" in reason:
+        print(f"Full run: {reason['full']}", file=sys.stderr)
+    else:
+        for test, why in reason["selected"].items():
+            print(f"  {test} ({why})", file=sys.stderr)
+        print(f"Selected {len(tests)} test files, skipped {reason['skipped']}", file=sys.stderr)
+
+    if args.command == "select":
+        for test in tests:
+            print(test)
+        return
+    if not tests:
+        return
+    result = subprocess.run([args.python, "-m", "pytest", *tests, "-v"], cwd=project_dir)
+    sys.exit(result.returncode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Shared JSON serialization for the notebook and benchmark tools.
+
+Uses orjson, then ujson, when installed and falls back to the stdlib json
+module otherwise (set PAPER2AGENT_JSON=json|ujson|orjson to force one).
+Anything a fast backend rejects (integers beyond 64 bits, NaN/Infinity,
+non-standard input) is retried with the stdlib, so errors are always
+json.JSONDecodeError / TypeError as before.
+
+Output is UTF-8 with non-ASCII characters kept as-is unless ensure_ascii=True,
+which escapes them as json.dumps does by default. indent=2 has the layout of
+json.dumps(obj, indent=2), but fast backends may spell a float differently
+(1e-05 as 0.00001 or 1e-5); the parsed value is the same. Objects holding
+NaN or Infinity are always written by the stdlib (as NaN/Infinity, where
+orjson would write null). Compact output drops all whitespace, which makes
+large notebooks noticeably smaller and faster to write.
+
+`benchmark` compares load/dump times of the available backends on real
+executed notebooks and checks that they round-trip to identical values.
+
+Usage:
+    from json_backend import loads, dumps, load_path, dump_path
+    python tools/json_backend.py benchmark notebooks/*/*_execution_final.ipynb
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+BACKENDS = ["orjson", "ujson", "json"]
+
+
+def _import(name: str):
+    try:
+        return __import__(name)
+    except ImportError:
+        return None
+
+
+def available_backends() -> List[str]:
+    return [name for name in BACKENDS if name == "json" or _import(name) is not None]
+
+
+def _select() -> str:
+    forced = os.environ.get("PAPER2AGENT_JSON")
+    if forced:
+        if forced not in available_backends():
+            print(f"Warning: JSON backend {forced} not available, using json", file=sys.stderr)
+            return "json"
+        return forced
+    return available_backends()[0]
+
+
+BACKEND = _select()
+_orjson = _import("orjson") if BACKEND == "orjson" else None
+_ujson = _import("ujson") if BACKEND == "ujson" else None
+
+
+_NON_ASCII = re.compile(r"[^\x00-\x7e]")  # json.dumps also escapes DEL
+
+
+def _stdlib_dumps(obj: Any, indent: Optional[int], ensure_ascii: bool = False) -> str:
+    if indent is None:
+        return json.dumps(obj, ensure_ascii=ensure_ascii, separators=(",", ":"))
+    return json.dumps(obj, ensure_ascii=ensure_ascii, indent=indent)
+
+
+def _escape_non_ascii(match: "re.Match") -> str:
+    code = ord(match.group())
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    code -= 0x10000  # surrogate pair, as json.dumps writes it
+    return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """True if obj holds a NaN or infinite float, which fast backends write differently."""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+def loads(data: Union[str, bytes], backend: Optional[str] = None) -> Any:
+    """Parse JSON text or UTF-8 bytes."""
+    backend = backend or BACKEND
+    try:
+        if backend == "orjson":
+            return (_orjson or _import("orjson")).loads(data)
+        if backend == "ujson":
+            return (_ujson or _import("ujson")).loads(data)
+    except (ValueError, TypeError, OverflowError):
+        pass
+    return json.loads(data)
+
+
+def dumps(
+    obj: Any,
+    indent: Optional[int] = 2,
+    backend: Optional[str] = None,
+    ensure_ascii: bool = False,
+) -> str:
+    """Serialize to text; indent=None gives compact output."""
+    backend = backend or BACKEND
+    try:
+        if backend == "orjson" and indent in (None, 2) and not _has_non_finite(obj):
+            orjson = _orjson or _import("orjson")
+            option = orjson.OPT_NON_STR_KEYS
+            if indent == 2:
+                option |= orjson.OPT_INDENT_2
+            text = orjson.dumps(obj, option=option).decode("utf-8")
+            # Non-ASCII characters only occur inside strings, so escaping is safe here
+            return _NON_ASCII.sub(_escape_non_ascii, text) if ensure_ascii else text
+        if backend == "ujson":
+            # ujson raises OverflowError for NaN/Infinity, so those reach the stdlib
+            ujson = _ujson or _import("ujson")
+            kwargs = {"ensure_ascii": ensure_ascii, "escape_forward_slashes": False}
+            if indent is not None:
+                return ujson.dumps(obj, indent=indent, **kwargs)
+            return ujson.dumps(obj, **kwargs)
+    except (TypeError, ValueError, OverflowError):
+        pass
+    return _stdlib_dumps(obj, indent, ensure_ascii)
+
+
+def load_path(path: Union[str, Path]) -> Any:
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def dump_path(
+    obj: Any, path: Union[str, Path], indent: Optional[int] = 2, ensure_ascii: bool = False
+):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(dumps(obj, indent=indent, ensure_ascii=ensure_ascii))
+
+
+def _best(func, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return round(min(times), 4)
+
+
+def benchmark(paths: List[Path], repeat: int) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"backends": available_backends(), "notebooks": []}
+    for path in paths:
+        raw = path.read_bytes()
+        reference = json.loads(raw)
+        entry: Dict[str, Any] = {"path": str(path), "mb": round(len(raw) / 1e6, 2)}
+        pretty_ref = _stdlib_dumps(reference, 2)
+        for backend in report["backends"]:
+            pretty = dumps(reference, 2, backend)
+            compact = dumps(reference, None, backend)
+            entry[backend] = {
+                "load_s": _best(lambda: loads(raw, backend), repeat),
+                "dump_indent2_s": _best(lambda: dumps(reference, 2, backend), repeat),
+                "dump_compact_s": _best(lambda: dumps(reference, None, backend), repeat),
+                "indent2_mb": round(len(pretty.encode("utf-8")) / 1e6, 2),
+                "compact_mb": round(len(compact.encode("utf-8")) / 1e6, 2),
+                "same_values": loads(raw, backend) == reference
+                and json.loads(pretty) == reference
+                and json.loads(compact) == reference,
+                "same_bytes_as_stdlib": pretty == pretty_ref,
+            }
+        report["notebooks"].append(entry)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON backend info and benchmark.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("info", help="Show the selected backend")
+    bench = sub.add_parser("benchmark", help="Time load/dump on executed notebooks")
+    bench.add_argument("notebooks", nargs="+", help="Notebook (.ipynb) files")
+    bench.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best kept)")
+    bench.add_argument("--output", help="Write the JSON report here")
+
+    args = parser.parse_args()
+    if args.command == "info":
+        print(f"Selected: {BACKEND} (available: {', '.join(available_backends())})")
+        return
+
+    paths = [Path(p) for p in args.notebooks]
+    missing = [str(p) for p in paths if not p.exists()]
+    if missing:
+        print(f"Error: not found: {', '.join(missing)}", file=sys.stderr)
+        sys.exit(1)
+
+    report = benchmark(paths, args.repeat)
+    if args.output:
+        dump_path(report, args.output)
+
+    print(f"JSON Backend Benchmark (best of {args.repeat}):")
+    for entry in report["notebooks"]:
+        print(f"\n  {entry['path']} ({entry['mb']} MB)")
+        for backend in report["backends"]:
+            r = entry[backend]
+            print(
+                f"    {backend:7s} load {r['load_s']:.4f}s  dump {r['dump_indent2_s']:.4f}s "
+                f"({r['indent2_mb']} MB)  compact {r['dump_compact_s']:.4f}s "
+                f"({r['compact_mb']} MB)  values {'ok' if r['same_values'] else 'DIFFER'}"
+            )
+    for entry in report["notebooks"]:
+        if not all(entry[backend]["same_values"] for backend in report["backends"]):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Shared asset linking for project setup.
+
+Places the shared `.claude`, `templates` and `tools` directories into a project
+directory without duplicating them:
+- symlink:  one symlink per shared directory (O(1) regardless of size)
+- hardlink: per-file hard links (no data copied; falls back to copy across devices)
+- reflink:  per-file copy-on-write clones where the filesystem supports it
+            (btrfs/XFS via FICLONE, APFS via `cp -c`), falling back to copy
+- copy:     per-file copies
+
+Every mode only touches files that differ from the source and removes files that
+no longer exist there. `verify` reports drift between the shared source and a
+project (missing, extra or modified files, or broken symlinks).
+
+`sync` records the hash of every file it places (.pipeline/link_assets.json in
+the project). A project file that no longer has its recorded hash, or that sync
+never placed, is a local change: sync reports it and changes nothing unless
+--force is given, instead of overwriting or deleting project customizations.
+
+Usage:
+    python tools/link_assets.py sync   <SHARED_ROOT> <PROJECT_DIR> --mode hardlink [--force]
+    python tools/link_assets.py verify <SHARED_ROOT> <PROJECT_DIR>
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List
+
+from stage_marker import IGNORED_DIRS, hash_file
+
+SHARED_DIRS = [".claude", "templates", "tools"]
+LINK_MODES = ["copy", "hardlink", "symlink", "reflink"]
+STATE_FILE = Path(".pipeline") / "link_assets.json"
+
+# Linux ioctl request number for FICLONE (_IOW(0x94, 9, int))
+FICLONE = 0x40049409
+
+
+def reflink_file(src: Path, dst: Path):
+    """Clone src to dst with copy-on-write, raising OSError if unsupported."""
+    if sys.platform.startswith("linux"):
+        import fcntl
+
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            except OSError:
+                fdst.close()
+                dst.unlink()
+                raise
+        shutil.copystat(src, dst)
+    elif sys.platform == "darwin":
+        result = subprocess.run(["cp", "-c", "-p", str(src), str(dst)], capture_output=True)
+        if result.returncode != 0:
+            raise OSError(result.stderr.decode(errors="replace").strip())
+    else:
+        raise OSError(f"reflink not supported on {sys.platform}")
+
+
+def place_file(src: Path, dst: Path, mode: str) -> str:
+    """Materialize one file, returning the method actually used."""
+    if mode == "hardlink":
+        try:
+            os.link(src, dst)
+            return "hardlink"
+        except OSError:
+            pass
+    elif mode == "reflink":
+        try:
+            reflink_file(src, dst)
+            return "reflink"
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+def files_match(
+    src: Path,
+    dst: Path,
+    deep: bool = False,
+    allow_same_inode: bool = True,
+    require_link: bool = False,
+) -> bool:
+    """
+    Check whether dst already mirrors src (same inode, or same size/mtime/content).
+
+    With require_link, a separate copy only counts where no hard link is possible
+    (src and dst on different devices), so switching to hardlink converts copies.
+    """
+    try:
+        if os.path.samefile(src, dst):
+            return allow_same_inode
+        src_stat, dst_stat = src.stat(), dst.stat()
+    except OSError:
+        return False
+    if require_link and src_stat.st_dev == dst_stat.st_dev:
+        return False
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+    if not deep and src_stat.st_mtime_ns == dst_stat.st_mtime_ns:
+        return True
+    return hash_file(src) == hash_file(dst)
+
+
+def list_files(root: Path) -> List[str]:
+    """Relative paths of all files under root, skipping cache directories."""
+    files = []
+    for current, dirs, names in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRS)
+        for name in sorted(names):
+            files.append((Path(current) / name).relative_to(root).as_posix())
+    return files
+
+
+def remove_path(path: Path):
+    if path.is_symlink() or path.is_file():
+        path.unlink()
+    elif path.is_dir():
+        shutil.rmtree(path)
+
+
+def load_state(project_dir: Path) -> Dict[str, Dict[str, str]]:
+    """Hashes of the files the last sync placed, per shared directory."""
+    try:
+        with open(project_dir / STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(project_dir: Path, state: Dict[str, Dict[str, str]]):
+    path = project_dir / STATE_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def placed_hashes(src: Path, mode: str) -> Dict[str, str]:
+    """What a sync of src leaves in the project (nothing of its own for a symlink)."""
+    if mode == "symlink":
+        return {}
+    return {rel: hash_file(src / rel) for rel in list_files(src)}
+
+
+def local_changes(src: Path, dst: Path, placed: Dict[str, str]) -> List[str]:
+    """Project-side changes that syncing dst would overwrite or delete."""
+    if dst.is_symlink() or not dst.is_dir():
+        return []  # a symlink holds no project data of its own
+    src_files = set(list_files(src))
+    changes = []
+    for rel in list_files(dst):
+        dst_file = dst / rel
+        if rel in src_files and files_match(src / rel, dst_file):
+            continue  # same content as the source: nothing is lost
+        if placed.get(rel) == hash_file(dst_file):
+            continue  # still what the last sync placed: only the source moved on
+        if rel in src_files:
+            changes.append(f"{dst_file}: differs from shared source")
+        else:
+            changes.append(f"{dst_file}: not in shared source")
+    return changes
+
+
+def sync_dir(src: Path, dst: Path, mode: str) -> Dict[str, int]:
+    """Make dst mirror src using the given link mode."""
+    stats = {"linked": 0, "copied": 0, "unchanged": 0, "removed": 0}
+
+    if mode == "symlink":
+        target = src.resolve()
+        if dst.is_symlink() and dst.resolve() == target:
+            stats["unchanged"] += 1
+            return stats
+        if dst.exists() or dst.is_symlink():
+            remove_path(dst)
+            stats["removed"] += 1
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        dst.symlink_to(target, target_is_directory=True)
+        stats["linked"] += 1
+        return stats
+
+    # A previous symlink-mode setup is replaced by a real directory
+    if dst.is_symlink():
+        dst.unlink()
+        stats["removed"] += 1
+    dst.mkdir(parents=True, exist_ok=True)
+
+    src_files = list_files(src)
+    for rel in src_files:
+        src_file, dst_file = src / rel, dst / rel
+        # Leaving hardlink mode must break the shared inodes; entering it must create them
+        if files_match(
+            src_file,
+            dst_file,
+            allow_same_inode=mode == "hardlink",
+            require_link=mode == "hardlink",
+        ):
+            stats["unchanged"] += 1
+            continue
+        if dst_file.exists() or dst_file.is_symlink():
+            remove_path(dst_file)
+        dst_file.parent.mkdir(parents=True, exist_ok=True)
+        method = place_file(src_file, dst_file, mode)
+        stats["copied" if method == "copy" else "linked"] += 1
+
+    wanted = set(src_files)
+    for rel in list_files(dst):
+        if rel not in wanted:
+            (dst / rel).unlink()
+            stats["removed"] += 1
+    return stats
+
+
+def verify_dir(src: Path, dst: Path) -> List[str]:
+    """Return a list of drift descriptions between src and dst."""
+    if not dst.exists():
+        return [f"{dst}: missing"]
+    if dst.is_symlink():
+        if dst.resolve() != src.resolve():
+            return [f"{dst}: symlink points to {dst.resolve()}, expected {src.resolve()}"]
+        return []
+
+    drift = []
+    src_files = set(list_files(src))
+    dst_files = set(list_files(dst))
+    for rel in sorted(src_files - dst_files):
+        drift.append(f"{dst / rel}: missing")
+    for rel in sorted(dst_files - src_files):
+        drift.append(f"{dst / rel}: not in shared source")
+    for rel in sorted(src_files & dst_files):
+        if not files_match(src / rel, dst / rel, deep=True):
+            drift.append(f"{dst / rel}: differs from shared source")
+    return drift
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Link shared assets into a project directory or verify drift."
+    )
+    parser.add_argument("action", choices=["sync", "verify"])
+    parser.add_argument("shared_root", help="Directory holding the shared assets")
+    parser.add_argument("project_dir", help="Project directory to populate/check")
+    parser.add_argument(
+        "--mode", choices=LINK_MODES, default="copy", help="How to place files (sync)"
+    )
+    parser.add_argument(
+        "--dirs", nargs="+", default=SHARED_DIRS, help="Shared directories to handle"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="sync: overwrite or delete project files changed since the last sync",
+    )
+
+    args = parser.parse_args()
+    shared_root = Path(args.shared_root)
+    project_dir = Path(args.project_dir)
+
+    if project_dir.resolve() == shared_root.resolve():
+        print("Error: project directory must differ from the shared root", file=sys.stderr)
+        sys.exit(1)
+
+    names = []
+    for name in args.dirs:
+        if (shared_root / name).is_dir():
+            names.append(name)
+        else:
+            print(f"{name}: source missing, skipped", file=sys.stderr)
+
+    if args.action == "sync":
+        state = load_state(project_dir)
+        changes = []
+        for name in names:
+            src, dst = shared_root / name, project_dir / name
+            changes.extend(local_changes(src, dst, state.get(name, {})))
+        if changes and not args.force:
+            print(
+                f"Error: {len(changes)} project file(s) changed since the last sync "
+                "would be overwritten or deleted:",
+                file=sys.stderr,
+            )
+            for item in changes:
+                print(f"  - {item}", file=sys.stderr)
+            print("Keep them elsewhere, or rerun with --force to discard them.", file=sys.stderr)
+            sys.exit(1)
+        for name in names:
+            stats = sync_dir(shared_root / name, project_dir / name, args.mode)
+            state[name] = placed_hashes(shared_root / name, args.mode)
+            print(
+                f"{name}: {stats['linked']} linked, {stats['copied']} copied, "
+                f"{stats['unchanged']} unchanged, {stats['removed']} removed",
+                file=sys.stderr,
+            )
+        save_state(project_dir, state)
+        return
+
+    all_drift = []
+    for name in names:
+        all_drift.extend(verify_dir(shared_root / name, project_dir / name))
+
+    if all_drift:
+        print(f"Drift detected ({len(all_drift)}):")
+        for item in all_drift:
+            print(f"  - {item}")
+        sys.exit(1)
+    print("No drift: project assets match the shared source")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+LLM backends for the benchmark tools.
+
+benchmark_assessor.py and benchmark_reviewer.py send prompts through one of:
+
+- SubprocessBackend ("subprocess"): one `claude --print` process per prompt,
+  as before. Every call pays CLI start-up, auth and the MCP server connection.
+- WorkerPoolBackend ("pool"): `claude` sessions speaking stream-json on
+  stdin/stdout, started ahead of time so CLI start-up and the MCP connection
+  overlap with the previous request instead of delaying the next one.
+  A session keeps its whole conversation, so a reused session would carry
+  earlier prompts into later ones: a judge prompt's ground truth would be
+  visible to the next solver prompt, and the judge would score with earlier
+  questions in context. Each session therefore answers exactly one request
+  and is replaced by a fresh one afterwards; a session is also replaced when
+  its health check fails (process exited, start-up broken).
+
+Both return (response text, raw stream-json transcript of the call) and keep
+call statistics, so start-up cost saved by the pool shows up in `stats()`.
+llm_metrics.py reads tokens, cost, turns and tool calls from the transcript.
+
+Usage:
+    backend = get_backend("pool", workers=4)
+    text, raw = backend.complete(prompt, system_prompt=solver_def, timeout=600)
+    backend.close()
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import threading
+import subprocess
+from typing import Any, Dict, List, Optional, Tuple
+
+from json_backend import loads
+
+CLAUDE_CMD = [
+    "claude",
+    "--model",
+    "claude-sonnet-4-20250514",
+    "--print",
+    "--dangerously-skip-permissions",  # Skip permissions for automated run
+]
+# stream-json keeps every turn (tool calls included) in the raw response
+STREAM_ARGS = ["--output-format", "stream-json", "--verbose"]
+SESSION_ARGS = ["--input-format", "stream-json"] + STREAM_ARGS
+BACKENDS = ["subprocess", "pool"]
+
+
+def build_prompt(prompt: str, system_prompt: Optional[str] = None) -> str:
+    # The CLI has no system prompt flag here, so system instructions are prepended
+    return f"{system_prompt}\n\n---\n\n{prompt}" if system_prompt else prompt
+
+
+def parse_cli_output(stdout: str) -> str:
+    """Response text from `--output-format json` or stream-json output (or the raw text)."""
+    lines = stdout.strip().splitlines()
+    if len(lines) > 1:
+        event = result_event(stdout)
+        if event is not None:
+            return event.get("result", str(event))
+    try:
+        output_json = loads(stdout)
+        # Handle list or dict
+        if isinstance(output_json, list) and len(output_json) > 0:
+            return output_json[0].get("result", str(output_json))
+        elif isinstance(output_json, dict):
+            return output_json.get("result", str(output_json))
+        else:
+            return stdout.strip()
+    except json.JSONDecodeError:
+        return stdout.strip()
+
+
+def transcript_events(raw: str) -> List[Dict[str, Any]]:
+    """The JSON events of a raw CLI response (one for json output, all for stream-json)."""
+    events = []
+    for line in raw.splitlines():
+        line = line.strip()
+        if not line.startswith("{"):
+            continue
+        try:
+            event = loads(line)
+        except ValueError:
+            continue
+        if isinstance(event, dict):
+            events.append(event)
+    return events
+
+
+def result_event(raw: str) -> Optional[Dict[str, Any]]:
+    """The final `result` event of a raw CLI response, if any."""
+    for event in reversed(transcript_events(raw)):
+        if event.get("type") == "result":
+            return event
+    return None
+
+
+class LLMBackend:
+    """Common interface: complete() a prompt, report stats(), close()."""
+
+    name = "base"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Any] = {"calls": 0, "errors": 0, "call_seconds": 0.0}
+
+    def complete(
+        self, prompt: str, system_prompt: Optional[str] = None, timeout: int = 600
+    ) -> Tuple[str, str]:
+        raise NotImplementedError
+
+    def _count(self, seconds: float, error: bool, **extra: float):
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["errors"] += int(error)
+            self._stats["call_seconds"] += seconds
+            for key, value in extra.items():
+                self._stats[key] = self._stats.get(key, 0) + value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats, backend=self.name)
+        calls = stats["calls"]
+        stats["mean_call_seconds"] = round(stats["call_seconds"] / calls, 4) if calls else None
+        stats["call_seconds"] = round(stats["call_seconds"], 3)
+        return stats
+
+    def close(self):
+        pass
+
+
+class SubprocessBackend(LLMBackend):
+    """One CLI process per prompt."""
+
+    name = "subprocess"
+
+    def complete(
+        self, prompt: str, system_prompt: Optional[str] = None, timeout: int = 600
+    ) -> Tuple[str, str]:
+        cmd = CLAUDE_CMD + STREAM_ARGS + [build_prompt(prompt, system_prompt)]
+        start = time.time()
+        try:
+            result = subprocess.run(
+                cmd, capture_output=True, text=True, timeout=timeout, cwd=os.getcwd()
+            )
+            if result.returncode != 0:
+                print(f"Claude CLI failed: {result.stderr}", file=sys.stderr)
+                response = f"ERROR: {result.stderr}", ""
+            else:
+                response = parse_cli_output(result.stdout), result.stdout
+        except subprocess.TimeoutExpired:
+            response = "ERROR: Timeout", ""
+        except Exception as e:
+            response = f"ERROR: {e}", ""
+        self._count(time.time() - start, response[0].startswith("ERROR"), processes_started=1)
+        return response
+
+
+class SessionWorker:
+    """A `claude` session started ahead of its (single) request."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.requests = 0
+        self.broken = False
+        self.proc = subprocess.Popen(
+            CLAUDE_CMD + SESSION_ARGS,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+            cwd=os.getcwd(),
+        )
+        self.lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.proc.stdout:
+            self.lines.put(line)
+        self.lines.put(None)
+
+    def healthy(self) -> bool:
+        return not self.broken and self.proc.poll() is None
+
+    def request(self, text: str, timeout: float) -> Tuple[str, str]:
+        """Send one user message and wait for its result event."""
+        self.requests += 1
+        message = {"type": "user", "message": {"role": "user", "content": text}}
+        try:
+            self.proc.stdin.write(json.dumps(message) + "\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            self.broken = True
+            return f"ERROR: worker unavailable: {e}", ""
+
+        deadline = time.time() + timeout
+        transcript: List[str] = []
+        while True:
+            remaining = deadline - time.time()
+            try:
+                line = self.lines.get(timeout=max(remaining, 0))
+            except queue.Empty:
+                self.broken = True
+                return "ERROR: Timeout", ""
+            if line is None:
+                self.broken = True
+                return f"ERROR: worker exited with {self.proc.wait()}", ""
+            try:
+                event = loads(line)
+            except ValueError:
+                continue
+            if not isinstance(event, dict) or event.get("subtype") == "init":
+                continue
+            transcript.append(line.strip())
+            if event.get("type") == "result":
+                raw = "\n".join(transcript) + "\n"
+                if event.get("is_error"):
+                    return f"ERROR: {event.get('result') or event.get('subtype')}", raw
+                return event.get("result", ""), raw
+
+    def close(self):
+        if self.broken and self.proc.poll() is None:
+            self.proc.kill()
+        if self.proc.poll() is None:
+            try:
+                self.proc.stdin.close()
+                self.proc.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.proc.kill()
+                self.proc.wait()
+
+
+class WorkerPoolBackend(LLMBackend):
+    """Pre-started single-use sessions, `workers` ready at a time."""
+
+    name = "pool"
+
+    def __init__(self, workers: int = 1):
+        super().__init__()
+        self.size = max(1, workers)
+        self._closed = False
+        self._idle: "queue.Queue[Optional[SessionWorker]]" = queue.Queue()
+        # Two sessions per worker, so a replacement warms up during the next call
+        for _ in range(2 * self.size):
+            self._idle.put(None)  # started on first use
+        self._all: List[SessionWorker] = []
+
+    def _spawn(self) -> SessionWorker:
+        worker = SessionWorker()
+        with self._lock:
+            self._all.append(worker)
+            self._stats["processes_started"] = self._stats.get("processes_started", 0) + 1
+        return worker
+
+    def _retire(self, worker: SessionWorker, reason: str):
+        worker.close()
+        with self._lock:
+            self._all.remove(worker)
+            self._stats[reason] = self._stats.get(reason, 0) + 1
+
+    def _replacement(self) -> Optional[SessionWorker]:
+        """A fresh session warming up for the next request (None: start on demand)."""
+        if self._closed:
+            return None
+        try:
+            return self._spawn()
+        except OSError:
+            return None
+
+    def complete(
+        self, prompt: str, system_prompt: Optional[str] = None, timeout: int = 600
+    ) -> Tuple[str, str]:
+        worker = self._idle.get()
+        start = time.time()
+        try:
+            if worker is not None and not worker.healthy():
+                self._retire(worker, "unhealthy")
+                worker = None
+            if worker is None:
+                worker = self._spawn()
+            response = worker.request(build_prompt(prompt, system_prompt), timeout)
+        except Exception as e:
+            response = f"ERROR: {e}", ""
+        finally:
+            # Never reuse a session: its conversation now holds this prompt
+            self._idle.put(self._replacement())
+            if worker is not None:
+                reason = "unhealthy" if not worker.healthy() else "used"
+                worker.broken = True  # nothing left to flush, so don't wait for it
+                self._retire(worker, reason)
+        self._count(time.time() - start, response[0].startswith("ERROR"))
+        return response
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            workers = list(self._all)
+        for worker in workers:
+            worker.close()
+
+
+def get_backend(name: str, workers: int = 1) -> LLMBackend:
+    if name == "pool":
+        return WorkerPoolBackend(workers)
+    if name == "subprocess":
+        return SubprocessBackend()
+    raise ValueError(f"Unknown LLM backend: {name} (choose from {', '.join(BACKENDS)})")
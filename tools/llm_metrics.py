@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Token, cost and latency metrics for benchmark runs.
+
+benchmark_assessor.py appends one JSON line per LLM call to a metrics file:
+question and tutorial, component (solver or judge), status and attempts,
+wall time, and what the CLI reported in its transcript (input/output and
+cache tokens, cost, turns, API time) plus the number of tool calls.
+
+`summary` aggregates a metrics file per tutorial and component: totals, and
+p50/p95/p99 of wall time, turns, tool calls and tokens. Tutorials are sorted
+by mean solver turns, so the ones whose tools make the agent burn turns come
+first.
+
+Usage:
+    python tools/llm_metrics.py summary results/benchmark_metrics.jsonl
+    python tools/llm_metrics.py summary metrics.jsonl --by component --output summary.json
+"""
+
+import sys
+import time
+import argparse
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from json_backend import dump_path, dumps, loads
+from llm_backend import transcript_events
+
+PERCENTILES = (50, 95, 99)
+DISTRIBUTIONS = ["wall_seconds", "num_turns", "tool_calls", "input_tokens", "output_tokens"]
+TOTALS = [
+    "input_tokens",
+    "output_tokens",
+    "cache_read_tokens",
+    "cache_creation_tokens",
+    "cost_usd",
+    "num_turns",
+    "tool_calls",
+    "wall_seconds",
+]
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile (None for no values)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def call_metrics(raw: str) -> Dict[str, Any]:
+    """Usage, cost, turns and tool calls from a raw CLI response (zeros if absent)."""
+    events = transcript_events(raw)
+    result = next((e for e in reversed(events) if e.get("type") == "result"), {})
+    usage = result.get("usage") or {}
+    tool_calls = 0
+    for event in events:
+        if event.get("type") != "assistant":
+            continue
+        content = event.get("message", {}).get("content", [])
+        if isinstance(content, list):
+            tool_calls += sum(
+                1 for block in content if isinstance(block, dict) and block.get("type") == "tool_use"
+            )
+    return {
+        "input_tokens": usage.get("input_tokens", 0),
+        "output_tokens": usage.get("output_tokens", 0),
+        "cache_read_tokens": usage.get("cache_read_input_tokens", 0),
+        "cache_creation_tokens": usage.get("cache_creation_input_tokens", 0),
+        "cost_usd": result.get("total_cost_usd", result.get("cost_usd", 0.0)) or 0.0,
+        "num_turns": result.get("num_turns", 0),
+        "tool_calls": tool_calls,
+        "api_seconds": round(result.get("duration_api_ms", result.get("duration_ms", 0)) / 1000, 3),
+    }
+
+
+class MetricsWriter:
+    """Thread-safe JSONL writer for per-call metrics."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+
+    def record(
+        self,
+        question: Dict[str, Any],
+        component: str,
+        outcome: Dict[str, Any],
+    ):
+        """Append the metrics of one scheduler call (see CallScheduler.call)."""
+        entry = {
+            "timestamp": round(time.time(), 3),
+            "question_id": question.get("question_id", ""),
+            "tutorial_id": question.get("tutorial_id", ""),
+            "component": component,
+            "status": outcome["status"],
+            "attempts": outcome["attempts"],
+            "wall_seconds": outcome["seconds"],
+            **call_metrics(outcome["raw"]),
+        }
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(dumps(entry, indent=None) + "\n")
+
+
+def load_metrics(path: Path) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [loads(line) for line in f if line.strip()]
+
+
+def summarize(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Totals and percentiles of a group of metric entries."""
+    summary: Dict[str, Any] = {
+        "calls": len(entries),
+        "failed": sum(1 for e in entries if e.get("status") == "failed"),
+        "retried": sum(1 for e in entries if e.get("status") == "retried"),
+        "totals": {key: round(sum(e.get(key, 0) for e in entries), 6) for key in TOTALS},
+    }
+    for key in DISTRIBUTIONS:
+        values = [e.get(key, 0) for e in entries]
+        summary[key] = {f"p{p}": percentile(values, p) for p in PERCENTILES}
+        summary[key]["mean"] = round(sum(values) / len(values), 3) if values else None
+    return summary
+
+
+def summarize_by(entries: List[Dict[str, Any]], by: str) -> Dict[str, Any]:
+    """Overall, per component, and per tutorial (split by component) summaries."""
+    report: Dict[str, Any] = {"overall": summarize(entries), "by_component": {}}
+    for component in sorted({e["component"] for e in entries}):
+        report["by_component"][component] = summarize(
+            [e for e in entries if e["component"] == component]
+        )
+    if by == "tutorial":
+        tutorials = {}
+        for tutorial in sorted({e["tutorial_id"] for e in entries}):
+            group = [e for e in entries if e["tutorial_id"] == tutorial]
+            tutorials[tutorial] = {
+                component: summarize([e for e in group if e["component"] == component])
+                for component in sorted({e["component"] for e in group})
+            }
+        report["by_tutorial"] = dict(
+            sorted(
+                tutorials.items(),
+                key=lambda item: -(item[1].get("solver", {}).get("num_turns", {}).get("mean") or 0),
+            )
+        )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize benchmark LLM call metrics.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    summary = sub.add_parser("summary", help="Percentiles and totals from a metrics JSONL")
+    summary.add_argument("metrics", help="Metrics JSONL written by benchmark_assessor.py")
+    summary.add_argument(
+        "--by", choices=["tutorial", "component"], default="tutorial", help="Grouping (default: tutorial)"
+    )
+    summary.add_argument("--output", help="Write the JSON summary here")
+
+    args = parser.parse_args()
+    path = Path(args.metrics)
+    if not path.exists():
+        print(f"Error: {path} does not exist", file=sys.stderr)
+        sys.exit(1)
+    entries = load_metrics(path)
+    if not entries:
+        print(f"Error: no metrics in {path}", file=sys.stderr)
+        sys.exit(1)
+
+    report = summarize_by(entries, args.by)
+    if args.output:
+        dump_path(report, args.output)
+
+    def line(name: str, s: Dict[str, Any]) -> str:
+        wall = s["wall_seconds"]
+        return (
+            f"  {name:28s} {s['calls']:5d} calls  ${s['totals']['cost_usd']:.4f}  "
+            f"tokens {s['totals']['input_tokens']}/{s['totals']['output_tokens']}  "
+            f"turns {s['num_turns']['mean']}  tools {s['tool_calls']['mean']}  "
+            f"wall p50/p95/p99 {wall['p50']:.2f}/{wall['p95']:.2f}/{wall['p99']:.2f}s"
+        )
+
+    print(f"\nBenchmark Metrics ({path}):")
+    print(line("overall", report["overall"]))
+    for component, s in report["by_component"].items():
+        print(line(component, s))
+    if "by_tutorial" in report:
+        print("\nBy tutorial (most solver turns first):")
+        for tutorial, components in report["by_tutorial"].items():
+            for component, s in components.items():
+                print(line(f"{tutorial} [{component}]", s))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Retry, rate-limit and timeout scheduling for LLM calls.
+
+CallScheduler wraps an llm_backend.LLMBackend:
+
+- Transient failures (timeouts, overloaded/rate-limited/5xx API errors,
+  dead session workers) are retried with exponential backoff and full
+  jitter; other errors fail immediately.
+- A token bucket shared by all worker threads caps the call rate.
+- Per-call timeouts follow observed latency: once enough calls have
+  succeeded, the timeout is `timeout_factor` x their p95, between
+  `min_timeout` and `max_timeout`. A call that timed out is retried with
+  twice the timeout.
+
+call() returns the response plus how it went (attempts, errors, final
+status), so callers can tell a retried success from a real failure;
+complete() makes the scheduler a drop-in LLMBackend.
+
+Usage:
+    scheduler = CallScheduler(backend, max_retries=3, rate_per_minute=30)
+    outcome = scheduler.call(prompt, system_prompt=solver_def)
+    outcome["text"], outcome["status"], outcome["attempts"]
+"""
+
+import re
+import time
+import random
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from llm_backend import LLMBackend
+
+TRANSIENT_RE = re.compile(
+    r"timeout|timed out|overloaded|rate.?limit|\b429\b|\b5\d\d\b|connection|network|"
+    r"ECONNRESET|temporar|worker (unavailable|exited)",
+    re.IGNORECASE,
+)
+
+
+def is_error(text: str) -> bool:
+    return text.startswith("ERROR")
+
+
+def is_transient(text: str) -> bool:
+    return is_error(text) and bool(TRANSIENT_RE.search(text))
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available; returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class CallScheduler:
+    """Retries, rate limiting and adaptive timeouts around an LLM backend."""
+
+    def __init__(
+        self,
+        backend: LLMBackend,
+        max_retries: int = 3,
+        base_delay: float = 2.0,
+        max_delay: float = 60.0,
+        rate_per_minute: float = 0,
+        burst: int = 1,
+        max_timeout: float = 600,
+        min_timeout: float = 60,
+        timeout_factor: float = 3.0,
+        min_samples: int = 10,
+        seed: Optional[int] = None,
+    ):
+        self.backend = backend
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.bucket = TokenBucket(rate_per_minute / 60, burst) if rate_per_minute else None
+        self.max_timeout = max_timeout
+        self.min_timeout = min(min_timeout, max_timeout)
+        self.timeout_factor = timeout_factor
+        self.min_samples = min_samples
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.latencies: Deque[float] = deque(maxlen=200)
+        self.counts = {"calls": 0, "attempts": 0, "retries": 0, "failed": 0, "rate_wait_seconds": 0.0}
+
+    def current_timeout(self) -> float:
+        """Timeout for a first attempt, from the p95 of recent successful calls."""
+        with self.lock:
+            samples = sorted(self.latencies)
+        if len(samples) < self.min_samples:
+            return self.max_timeout
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return max(self.min_timeout, min(self.max_timeout, p95 * self.timeout_factor))
+
+    def backoff(self, retry: int) -> float:
+        """Full jitter: uniform in [0, min(max_delay, base_delay * 2**retry)]."""
+        with self.lock:
+            return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+
+    def call(self, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run a prompt with retries.
+
+        Returns {text, raw, status, attempts, errors, timeout, seconds}; status
+        is "ok", "retried" (succeeded after transient errors) or "failed", and
+        seconds is the wall time including retries.
+        """
+        errors: List[str] = []
+        timeout = self.current_timeout()
+        began = time.time()
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.bucket:
+                waited = self.bucket.acquire()
+                with self.lock:
+                    self.counts["rate_wait_seconds"] += waited
+            start = time.time()
+            text, raw = self.backend.complete(prompt, system_prompt, max(1, round(timeout)))
+            elapsed = time.time() - start
+            with self.lock:
+                self.counts["attempts"] += 1
+
+            if not is_error(text):
+                with self.lock:
+                    self.latencies.append(elapsed)
+                    self.counts["calls"] += 1
+                    self.counts["retries"] += attempt - 1
+                status = "retried" if errors else "ok"
+                return {
+                    "text": text,
+                    "raw": raw,
+                    "status": status,
+                    "attempts": attempt,
+                    "errors": errors,
+                    "timeout": round(timeout, 1),
+                    "seconds": round(time.time() - began, 3),
+                }
+
+            errors.append(text[:200])
+            if not is_transient(text) or attempt > self.max_retries:
+                with self.lock:
+                    self.counts["calls"] += 1
+                    self.counts["retries"] += attempt - 1
+                    self.counts["failed"] += 1
+                return {
+                    "text": text,
+                    "raw": raw,
+                    "status": "failed",
+                    "attempts": attempt,
+                    "errors": errors,
+                    "timeout": round(timeout, 1),
+                    "seconds": round(time.time() - began, 3),
+                }
+            if "Timeout" in text:
+                timeout = min(self.max_timeout, timeout * 2)
+            time.sleep(self.backoff(attempt - 1))
+
+    def complete(
+        self, prompt: str, system_prompt: Optional[str] = None, timeout: Optional[int] = None
+    ) -> Tuple[str, str]:
+        """LLMBackend-compatible call (the timeout is the scheduler's own)."""
+        outcome = self.call(prompt, system_prompt)
+        return outcome["text"], outcome["raw"]
+
+    def close(self):
+        self.backend.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = dict(self.counts)
+        stats["rate_wait_seconds"] = round(stats["rate_wait_seconds"], 2)
+        stats["timeout"] = round(self.current_timeout(), 1)
+        return stats
@@ -0,0 +1,182 @@
+"""
+Lazy tool registration for the generated MCP server.
+
+Copy this file next to the server as `src/mcp_lazy_loader.py`. The server then
+registers every tool from `src/tools_manifest.json` (built by
+tools/mcp_manifest.py) using lightweight stubs with the original signatures,
+so clients see the full tool list immediately. A tool module, and whatever
+heavy libraries it imports, is only loaded the first time one of its tools is
+called.
+
+Stubs use the defaults the manifest recorded as JSON values. A tool whose
+defaults the manifest could not record, or whose annotations do not evaluate
+without the module's own imports, is registered from its real module at
+start-up instead, so its schema never differs from the eager server's.
+
+Set PAPER2AGENT_EAGER_TOOLS=1 to import and mount every module up front instead.
+
+`wrap(tool_name, fn)` is applied to each real tool function when its module is
+imported, e.g. ToolCache.wrap from mcp_tool_cache.py to memoize deterministic
+tools (lazy mode only).
+"""
+
+import os
+import sys
+import json
+import hashlib
+import inspect
+import importlib
+import threading
+import typing
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+_import_lock = threading.Lock()
+
+# Names available when evaluating annotation/default source from the manifest
+_EVAL_NAMESPACE: Dict[str, Any] = {
+    name: getattr(typing, name) for name in typing.__all__ if hasattr(typing, name)
+}
+_EVAL_NAMESPACE.update({"Path": Path, "datetime": datetime, "typing": typing})
+
+
+class _Unresolvable(Exception):
+    """A manifest entry that cannot be turned into a stub without the module."""
+
+
+def _evaluate(source: str) -> Any:
+    try:
+        return eval(source, dict(_EVAL_NAMESPACE))
+    except Exception as e:
+        raise _Unresolvable(f"annotation '{source}' needs the module's imports") from e
+
+
+def _signature(spec: Dict[str, Any]) -> inspect.Signature:
+    if not spec.get("lazy", True):
+        raise _Unresolvable(spec.get("eager_reason", "marked eager in the manifest"))
+    params = []
+    for param in spec["parameters"]:
+        annotation = inspect.Parameter.empty
+        if "annotation" in param:
+            annotation = _evaluate(param["annotation"])
+        default = inspect.Parameter.empty
+        if "default_value" in param:
+            default = param["default_value"]
+        elif "default" in param:
+            raise _Unresolvable(f"default of '{param['name']}' ({param['default']}) not recorded")
+        params.append(
+            inspect.Parameter(
+                param["name"],
+                getattr(inspect.Parameter, param["kind"]),
+                default=default,
+                annotation=annotation,
+            )
+        )
+    returns = inspect.Signature.empty
+    if spec.get("returns"):
+        returns = _evaluate(spec["returns"])
+    return inspect.Signature(params, return_annotation=returns)
+
+
+Wrapper = Callable[[str, Callable], Callable]
+
+
+def _resolver(
+    package: str, module_name: str, spec: Dict[str, Any], wrap: Optional[Wrapper] = None
+) -> Callable[[], Callable]:
+    """Return a function that imports the module once and yields the real tool."""
+    cache: Dict[str, Callable] = {}
+
+    def resolve() -> Callable:
+        if "fn" not in cache:
+            with _import_lock:
+                if "fn" not in cache:
+                    module = importlib.import_module(f"{package}.{module_name}")
+                    target = getattr(module, spec["function"])
+                    # FastMCP's @tool returns a FunctionTool wrapping the function
+                    fn = getattr(target, "fn", target)
+                    cache["fn"] = wrap(spec["name"], fn) if wrap else fn
+        return cache["fn"]
+
+    return resolve
+
+
+def _make_stub(
+    package: str, module_name: str, spec: Dict[str, Any], wrap: Optional[Wrapper] = None
+) -> Callable:
+    signature = _signature(spec)
+    resolve = _resolver(package, module_name, spec, wrap)
+
+    if spec.get("is_async"):
+
+        async def stub(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            return await resolve()(*bound.args, **bound.kwargs)
+
+    else:
+
+        def stub(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            return resolve()(*bound.args, **bound.kwargs)
+
+    stub.__name__ = spec["function"]
+    stub.__qualname__ = spec["function"]
+    stub.__doc__ = spec.get("description") or None
+    stub.__module__ = f"{package}.{module_name}"
+    stub.__signature__ = signature
+    stub.__annotations__ = {
+        p.name: p.annotation
+        for p in signature.parameters.values()
+        if p.annotation is not inspect.Parameter.empty
+    }
+    if signature.return_annotation is not inspect.Signature.empty:
+        stub.__annotations__["return"] = signature.return_annotation
+    return stub
+
+
+def _warn_if_stale(manifest: Dict[str, Any], tools_dir: Path):
+    for module_name, module in manifest.get("modules", {}).items():
+        path = tools_dir / f"{module_name}.py"
+        if not path.exists():
+            print(f"Warning: {path} listed in manifest but missing", file=sys.stderr)
+        elif hashlib.sha256(path.read_bytes()).hexdigest() != module["sha256"]:
+            print(
+                f"Warning: {path} changed since the manifest was built; "
+                "rerun tools/mcp_manifest.py build",
+                file=sys.stderr,
+            )
+
+
+def register_lazy_tools(mcp, manifest_path: Path, wrap: Optional[Wrapper] = None) -> int:
+    """Register every manifest tool on `mcp`, returning the number registered."""
+    manifest_path = Path(manifest_path)
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    package = manifest.get("package", "tools")
+    tools_dir = manifest_path.parent / package
+    _warn_if_stale(manifest, tools_dir)
+
+    if os.environ.get("PAPER2AGENT_EAGER_TOOLS") == "1":
+        for module_name, module in sorted(manifest["modules"].items()):
+            imported = importlib.import_module(f"{package}.{module_name}")
+            for instance in sorted({t["instance"] for t in module["tools"]}):
+                mcp.mount(getattr(imported, instance))
+        return sum(len(m["tools"]) for m in manifest["modules"].values())
+
+    count = 0
+    for module_name, module in sorted(manifest["modules"].items()):
+        for spec in module["tools"]:
+            try:
+                fn = _make_stub(package, module_name, spec, wrap)
+            except _Unresolvable as e:
+                # Register the real function rather than a stub with a guessed schema
+                print(
+                    f"Note: importing {package}.{module_name} for tool {spec['name']}: {e}",
+                    file=sys.stderr,
+                )
+                fn = _resolver(package, module_name, spec, wrap)()
+            mcp.tool(name=spec["name"], description=spec.get("description") or None)(fn)
+            count += 1
+    return count
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Tool manifest builder for the generated MCP server.
+
+Statically parses `src/tools/*.py` (no imports, so heavy scientific stacks are
+never loaded) and records every `@<name>_mcp.tool` function: tool name,
+description, parameters with their annotation/default source, and the module
+source hash. The lazy server template (see mcp_lazy_loader.py) registers tool
+schemas from this manifest and imports a module only when one of its tools is
+first called.
+
+Defaults are stored evaluated (`default_value`) when they are JSON literals or
+module-level constants bound to one. A tool with any other default (a call,
+a tuple, an imported name, ...) is marked `"lazy": false`, and the loader
+imports its module up front instead of guessing the value.
+
+Usage:
+    python tools/mcp_manifest.py build src/tools --output src/tools_manifest.json
+    python tools/mcp_manifest.py check src/tools --output src/tools_manifest.json
+"""
+
+import ast
+import sys
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+MANIFEST_VERSION = 2
+
+_UNRESOLVED = object()
+
+
+def _fastmcp_instances(tree: ast.Module) -> List[str]:
+    """Names assigned from FastMCP(...) at module level."""
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Call):
+            func = node.value.func
+            func_name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", "")
+            if func_name == "FastMCP":
+                names.extend(t.id for t in node.targets if isinstance(t, ast.Name))
+    return names
+
+
+def _tool_decorator(
+    func: ast.AST, instances: List[str]
+) -> Optional[Dict[str, Optional[str]]]:
+    """Return decorator kwargs if func is decorated with <instance>.tool."""
+    for decorator in func.decorator_list:
+        call_kwargs: Dict[str, Optional[str]] = {}
+        target = decorator
+        if isinstance(decorator, ast.Call):
+            target = decorator.func
+            for kw in decorator.keywords:
+                if kw.arg in ("name", "description") and isinstance(kw.value, ast.Constant):
+                    call_kwargs[kw.arg] = kw.value.value
+            if decorator.args and isinstance(decorator.args[0], ast.Constant):
+                call_kwargs.setdefault("name", decorator.args[0].value)
+        if (
+            isinstance(target, ast.Attribute)
+            and target.attr == "tool"
+            and isinstance(target.value, ast.Name)
+            and target.value.id in instances
+        ):
+            call_kwargs["instance"] = target.value.id
+            return call_kwargs
+    return None
+
+
+def _module_constants(tree: ast.Module) -> Dict[str, ast.expr]:
+    """Module-level names bound exactly once by a plain assignment."""
+    bindings: Dict[str, List[Optional[ast.expr]]] = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                for name in ast.walk(target):
+                    if isinstance(name, ast.Name):
+                        value = node.value if target is name else None
+                        bindings.setdefault(name.id, []).append(value)
+        elif isinstance(node, (ast.AnnAssign, ast.AugAssign)) and isinstance(
+            node.target, ast.Name
+        ):
+            value = node.value if isinstance(node, ast.AnnAssign) else None
+            bindings.setdefault(node.target.id, []).append(value)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            bindings.setdefault(node.name, []).append(None)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                bindings.setdefault((alias.asname or alias.name).split(".")[0], []).append(None)
+    return {
+        name: values[0]
+        for name, values in bindings.items()
+        if len(values) == 1 and values[0] is not None
+    }
+
+
+def _is_json_value(value: Any) -> bool:
+    """True if value survives a JSON round trip unchanged (no tuples, NaN, ...)."""
+    if value is None or isinstance(value, (bool, int, str)):
+        return True
+    if isinstance(value, float):
+        return value == value and value not in (float("inf"), float("-inf"))
+    if isinstance(value, list):
+        return all(_is_json_value(v) for v in value)
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _is_json_value(v) for k, v in value.items())
+    return False
+
+
+def _default_value(default: ast.expr, constants: Dict[str, ast.expr]) -> Any:
+    """The default's value if it is a JSON literal (or a constant bound to one)."""
+    if isinstance(default, ast.Name) and default.id in constants:
+        default = constants[default.id]
+    try:
+        value = ast.literal_eval(default)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return _UNRESOLVED
+    return value if _is_json_value(value) else _UNRESOLVED
+
+
+def _parameters(args: ast.arguments, constants: Dict[str, ast.expr]) -> List[Dict[str, Any]]:
+    params = []
+    positional = args.posonlyargs + args.args
+    defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+    for arg, default in zip(positional, defaults):
+        params.append(_param(arg, default, "POSITIONAL_OR_KEYWORD", constants))
+    for arg, default in zip(args.kwonlyargs, args.kw_defaults):
+        params.append(_param(arg, default, "KEYWORD_ONLY", constants))
+    return params
+
+
+def _param(
+    arg: ast.arg, default: Optional[ast.expr], kind: str, constants: Dict[str, ast.expr]
+) -> Dict[str, Any]:
+    param: Dict[str, Any] = {"name": arg.arg, "kind": kind}
+    if arg.annotation is not None:
+        param["annotation"] = ast.unparse(arg.annotation)
+    if default is not None:
+        param["default"] = ast.unparse(default)
+        value = _default_value(default, constants)
+        if value is not _UNRESOLVED:
+            param["default_value"] = value
+    return param
+
+
+def _lazy_reason(func: ast.AST, params: List[Dict[str, Any]]) -> Optional[str]:
+    """Why a tool cannot be served from its manifest entry (None if it can)."""
+    if func.args.vararg or func.args.kwarg:
+        return "*args/**kwargs parameters"
+    for param in params:
+        if "default" in param and "default_value" not in param:
+            return f"default of '{param['name']}' ({param['default']}) is not a JSON literal"
+    return None
+
+
+def scan_module(path: Path) -> List[Dict[str, Any]]:
+    """Extract tool specs from one module without importing it."""
+    source = path.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(path))
+    instances = _fastmcp_instances(tree)
+    constants = _module_constants(tree)
+    tools = []
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        decorator = _tool_decorator(node, instances)
+        if decorator is None:
+            continue
+        params = _parameters(node.args, constants)
+        reason = _lazy_reason(node, params)
+        tool = {
+            "name": decorator.get("name") or node.name,
+            "function": node.name,
+            "instance": decorator["instance"],
+            "description": decorator.get("description")
+            or (ast.get_docstring(node) or "").strip(),
+            "is_async": isinstance(node, ast.AsyncFunctionDef),
+            "parameters": params,
+            "returns": ast.unparse(node.returns) if node.returns else None,
+            "lazy": reason is None,
+        }
+        if reason:
+            tool["eager_reason"] = reason
+        tools.append(tool)
+    return tools
+
+
+def module_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def build_manifest(tools_dir: Path) -> Dict[str, Any]:
+    """Scan every tool module in tools_dir."""
+    modules = {}
+    for path in sorted(tools_dir.glob("*.py")):
+        if path.name == "__init__.py":
+            continue
+        modules[path.stem] = {
+            "sha256": module_hash(path),
+            "tools": scan_module(path),
+        }
+    return {"version": MANIFEST_VERSION, "package": tools_dir.name, "modules": modules}
+
+
+def stale_modules(manifest: Dict[str, Any], tools_dir: Path) -> List[str]:
+    """Modules whose source changed (or appeared/disappeared) since the manifest."""
+    current = {
+        p.stem: module_hash(p) for p in tools_dir.glob("*.py") if p.name != "__init__.py"
+    }
+    recorded = {name: m["sha256"] for name, m in manifest.get("modules", {}).items()}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return sorted(set(current) | set(recorded))
+    return sorted(
+        name
+        for name in set(current) | set(recorded)
+        if current.get(name) != recorded.get(name)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build or check the tool manifest used by the lazy MCP server."
+    )
+    parser.add_argument("action", choices=["build", "check"])
+    parser.add_argument("tools_dir", help="Directory with tool modules (e.g. src/tools)")
+    parser.add_argument(
+        "--output",
+        help="Manifest path (default: <tools_dir>/../tools_manifest.json)",
+    )
+
+    args = parser.parse_args()
+    tools_dir = Path(args.tools_dir)
+    output = Path(args.output) if args.output else tools_dir.parent / "tools_manifest.json"
+
+    if not tools_dir.is_dir():
+        print(f"Error: {tools_dir} is not a directory", file=sys.stderr)
+        sys.exit(1)
+
+    if args.action == "check":
+        if not output.exists():
+            print(f"Manifest missing: {output}", file=sys.stderr)
+            sys.exit(1)
+        with open(output, "r", encoding="utf-8") as f:
+            stale = stale_modules(json.load(f), tools_dir)
+        if stale:
+            print(f"Manifest is stale for: {', '.join(stale)}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Manifest up to date: {output}")
+        return
+
+    try:
+        manifest = build_manifest(tools_dir)
+    except SyntaxError as e:
+        print(f"Error: cannot parse {e.filename}: {e.msg} at line {e.lineno}", file=sys.stderr)
+        sys.exit(1)
+
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    n_tools = sum(len(m["tools"]) for m in manifest["modules"].values())
+    print(f"Wrote {n_tools} tools from {len(manifest['modules'])} modules to {output}")
+    for module_name, module in manifest["modules"].items():
+        for tool in module["tools"]:
+            if not tool["lazy"]:
+                name = f"{module_name}.{tool['function']}"
+                print(f"  {name}: imported up front ({tool['eager_reason']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+MCP Server Startup Benchmark
+
+This script:
+1. Imports the generated MCP server in fresh interpreters (`-X importtime`)
+   and records cold-start wall time, lazily and with PAPER2AGENT_EAGER_TOOLS=1.
+2. Imports each `src/tools/<module>.py` on its own to get its import cost.
+3. Parses the importtime output to list the most expensive imported packages.
+4. Writes a JSON report and prints a summary.
+
+Usage:
+    python tools/mcp_startup_benchmark.py src/<repo>_mcp.py --python <repo>-env/bin/python
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parse `-X importtime` lines into {module, self_us, cumulative_us, depth}."""
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            entries.append(
+                {
+                    "module": match.group(4),
+                    "self_us": int(match.group(1)),
+                    "cumulative_us": int(match.group(2)),
+                    "depth": (len(match.group(3)) - 1) // 2,
+                }
+            )
+    return entries
+
+
+def timed_import(
+    python: str, src_dir: Path, module: str, env: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """Import a module in a fresh interpreter and return timing details."""
+    code = f"import sys; sys.path.insert(0, {str(src_dir)!r}); import {module}"
+    start = time.perf_counter()
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=str(src_dir.parent),
+        env={**os.environ, **(env or {})},
+    )
+    wall = time.perf_counter() - start
+    entries = parse_importtime(result.stderr)
+    errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+    own = next((e for e in entries if e["module"] == module), None)
+    return {
+        "wall_seconds": round(wall, 4),
+        "import_seconds": round(own["cumulative_us"] / 1e6, 4) if own else None,
+        "returncode": result.returncode,
+        "error": "\n".join(errors[-5:]) if result.returncode != 0 else "",
+        "entries": entries,
+    }
+
+
+def top_packages(
+    entries: List[Dict[str, Any]], limit: int, exclude: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Most expensive top-level packages by cumulative import time."""
+    best: Dict[str, int] = {}
+    for entry in entries:
+        root = entry["module"].split(".")[0]
+        if root == exclude:
+            continue
+        best[root] = max(best.get(root, 0), entry["cumulative_us"])
+    ranked = sorted(best.items(), key=lambda x: x[1], reverse=True)[:limit]
+    return [{"package": name, "cumulative_seconds": round(us / 1e6, 4)} for name, us in ranked]
+
+
+def benchmark_server(
+    python: str, server: Path, repeat: int, env: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    runs = [timed_import(python, server.parent, server.stem, env) for _ in range(repeat)]
+    walls = [r["wall_seconds"] for r in runs]
+    return {
+        "cold_start_seconds": walls[0],
+        "median_seconds": round(statistics.median(walls), 4),
+        "runs": walls,
+        "returncode": runs[-1]["returncode"],
+        "error": runs[-1]["error"],
+        "entries": runs[0]["entries"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure MCP server cold start and per-module import cost."
+    )
+    parser.add_argument("server", help="Path to src/<repo>_mcp.py")
+    parser.add_argument(
+        "--python", default=sys.executable, help="Interpreter of the project environment"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Server imports per mode")
+    parser.add_argument("--top", type=int, default=10, help="Packages to list")
+    parser.add_argument(
+        "--output",
+        default="reports/mcp_startup_benchmark.json",
+        help="Where to write the JSON report",
+    )
+
+    args = parser.parse_args()
+    server = Path(args.server).resolve()
+    if not server.exists():
+        print(f"Error: {server} does not exist", file=sys.stderr)
+        sys.exit(1)
+
+    tools_dir = server.parent / "tools"
+    report: Dict[str, Any] = {"server": str(server), "python": args.python}
+
+    print(f"Benchmarking {server.name} ({args.repeat} runs per mode)...", file=sys.stderr)
+    modes = {"lazy": {}}
+    if (server.parent / "tools_manifest.json").exists():
+        modes["eager"] = {"PAPER2AGENT_EAGER_TOOLS": "1"}
+    for mode, env in modes.items():
+        result = benchmark_server(args.python, server, args.repeat, env)
+        if result["returncode"] != 0:
+            print(f"Error: server import failed ({mode}):\n{result['error']}", file=sys.stderr)
+        result["top_packages"] = top_packages(
+            result.pop("entries"), args.top, exclude=server.stem
+        )
+        report[mode] = result
+
+    modules = []
+    for path in sorted(tools_dir.glob("*.py")):
+        if path.name == "__init__.py":
+            continue
+        result = timed_import(args.python, server.parent, f"tools.{path.stem}")
+        modules.append(
+            {
+                "module": path.stem,
+                "import_seconds": result["import_seconds"],
+                "wall_seconds": result["wall_seconds"],
+                "returncode": result["returncode"],
+                "top_packages": top_packages(result["entries"], 5, exclude="tools"),
+            }
+        )
+    modules.sort(key=lambda m: m["import_seconds"] or 0.0, reverse=True)
+    report["modules"] = modules
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\nStartup Summary:")
+    for mode in modes:
+        print(
+            f"  {mode}: cold {report[mode]['cold_start_seconds']:.2f}s, "
+            f"median {report[mode]['median_seconds']:.2f}s"
+        )
+    print(f"\nTool module import cost:")
+    for m in modules:
+        cost = f"{m['import_seconds']:.2f}s" if m["import_seconds"] is not None else "failed"
+        heaviest = ", ".join(p["package"] for p in m["top_packages"][:3])
+        print(f"  {m['module']}: {cost} ({heaviest})")
+    print(f"\nReport saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+"""
+On-disk memoization of deterministic tools for the generated MCP server.
+
+Copy this file next to the server as `src/mcp_tool_cache.py`. Benchmark
+solvers often call the same expensive tool (typically preprocessing) with the
+same arguments on the same input files; with a ToolCache passed to
+register_lazy_tools, the tools listed in `tools` (none by default) return the
+stored result instead:
+
+- The key is the tool name, its arguments bound to the signature with
+  defaults applied and normalized to JSON, and the content hash of every
+  argument that names an existing file (a directory counts by the names,
+  sizes and mtimes of its files).
+- Entries live under <cache root>/<tool>/<module source hash>/, so editing a
+  tool module invalidates its tools' entries; they are deleted on first use.
+- Total size is bounded (least recently used entries are evicted first).
+- A stored result that names output files is only reused while those files
+  still exist with the size they had; exceptions are never cached.
+- Hit/miss counts are served as the MCP resource cache://tool-cache/stats.
+
+Only list tools whose result depends on nothing but their arguments and input
+files (no unseeded randomness, network access or clock). Tests that import
+tool modules directly are never cached.
+
+Settings: PAPER2AGENT_TOOL_CACHE=0 disables the cache,
+PAPER2AGENT_TOOL_CACHE_DIR sets its root (default: .pipeline/tool_cache in the
+project) and PAPER2AGENT_TOOL_CACHE_MAX_MB its size (default: 2048).
+
+Usage in src/<repo>_mcp.py:
+    tool_cache = ToolCache(tools=["preprocess_data"])
+    register_lazy_tools(mcp, Path(__file__).with_name("tools_manifest.json"), wrap=tool_cache.wrap)
+    tool_cache.register_resource(mcp)
+
+    python src/mcp_tool_cache.py stats
+    python src/mcp_tool_cache.py clear
+"""
+
+import os
+import json
+import time
+import pickle
+import shutil
+import hashlib
+import inspect
+import argparse
+import functools
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+CACHE_VERSION = 1
+DEFAULT_ROOT = Path(__file__).resolve().parent.parent / ".pipeline" / "tool_cache"
+DEFAULT_MAX_MB = 2048
+STATS_URI = "cache://tool-cache/stats"
+# Strings longer than this are never treated as file paths
+MAX_PATH_LENGTH = 4096
+
+
+def _enabled() -> bool:
+    return os.environ.get("PAPER2AGENT_TOOL_CACHE", "1") != "0"
+
+
+def source_hash(fn: Callable) -> str:
+    """Hash of the source file defining fn (its module)."""
+    try:
+        path = inspect.getsourcefile(inspect.unwrap(fn))
+    except TypeError:
+        path = None
+    if not path or not os.path.exists(path):
+        return "unknown"
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+class ToolCache:
+    """Size-bounded on-disk LRU of tool results, keyed by arguments and input file contents."""
+
+    def __init__(
+        self,
+        tools: Iterable[str] = (),
+        root: Optional[Path] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        # Opt-in: only listed tools (or memoize()d functions) are ever cached
+        self.tools = set(tools)
+        self.root = Path(root or os.environ.get("PAPER2AGENT_TOOL_CACHE_DIR") or DEFAULT_ROOT)
+        if max_bytes is None:
+            max_mb = float(os.environ.get("PAPER2AGENT_TOOL_CACHE_MAX_MB", DEFAULT_MAX_MB))
+            max_bytes = int(max_mb * 2**20)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.counts: Dict[str, Dict[str, float]] = {}
+        self.evictions = 0
+        self.invalidated = 0
+        # path -> (size, last use) of every entry on disk, loaded on first store
+        self.entries: Optional[Dict[Path, Tuple[int, float]]] = None
+        # path -> (size, mtime_ns, sha256) so unchanged inputs are hashed once
+        self.file_hashes: Dict[str, Tuple[int, int, str]] = {}
+
+    def _file_hash(self, path: str, stat: os.stat_result) -> str:
+        known = self.file_hashes.get(path)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        self.file_hashes[path] = (stat.st_size, stat.st_mtime_ns, digest.hexdigest())
+        return digest.hexdigest()
+
+    def _dir_hash(self, path: str) -> str:
+        digest = hashlib.sha256()
+        for current, dirs, names in os.walk(path):
+            dirs.sort()
+            for name in sorted(names):
+                full = os.path.join(current, name)
+                try:
+                    stat = os.stat(full)
+                except OSError:
+                    continue
+                rel = os.path.relpath(full, path)
+                digest.update(f"{rel}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+        return digest.hexdigest()
+
+    def normalize(self, value: Any) -> Any:
+        """JSON-stable form of an argument; existing files and directories carry content hashes."""
+        if isinstance(value, Path):
+            value = str(value)
+        if isinstance(value, str):
+            if 0 < len(value) < MAX_PATH_LENGTH and "\n" not in value:
+                try:
+                    stat = os.stat(value)
+                except (OSError, ValueError):
+                    return value
+                path = os.path.abspath(value)
+                if os.path.isdir(path):
+                    return {"dir": path, "listing": self._dir_hash(path)}
+                return {"file": path, "sha256": self._file_hash(path, stat)}
+            return value
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        if isinstance(value, dict):
+            return {str(k): self.normalize(v) for k, v in value.items()}
+        if isinstance(value, (set, frozenset)):
+            items = [self.normalize(v) for v in value]
+            return sorted(items, key=lambda v: json.dumps(v, sort_keys=True, default=str))
+        if isinstance(value, (list, tuple)):
+            return [self.normalize(v) for v in value]
+        return f"{type(value).__module__}.{type(value).__qualname__}:{value!r}"
+
+    def key(self, name: str, signature: inspect.Signature, args: tuple, kwargs: dict) -> str:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        payload = {"tool": name, "args": self.normalize(dict(bound.arguments))}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _load_entries(self) -> Dict[Path, Tuple[int, float]]:
+        if self.entries is None:
+            self.entries = {}
+            for path in self.root.glob("*/*/*.pkl"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                self.entries[path] = (stat.st_size, stat.st_mtime)
+        return self.entries
+
+    def _count(self, name: str, field: str, amount: float = 1):
+        with self.lock:
+            counts = self.counts.setdefault(
+                name, {"hits": 0, "misses": 0, "stores": 0, "stale": 0, "seconds_saved": 0.0}
+            )
+            counts[field] += amount
+
+    def _outputs(self, result: Any, depth: int = 0) -> Dict[str, int]:
+        """Files named in a result, with their sizes, so a hit can check they still exist."""
+        found: Dict[str, int] = {}
+        if depth > 4:
+            return found
+        if isinstance(result, Path):
+            result = str(result)
+        if isinstance(result, str) and 0 < len(result) < MAX_PATH_LENGTH and "\n" not in result:
+            if os.path.isfile(result):
+                found[os.path.abspath(result)] = os.path.getsize(result)
+        elif isinstance(result, dict):
+            for value in result.values():
+                found.update(self._outputs(value, depth + 1))
+        elif isinstance(result, (list, tuple)):
+            for value in result[:1000]:
+                found.update(self._outputs(value, depth + 1))
+        return found
+
+    def get(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+        for output, size in entry.get("outputs", {}).items():
+            if not os.path.isfile(output) or os.path.getsize(output) != size:
+                self._remove(path)
+                return {"stale": True}
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self.lock:
+            entries = self._load_entries()
+            if path in entries:
+                entries[path] = (entries[path][0], time.time())
+        return entry
+
+    def put(self, paths: List[Path], result: Any, seconds: float):
+        """Store a result under every key in paths (the first written, the rest hard links)."""
+        entry = {
+            "version": CACHE_VERSION,
+            "result": result,
+            "outputs": self._outputs(result),
+            "seconds": seconds,
+            "created": time.time(),
+        }
+        try:
+            data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return  # result cannot be stored; the call still succeeded
+        if len(data) > self.max_bytes:
+            return
+        paths[0].parent.mkdir(parents=True, exist_ok=True)
+        for path in paths:
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                if path == paths[0]:
+                    tmp.write_bytes(data)
+                else:
+                    os.link(paths[0], tmp)
+            except OSError:
+                tmp.write_bytes(data)
+            os.replace(tmp, path)
+        with self.lock:
+            entries = self._load_entries()
+            for path in paths:
+                entries[path] = (len(data), time.time())
+            self._evict(entries)
+
+    def _evict(self, entries: Dict[Path, Tuple[int, float]]):
+        """Drop least recently used entries until the cache fits in max_bytes (lock held)."""
+        total = sum(size for size, _ in entries.values())
+        for path in sorted(entries, key=lambda p: entries[p][1]):
+            if total <= self.max_bytes:
+                break
+            total -= entries.pop(path)[0]
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            self.evictions += 1
+
+    def _remove(self, path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        with self.lock:
+            if self.entries is not None:
+                self.entries.pop(path, None)
+
+    def _invalidate(self, name: str, current: str):
+        """Delete the tool's entries made by other versions of its module."""
+        tool_dir = self.root / name
+        if not tool_dir.is_dir():
+            return
+        for version_dir in tool_dir.iterdir():
+            if version_dir.name != current and version_dir.is_dir():
+                shutil.rmtree(version_dir, ignore_errors=True)
+                with self.lock:
+                    self.invalidated += 1
+                    if self.entries is not None:
+                        for path in [p for p in self.entries if p.parent == version_dir]:
+                            del self.entries[path]
+
+    def wrap(self, name: str, fn: Callable) -> Callable:
+        """Memoized version of tool `name` (fn itself unless `name` is listed in `tools`)."""
+        if not _enabled() or name not in self.tools:
+            return fn
+        signature = inspect.signature(fn)
+        version = source_hash(fn)[:16]
+        self._invalidate(name, version)
+        directory = self.root / name / version
+
+        def entry_path(args: tuple, kwargs: dict) -> Optional[Path]:
+            try:
+                return directory / f"{self.key(name, signature, args, kwargs)}.pkl"
+            except (TypeError, OSError, ValueError):
+                return None  # unbindable or unhashable arguments: just call the tool
+
+        def lookup(args: tuple, kwargs: dict) -> Tuple[Optional[Path], Optional[Dict[str, Any]]]:
+            path = entry_path(args, kwargs)
+            if path is None:
+                return None, None
+            entry = self.get(path) if path.exists() else None
+            if entry and entry.get("stale"):
+                self._count(name, "stale")
+                entry = None
+            if entry is None:
+                self._count(name, "misses")
+            else:
+                self._count(name, "hits")
+                self._count(name, "seconds_saved", entry.get("seconds", 0.0))
+            return path, entry
+
+        def store(path: Optional[Path], result: Any, start: float, args: tuple, kwargs: dict):
+            if path is None:
+                return
+            seconds = time.perf_counter() - start
+            # An argument naming the tool's output file hashes differently once the
+            # file exists, so the result is also stored under the post-call key
+            after = entry_path(args, kwargs)
+            self.put([path] + ([after] if after and after != path else []), result, seconds)
+            self._count(name, "stores")
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def cached(*args, **kwargs):
+                path, entry = lookup(args, kwargs)
+                if entry is not None:
+                    return entry["result"]
+                start = time.perf_counter()
+                result = await fn(*args, **kwargs)
+                store(path, result, start, args, kwargs)
+                return result
+
+        else:
+
+            @functools.wraps(fn)
+            def cached(*args, **kwargs):
+                path, entry = lookup(args, kwargs)
+                if entry is not None:
+                    return entry["result"]
+                start = time.perf_counter()
+                result = fn(*args, **kwargs)
+                store(path, result, start, args, kwargs)
+                return result
+
+        return cached
+
+    def memoize(self, fn: Optional[Callable] = None, *, name: Optional[str] = None):
+        """Decorator that opts one function in, for functions outside the lazy loader."""
+
+        def decorate(f: Callable) -> Callable:
+            self.tools.add(name or f.__name__)
+            return self.wrap(name or f.__name__, f)
+
+        return decorate(fn) if fn is not None else decorate
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            entries = self._load_entries()
+            tools = {name: dict(counts) for name, counts in sorted(self.counts.items())}
+            hits = sum(c["hits"] for c in tools.values())
+            misses = sum(c["misses"] for c in tools.values())
+            return {
+                "enabled": _enabled(),
+                "root": str(self.root),
+                "cached_tools": sorted(self.tools),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+                "seconds_saved": round(sum(c["seconds_saved"] for c in tools.values()), 3),
+                "entries": len(entries),
+                "bytes": sum(size for size, _ in entries.values()),
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "invalidated_versions": self.invalidated,
+                "tools": tools,
+            }
+
+    def clear(self) -> int:
+        """Delete every entry; returns how many there were."""
+        with self.lock:
+            count = len(self._load_entries())
+            shutil.rmtree(self.root, ignore_errors=True)
+            self.entries = {}
+        return count
+
+    def register_resource(self, mcp, uri: str = STATS_URI):
+        """Serve stats() as a JSON MCP resource."""
+
+        @mcp.resource(uri, name="tool_cache_stats", mime_type="application/json")
+        def tool_cache_stats() -> str:
+            """Hit/miss counts, time saved and size of the tool result cache."""
+            return json.dumps(self.stats(), indent=2)
+
+        return tool_cache_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the MCP tool result cache.")
+    parser.add_argument("action", choices=["stats", "clear"])
+    parser.add_argument("--root", help=f"Cache root (default: {DEFAULT_ROOT})")
+    args = parser.parse_args()
+
+    cache = ToolCache(root=Path(args.root) if args.root else None)
+    if args.action == "clear":
+        print(f"Removed {cache.clear()} cached results from {cache.root}")
+        return
+    stats = cache.stats()
+    by_tool: Dict[str, List[int]] = {}
+    for path, (size, _) in cache._load_entries().items():
+        totals = by_tool.setdefault(path.parent.parent.name, [0, 0])
+        totals[0] += 1
+        totals[1] += size
+    for tool, (count, size) in sorted(by_tool.items()):
+        print(f"  {tool}: {count} entries, {size / 2**20:.1f} MB")
+    print(f"\nSummary:")
+    print(
+        f"  Entries: {stats['entries']}, "
+        f"{stats['bytes'] / 2**20:.1f} of {stats['max_bytes'] / 2**20:.0f} MB"
+    )
+    print(f"  Root: {stats['root']}")
+
+
+if __name__ == "__main__":
+    main()
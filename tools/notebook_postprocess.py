@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Fused Notebook Post-processing
+
+Replaces the per-notebook chain
+    extract_notebook_images.py -> preprocess_notebook.py ->
+    cp + personal_info_sanitizer.py -> benchmark_extractor.load_notebook
+with one command that parses the executed notebook once and, in a single pass
+over its cells, writes:
+1. notebooks/<tutorial>/images/                        (same file names as before)
+2. <tutorial>_execution_cleaned.ipynb                  (same bytes as preprocess_notebook.py)
+3. <tutorial>_execution_final.ipynb                    (same bytes as cp + sanitizer)
+4. <tutorial>_cell_outputs.idx                         (memory-mapped cell output index,
+                                                        see cell_output_index.py)
+
+`benchmark` builds a large seeded notebook fixture (or takes one), runs the old
+chain and the fused command, checks that their outputs are identical and
+reports the speedup.
+
+Usage:
+    python tools/notebook_postprocess.py run notebooks/<t>/<t>_execution_v1.ipynb notebooks/<t>
+    python tools/notebook_postprocess.py benchmark --cells 300 --image-kb 200
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from cell_output_index import write_index
+from extract_notebook_images import save_output_image
+from json_backend import dumps, load_path, loads
+from personal_info_sanitizer import PersonalInfoSanitizer
+from preprocess_notebook import clean_cell
+
+TOOLS_DIR = Path(__file__).resolve().parent
+
+
+def output_paths(tutorial_dir: Path, tutorial: str) -> Dict[str, Path]:
+    return {
+        "images": tutorial_dir / "images",
+        "cleaned": tutorial_dir / f"{tutorial}_execution_cleaned.ipynb",
+        "final": tutorial_dir / f"{tutorial}_execution_final.ipynb",
+        "index": tutorial_dir / f"{tutorial}_cell_outputs.idx",
+    }
+
+
+def postprocess_notebook(
+    notebook_path: Path,
+    tutorial_dir: Path,
+    tutorial: Optional[str] = None,
+    config_path: Optional[Path] = None,
+    max_text_len: int = 2000,
+    compact: bool = False,
+) -> Dict[str, Any]:
+    """Produce images, cleaned and final notebooks and the output index in one pass."""
+    tutorial = tutorial or tutorial_dir.name
+    paths = output_paths(tutorial_dir, tutorial)
+    paths["images"].mkdir(parents=True, exist_ok=True)
+
+    nb = load_path(notebook_path)
+
+    image_count = 0
+    new_cells = []
+    for cell_idx, cell in enumerate(nb.get("cells", [])):
+        for output_idx, output in enumerate(cell.get("outputs", [])):
+            image_count = save_output_image(
+                output, cell_idx, output_idx, image_count, paths["images"]
+            )
+        new_cell = clean_cell(cell, max_text_len)
+        if new_cell is not None:
+            new_cells.append(new_cell)
+    nb["cells"] = new_cells
+
+    cleaned_text = dumps(nb, indent=None if compact else 2, ensure_ascii=True)
+    with open(paths["cleaned"], "w", encoding="utf-8") as f:
+        f.write(cleaned_text)
+
+    sanitizer = PersonalInfoSanitizer(config_path or Path(".paper2agent-sanitize.yaml"))
+    final_text, replacements = sanitizer.sanitize_code(cleaned_text)
+    with open(paths["final"], "w", encoding="utf-8") as f:
+        f.write(final_text)
+
+    # Sanitizing can change output text, so index what the final notebook holds.
+    # Only the small image-free notebook is parsed a second time.
+    final_nb = loads(final_text) if replacements else nb
+    write_index(final_nb, paths["index"])
+
+    return {
+        "image_count": image_count,
+        "cells": len(new_cells),
+        "replacements": replacements,
+        **{name: str(path) for name, path in paths.items()},
+    }
+
+
+def make_fixture(path: Path, cells: int, image_kb: int, seed: int = 0):
+    """Write a large executed-notebook fixture (benchmarks/generators.py) with images."""
+    sys.path.insert(0, str(TOOLS_DIR.parent / "benchmarks"))
+    from generators import make_notebook
+
+    nb = make_notebook(cells=cells, output_lines=50, images=cells // 2, image_kb=image_kb, seed=seed)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(nb, f, indent=1)
+
+
+def run_chain(notebook: Path, tutorial_dir: Path, tutorial: str, cwd: Path):
+    """The separate tools as the pipeline invokes them (one process each)."""
+    paths = output_paths(tutorial_dir, tutorial)
+    python = sys.executable
+    for tool, output in (
+        ("extract_notebook_images.py", paths["images"]),
+        ("preprocess_notebook.py", paths["cleaned"]),
+    ):
+        subprocess.run(
+            [python, str(TOOLS_DIR / tool), str(notebook), str(output)],
+            cwd=str(cwd),
+            check=True,
+            capture_output=True,
+        )
+    shutil.copyfile(paths["cleaned"], paths["final"])
+    subprocess.run(
+        [python, str(TOOLS_DIR / "personal_info_sanitizer.py"), str(paths["final"])],
+        cwd=str(cwd),
+        check=True,
+        capture_output=True,
+    )
+    # Stands in for benchmark_extractor.load_notebook on the final notebook
+    subprocess.run(
+        [
+            python,
+            str(TOOLS_DIR / "cell_output_index.py"),
+            "build",
+            str(paths["final"]),
+            str(paths["index"]),
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+
+def run_fused(notebook: Path, tutorial_dir: Path, tutorial: str, cwd: Path):
+    subprocess.run(
+        [
+            sys.executable,
+            str(Path(__file__).resolve()),
+            "run",
+            str(notebook),
+            str(tutorial_dir),
+            "--name",
+            tutorial,
+        ],
+        cwd=str(cwd),
+        check=True,
+        capture_output=True,
+    )
+
+
+def tree_contents(root: Path) -> Dict[str, bytes]:
+    return {
+        p.relative_to(root).as_posix(): p.read_bytes()
+        for p in sorted(root.rglob("*"))
+        if p.is_file()
+    }
+
+
+def benchmark(args: argparse.Namespace):
+    work = Path(tempfile.mkdtemp(prefix="nb_postprocess_"))
+    try:
+        if args.notebook:
+            notebook = Path(args.notebook).resolve()
+        else:
+            notebook = work / "fixture.ipynb"
+            make_fixture(notebook, args.cells, args.image_kb, args.seed)
+        size_mb = notebook.stat().st_size / (1024 * 1024)
+        print(f"Notebook: {notebook} ({size_mb:.1f} MB)", file=sys.stderr)
+
+        timings: Dict[str, list] = {
+            mode: [] for mode in ("chain", "fused", "chain_inprocess", "fused_inprocess")
+        }
+        for _ in range(args.repeat):
+            for mode, runner in (("chain", run_chain), ("fused", run_fused)):
+                out = work / mode / "tutorial"
+                shutil.rmtree(out.parent, ignore_errors=True)
+                out.mkdir(parents=True)
+                start = time.perf_counter()
+                runner(notebook, out, "tutorial", work)
+                timings[mode].append(time.perf_counter() - start)
+
+            # Same work without interpreter start-up: isolates the parsing cost
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), \
+                    contextlib.redirect_stderr(devnull):
+                out = work / "inprocess"
+                shutil.rmtree(out, ignore_errors=True)
+                out.mkdir()
+                start = time.perf_counter()
+                inprocess_chain(notebook, out, work)
+                timings["chain_inprocess"].append(time.perf_counter() - start)
+                shutil.rmtree(out)
+                out.mkdir()
+                start = time.perf_counter()
+                postprocess_notebook(notebook, out, "tutorial", work / ".paper2agent-sanitize.yaml")
+                timings["fused_inprocess"].append(time.perf_counter() - start)
+    finally:
+        identical = (work / "chain").exists() and tree_contents(work / "chain") == tree_contents(
+            work / "fused"
+        )
+        shutil.rmtree(work, ignore_errors=True)
+
+    best = {mode: min(values) for mode, values in timings.items()}
+    report = {
+        "notebook_mb": round(size_mb, 2),
+        "repeat": args.repeat,
+        "outputs_identical": identical,
+        "best_seconds": {mode: round(v, 4) for mode, v in best.items()},
+        "speedup": round(best["chain"] / best["fused"], 2),
+        "speedup_inprocess": round(best["chain_inprocess"] / best["fused_inprocess"], 2),
+    }
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    print(f"\nPost-processing Benchmark ({size_mb:.1f} MB notebook, best of {args.repeat}):")
+    print(f"  Chain (4 tools):  {best['chain']:.2f}s   in-process {best['chain_inprocess']:.2f}s")
+    print(f"  Fused:            {best['fused']:.2f}s   in-process {best['fused_inprocess']:.2f}s")
+    print(f"  Speedup:          {report['speedup']:.2f}x   in-process {report['speedup_inprocess']:.2f}x")
+    print(f"  Outputs identical: {identical}")
+    if not identical:
+        sys.exit(1)
+
+
+def inprocess_chain(notebook: Path, out: Path, cwd: Path):
+    """The old chain's work in this process: four separate parses of the notebook."""
+    from benchmark_extractor import load_notebook
+    from extract_notebook_images import extract_images_from_notebook
+    from preprocess_notebook import preprocess_notebook
+
+    paths = output_paths(out, "tutorial")
+    extract_images_from_notebook(str(notebook), str(paths["images"]))
+    preprocess_notebook(str(notebook), str(paths["cleaned"]))
+    shutil.copyfile(paths["cleaned"], paths["final"])
+    PersonalInfoSanitizer(cwd / ".paper2agent-sanitize.yaml").sanitize_file(paths["final"])
+    write_index(load_notebook(str(paths["final"])), paths["index"])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Post-process an executed notebook in a single parse."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Write images, cleaned/final notebooks and output index")
+    run.add_argument("notebook", help="Executed notebook (e.g. <t>_execution_v1.ipynb)")
+    run.add_argument("tutorial_dir", help="notebooks/<tutorial> directory")
+    run.add_argument("--name", help="Tutorial name (default: tutorial_dir name)")
+    run.add_argument(
+        "--config", type=Path, help="Sanitizer config (default: ./.paper2agent-sanitize.yaml)"
+    )
+    run.add_argument("--max_len", type=int, default=2000, help="Max chars for text output")
+    run.add_argument(
+        "--compact", action="store_true", help="Write notebooks without indentation"
+    )
+
+    bench = sub.add_parser("benchmark", help="Compare with the separate tools")
+    bench.add_argument("--notebook", help="Notebook to use instead of a generated fixture")
+    bench.add_argument("--cells", type=int, default=300, help="Fixture cells")
+    bench.add_argument("--image-kb", type=int, default=200, help="Fixture image size")
+    bench.add_argument("--seed", type=int, default=0, help="Fixture seed")
+    bench.add_argument("--repeat", type=int, default=3, help="Runs per mode")
+    bench.add_argument("--output", help="Write the JSON report here")
+
+    args = parser.parse_args()
+    if args.command == "benchmark":
+        benchmark(args)
+        return
+
+    notebook = Path(args.notebook)
+    if not notebook.exists():
+        print(f"Error: {notebook} does not exist", file=sys.stderr)
+        sys.exit(1)
+    try:
+        result = postprocess_notebook(
+            notebook, Path(args.tutorial_dir), args.name, args.config, args.max_len,
+            args.compact,
+        )
+    except (OSError, ValueError) as e:
+        print(f"Error post-processing {notebook}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Images: {result['image_count']} -> {result['images']}")
+    print(f"Cleaned notebook: {result['cleaned']}")
+    print(f"Final notebook: {result['final']} ({len(result['replacements'])} replacements)")
+    print(f"Cell output index: {result['index']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -250,7 +250,7 @@ def main():
     )
     parser.add_argument(
         'target',
-        help='Python file or directory to sanitize'
+        help='Python file, notebook or directory to sanitize'
     )
     parser.add_argument(
         '--config', '-c',
@@ -281,8 +281,8 @@ def main():
     all_replacements = []
     
     if target.is_file():
-        if target.suffix != '.py':
-            print(f"Error: {target} is not a Python file", file=sys.stderr)
+        if target.suffix not in ('.py', '.ipynb'):
+            print(f"Error: {target} is not a Python file or notebook", file=sys.stderr)
             sys.exit(1)
         
         success, replacements = sanitizer.sanitize_file(target)
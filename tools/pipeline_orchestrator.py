@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+"""
+Pipeline Orchestrator
+
+Runs the project pipeline as a DAG instead of one script at a time:
+1. Builds nodes for scripts/01-03 (and 06 with --launch-mcp).
+2. Adds a post-processing node (notebook_postprocess.py: images, cleaned and
+   sanitized final notebook, cell output index) and a benchmark validation
+   node for every executed tutorial under notebooks/.
+3. Runs each node as soon as its dependencies have finished, with at most
+   --workers nodes in flight.
+4. Skips per-tutorial nodes whose content-hash marker (see stage_marker.py)
+   still matches their inputs and outputs.
+5. Appends per-node timing to .pipeline/run_log.jsonl and reports the
+   critical path so the wall time can be compared with the sum of all steps.
+"""
+
+import os
+import re
+import sys
+import csv
+import json
+import time
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import stage_marker
+
+TOOLS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = TOOLS_DIR.parent
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+POSTPROCESS_TOOLS = [
+    "notebook_postprocess.py",
+    "extract_notebook_images.py",
+    "preprocess_notebook.py",
+    "personal_info_sanitizer.py",
+    "benchmark_extractor.py",
+    "cell_output_index.py",
+]
+
+
+class Node:
+    """A single unit of work in the pipeline DAG."""
+
+    def __init__(
+        self,
+        name: str,
+        cmd: Optional[List[str]] = None,
+        func: Optional[Callable[[], None]] = None,
+        deps: Optional[List[str]] = None,
+        cwd: Optional[Path] = None,
+        inputs: Optional[List[Path]] = None,
+        outputs: Optional[List[Path]] = None,
+    ):
+        self.name = name
+        self.cmd = cmd
+        self.func = func
+        self.deps = deps or []
+        self.cwd = cwd
+        # Nodes with declared inputs/outputs are skipped while their marker matches
+        self.inputs = inputs
+        self.outputs = outputs or []
+        self.status = "pending"
+        self.duration = 0.0
+        self.returncode: Optional[int] = None
+
+    def run(self) -> Tuple[int, str]:
+        """Execute the node and return (returncode, stderr tail)."""
+        if self.func is not None:
+            try:
+                self.func()
+                return 0, ""
+            except Exception as e:
+                return 1, str(e)
+
+        result = subprocess.run(
+            self.cmd,
+            cwd=str(self.cwd) if self.cwd else None,
+            capture_output=True,
+            text=True,
+        )
+        return result.returncode, result.stderr[-2000:]
+
+
+class Pipeline:
+    """Dependency graph of nodes with a bounded concurrent scheduler."""
+
+    def __init__(self, log_path: Path, workers: int = 4, force: bool = False):
+        self.nodes: Dict[str, Node] = {}
+        self.log_path = log_path
+        self.marker_dir = log_path.parent / "nodes"
+        self.workers = max(1, workers)
+        self.force = force
+
+    def add(self, node: Node) -> Node:
+        if node.name in self.nodes:
+            raise ValueError(f"Duplicate pipeline node: {node.name}")
+        self.nodes[node.name] = node
+        return node
+
+    def validate(self):
+        """Check that all dependencies exist and the graph has no cycles."""
+        for node in self.nodes.values():
+            for dep in node.deps:
+                if dep not in self.nodes:
+                    raise ValueError(f"Node {node.name} depends on unknown node {dep}")
+        self.topological_order()
+
+    def topological_order(self) -> List[str]:
+        indegree = {name: len(node.deps) for name, node in self.nodes.items()}
+        dependents = self._dependents()
+        ready = sorted(name for name, count in indegree.items() if count == 0)
+        order = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for child in dependents[name]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+        if len(order) != len(self.nodes):
+            cyclic = sorted(set(self.nodes) - set(order))
+            raise ValueError(f"Pipeline has a dependency cycle involving: {cyclic}")
+        return order
+
+    def _dependents(self) -> Dict[str, List[str]]:
+        dependents: Dict[str, List[str]] = {name: [] for name in self.nodes}
+        for node in self.nodes.values():
+            for dep in node.deps:
+                dependents[dep].append(node.name)
+        return dependents
+
+    def _log(self, node: Node, started: float, message: str = ""):
+        entry = {
+            "node": node.name,
+            "status": node.status,
+            "returncode": node.returncode,
+            "started_at": round(started, 3),
+            "duration_seconds": round(node.duration, 3),
+        }
+        if message:
+            entry["message"] = message
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def run(self) -> bool:
+        """Run all nodes, returning True if every node succeeded."""
+        self.validate()
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        remaining = {name: set(node.deps) for name, node in self.nodes.items()}
+        dependents = self._dependents()
+        running = {}
+
+        def timed(node: Node):
+            started = time.time()
+            marker = self.marker_dir / (node.name.replace(":", "__") + ".json")
+            fingerprint = None
+            if node.inputs is not None:
+                fingerprint = stage_marker.fingerprint(
+                    [str(p) for p in node.inputs], outputs=[str(p) for p in node.outputs]
+                )
+                if not self.force and stage_marker.check_marker(marker, fingerprint)[0]:
+                    return started, time.time() - started, None, ""
+            returncode, message = node.run()
+            if returncode == 0 and fingerprint is not None:
+                stage_marker.record_marker(
+                    marker,
+                    stage_marker.fingerprint(
+                        [str(p) for p in node.inputs],
+                        outputs=[str(p) for p in node.outputs],
+                    ),
+                    stage=node.name,
+                )
+            return started, time.time() - started, returncode, message
+
+        def skip(name: str):
+            for child in dependents[name]:
+                child_node = self.nodes[child]
+                if child_node.status == "pending":
+                    child_node.status = "skipped"
+                    remaining.pop(child, None)
+                    self._log(child_node, time.time(), f"dependency {name} failed")
+                    print(f"[skip] {child} (dependency {name} failed)", file=sys.stderr)
+                    skip(child)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while remaining or running:
+                ready = sorted(name for name, deps in remaining.items() if not deps)
+                for name in ready:
+                    del remaining[name]
+                    node = self.nodes[name]
+                    node.status = "running"
+                    print(f"[start] {name}", file=sys.stderr)
+                    running[pool.submit(timed, node)] = node
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    started, node.duration, node.returncode, message = future.result()
+                    if node.returncode is None:
+                        node.status = "cached"
+                    else:
+                        node.status = "done" if node.returncode == 0 else "failed"
+                    self._log(node, started, message if node.status == "failed" else "")
+                    print(
+                        f"[{node.status}] {node.name} ({node.duration:.2f}s)",
+                        file=sys.stderr,
+                    )
+                    if node.status in ("done", "cached"):
+                        for child in dependents[node.name]:
+                            if child in remaining:
+                                remaining[child].discard(node.name)
+                    else:
+                        if message:
+                            print(message.rstrip(), file=sys.stderr)
+                        skip(node.name)
+
+        return all(node.status in ("done", "cached") for node in self.nodes.values())
+
+    def critical_path(self) -> Tuple[float, List[str]]:
+        """Return the longest dependency chain by measured duration."""
+        best: Dict[str, Tuple[float, List[str]]] = {}
+        for name in self.topological_order():
+            node = self.nodes[name]
+            prev = max(
+                (best[dep] for dep in node.deps), key=lambda x: x[0], default=(0.0, [])
+            )
+            best[name] = (prev[0] + node.duration, prev[1] + [name])
+        return max(best.values(), key=lambda x: x[0], default=(0.0, []))
+
+
+def find_source_notebook(tutorial_dir: Path, tutorial: str) -> Optional[Path]:
+    """Return the latest execution notebook (highest _v<N>, else the plain one)."""
+    versions = []
+    for path in tutorial_dir.glob(f"{tutorial}_execution_v*.ipynb"):
+        match = re.search(r"_execution_v(\d+)\.ipynb$", path.name)
+        if match:
+            versions.append((int(match.group(1)), path))
+    if versions:
+        return max(versions)[1]
+    plain = tutorial_dir / f"{tutorial}_execution.ipynb"
+    return plain if plain.exists() else None
+
+
+def discover_tutorials(project_dir: Path) -> List[str]:
+    """List tutorials from reports/executed_notebooks.json or notebooks/*/."""
+    report = project_dir / "reports" / "executed_notebooks.json"
+    tutorials = []
+    if report.exists():
+        with open(report, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for entry in data.values():
+            path = entry.get("execution_path", "") if isinstance(entry, dict) else ""
+            if path:
+                tutorials.append(Path(path).parent.name)
+    notebooks_dir = project_dir / "notebooks"
+    if notebooks_dir.is_dir():
+        for child in sorted(notebooks_dir.iterdir()):
+            if child.is_dir() and child.name not in tutorials:
+                tutorials.append(child.name)
+    return tutorials
+
+
+def validate_questions(
+    notebook: Path, questions_json: Path, questions_csv: Path, index: Optional[Path] = None
+):
+    """Run benchmark_extractor into a fresh per-tutorial CSV."""
+    # benchmark_extractor appends, so drop rows from a previous run first
+    questions_csv.unlink(missing_ok=True)
+    result = subprocess.run(
+        [
+            sys.executable,
+            str(TOOLS_DIR / "benchmark_extractor.py"),
+            *(["--index", str(index)] if index else ["--notebook", str(notebook)]),
+            "--questions",
+            str(questions_json),
+            "--output",
+            str(questions_csv),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+
+
+def merge_csvs(parts: List[Path], output_path: Path):
+    """Concatenate per-tutorial question CSVs into one file."""
+    rows = []
+    fieldnames: List[str] = []
+    for part in parts:
+        if not part.exists():
+            continue
+        with open(part, "r", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for field in reader.fieldnames or []:
+                if field not in fieldnames:
+                    fieldnames.append(field)
+            rows.extend(reader)
+    if not fieldnames:
+        return
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def build_pipeline(args: argparse.Namespace) -> Pipeline:
+    project_dir = Path(args.project_dir).resolve()
+    python = sys.executable
+    pipeline = Pipeline(
+        project_dir / ".pipeline" / "run_log.jsonl", args.workers, args.force
+    )
+
+    setup_deps: List[str] = []
+    if not args.skip_setup:
+        pipeline.add(
+            Node(
+                "01_setup",
+                cmd=[
+                    "bash",
+                    str(SCRIPTS_DIR / "01_setup_project.sh"),
+                    str(REPO_ROOT),
+                    os.path.relpath(project_dir, REPO_ROOT),
+                ],
+            )
+        )
+        pipeline.add(
+            Node(
+                "03_folders",
+                cmd=["bash", str(SCRIPTS_DIR / "03_prepare_folders.sh"), str(project_dir)],
+                deps=["01_setup"],
+            )
+        )
+        setup_deps = ["03_folders"]
+        if args.repo_url:
+            pipeline.add(
+                Node(
+                    "02_clone",
+                    cmd=[
+                        "bash",
+                        str(SCRIPTS_DIR / "02_clone_repo.sh"),
+                        str(project_dir),
+                        args.repo_url,
+                    ],
+                    deps=["01_setup"],
+                )
+            )
+
+    questions_dir = project_dir / args.questions_dir
+    final_nodes: List[str] = []
+    question_csvs: List[Path] = []
+    validate_nodes: List[str] = []
+
+    for tutorial in discover_tutorials(project_dir):
+        tutorial_dir = project_dir / "notebooks" / tutorial
+        final = tutorial_dir / f"{tutorial}_execution_final.ipynb"
+        index = tutorial_dir / f"{tutorial}_cell_outputs.idx"
+        source = find_source_notebook(tutorial_dir, tutorial)
+
+        if source is not None:
+            # One parse of the executed notebook yields every derived output
+            pipeline.add(
+                Node(
+                    f"postprocess:{tutorial}",
+                    cmd=[
+                        python,
+                        str(TOOLS_DIR / "notebook_postprocess.py"),
+                        "run",
+                        str(source),
+                        str(tutorial_dir),
+                        "--name",
+                        tutorial,
+                    ],
+                    deps=list(setup_deps),
+                    cwd=project_dir,
+                    inputs=[source, project_dir / ".paper2agent-sanitize.yaml"]
+                    + [TOOLS_DIR / name for name in POSTPROCESS_TOOLS],
+                    outputs=[
+                        tutorial_dir / "images",
+                        tutorial_dir / f"{tutorial}_execution_cleaned.ipynb",
+                        final,
+                        index,
+                    ],
+                )
+            )
+            final_node = f"postprocess:{tutorial}"
+        elif final.exists():
+            index = None
+            pipeline.add(
+                Node(
+                    f"images:{tutorial}",
+                    cmd=[
+                        python,
+                        str(TOOLS_DIR / "extract_notebook_images.py"),
+                        str(final),
+                        str(tutorial_dir / "images"),
+                    ],
+                    deps=list(setup_deps),
+                    inputs=[final, TOOLS_DIR / "extract_notebook_images.py"],
+                    outputs=[tutorial_dir / "images"],
+                )
+            )
+            final_node = f"images:{tutorial}"
+        else:
+            print(f"Warning: no executed notebook found for {tutorial}", file=sys.stderr)
+            continue
+        final_nodes.append(final_node)
+
+        questions_json = questions_dir / f"{tutorial}_questions.json"
+        if questions_json.exists():
+            questions_csv = questions_dir / f"{tutorial}_questions.csv"
+            pipeline.add(
+                Node(
+                    f"validate:{tutorial}",
+                    func=lambda nb=final, qs=questions_json, out=questions_csv, idx=index: (
+                        validate_questions(nb, qs, out, idx)
+                    ),
+                    deps=[final_node],
+                    inputs=[
+                        index or final,
+                        questions_json,
+                        TOOLS_DIR / "benchmark_extractor.py",
+                    ],
+                    outputs=[questions_csv],
+                )
+            )
+            question_csvs.append(questions_csv)
+            validate_nodes.append(f"validate:{tutorial}")
+
+    if validate_nodes:
+        pipeline.add(
+            Node(
+                "benchmark_merge",
+                func=lambda: merge_csvs(
+                    question_csvs, questions_dir / "benchmark_questions.csv"
+                ),
+                deps=validate_nodes,
+                inputs=list(question_csvs),
+                outputs=[questions_dir / "benchmark_questions.csv"],
+            )
+        )
+        final_nodes.append("benchmark_merge")
+
+    if args.launch_mcp:
+        repo_name = args.repo_name or (
+            os.path.basename(args.repo_url).removesuffix(".git") if args.repo_url else ""
+        )
+        if not repo_name:
+            raise ValueError("--launch-mcp requires --repo-name or --repo-url")
+        mcp_deps = final_nodes + setup_deps
+        if "02_clone" in pipeline.nodes:
+            mcp_deps.append("02_clone")
+        pipeline.add(
+            Node(
+                "06_launch_mcp",
+                cmd=[
+                    "bash",
+                    str(SCRIPTS_DIR / "06_launch_mcp.sh"),
+                    str(project_dir),
+                    repo_name,
+                ],
+                deps=mcp_deps,
+            )
+        )
+
+    return pipeline
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the project setup scripts and per-tutorial tools as a DAG."
+    )
+    parser.add_argument("project_dir", help="Project directory (e.g. ./panpipes-mcp)")
+    parser.add_argument("--repo-url", help="GitHub repository URL for scripts/02")
+    parser.add_argument("--repo-name", help="Repository name for scripts/06")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 4, help="Max concurrent nodes"
+    )
+    parser.add_argument(
+        "--questions-dir",
+        default="reports/benchmark",
+        help="Directory holding <tutorial>_questions.json files (relative to project)",
+    )
+    parser.add_argument(
+        "--skip-setup", action="store_true", help="Only run the per-tutorial nodes"
+    )
+    parser.add_argument(
+        "--launch-mcp", action="store_true", help="Run scripts/06 after all other nodes"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Rerun nodes even if their markers match"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Print the execution order and exit"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        pipeline = build_pipeline(args)
+        pipeline.validate()
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.dry_run:
+        for name in pipeline.topological_order():
+            deps = ", ".join(pipeline.nodes[name].deps) or "-"
+            print(f"{name}  <- {deps}")
+        return
+
+    start_time = time.time()
+    success = pipeline.run()
+    wall_time = time.time() - start_time
+
+    total = sum(node.duration for node in pipeline.nodes.values())
+    path_time, path = pipeline.critical_path()
+    print(f"\nPipeline Summary:")
+    cached = sum(1 for node in pipeline.nodes.values() if node.status == "cached")
+    print(f"  Nodes: {len(pipeline.nodes)} ({cached} up to date)")
+    print(f"  Wall time: {wall_time:.2f}s")
+    print(f"  Sum of node times: {total:.2f}s")
+    print(f"  Critical path: {path_time:.2f}s ({' -> '.join(path)})")
+    print(f"  Run log: {pipeline.log_path}")
+
+    if not success:
+        failed = [
+            n.name for n in pipeline.nodes.values() if n.status not in ("done", "cached")
+        ]
+        print(f"  Failed/skipped: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,595 @@
+#!/usr/bin/env python3
+"""
+Repository indexer for the Step 1 tutorial scanner.
+
+Instead of having the scanner agent walk repo/<name>/ and open candidate files
+one at a time, this script:
+1. Lists the repository files the way git sees them (`git ls-files --cached
+   --others --exclude-standard`, so .gitignore is respected); outside a git
+   checkout it walks the tree and applies the .gitignore patterns itself.
+2. Extracts cheap features from every .ipynb/.py/.md file in a process pool:
+   size, cell counts, output presence, imports, headings and title, fenced
+   code blocks, links from docs/ pages.
+3. Writes a compact JSON index keyed by the git tree hash of the checkout
+   (plus a digest of uncommitted changes). A rerun on the same tree reuses it
+   without reading any file; after changes only modified files are re-read.
+4. Ranks the candidates with the scanner's own rules (docs/ first, notebooks
+   and Markdown before scripts, templates/ and legacy files excluded, tests
+   and benchmarks penalized) and writes the shortlist the agent reads first.
+
+The score only orders the reading; the agent still reads every file it
+classifies end-to-end.
+
+Usage:
+    python tools/repo_indexer.py build repo/<name> --top 40
+    python tools/repo_indexer.py build repo/<name> --filter clustering.ipynb
+    python tools/repo_indexer.py show reports/repo_index.json --top 20
+"""
+
+import os
+import re
+import sys
+import time
+import fnmatch
+import hashlib
+import argparse
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from json_backend import dump_path, dumps, load_path, loads
+
+INDEX_VERSION = 1
+INDEX = Path("reports") / "repo_index.json"
+SHORTLIST = Path("reports") / "tutorial-candidates.json"
+SUFFIXES = {".ipynb": "notebook", ".md": "markdown", ".py": "script"}
+# Reference-only: docs/ pages that link to tutorials (Sphinx toctrees)
+DOC_SUFFIXES = {".rst"}
+# Directories skipped when walking without git
+SKIP_DIRS = {".git", ".hg", ".svn", "__pycache__", ".ipynb_checkpoints", "node_modules", ".tox", ".venv"}
+MAX_BYTES = 64 * 1024 * 1024
+MAX_HEADINGS = 20
+
+IMPORT_RE = re.compile(
+    r"^[ \t]*(?:from[ \t]+([A-Za-z_][\w.]*)[ \t]+import|import[ \t]+([A-Za-z_][\w., \t]*))", re.M
+)
+HEADING_RE = re.compile(r"^[ \t]{0,3}(#{1,6})[ \t]+(.+?)[ \t]*#*[ \t]*$", re.M)
+FENCE_RE = re.compile(r"^\s*(```|~~~)\s*\{?([\w+-]*)", re.M)
+MD_LINK_RE = re.compile(r"\]\(\s*<?([^)#\s>]+)")
+RST_REF_RE = re.compile(r":doc:`(?:[^`<]*<)?([^`>]+)>?`|^[ \t]{2,}([\w./-]+)[ \t]*$", re.M)
+PY_DEF_RE = re.compile(r"^(?:async\s+)?def\s+\w+|^class\s+\w+", re.M)
+PY_MAIN_RE = re.compile(r"^if\s+__name__\s*==\s*['\"]__main__['\"]", re.M)
+PY_CELL_RE = re.compile(r"^#\s*(?:%%|In\[)", re.M)
+PY_MD_HEADING_RE = re.compile(r"^#[ \t]+(#{1,6})[ \t]+(.+?)[ \t]*$", re.M)
+
+TUTORIAL_WORDS = re.compile(
+    r"tutorial|example|vignette|guide|walkthrough|quickstart|quick[-_]start|getting[-_]started|demo|notebook|usage",
+    re.I,
+)
+LEGACY_WORDS = re.compile(r"(?:^|[^a-z])(legacy|deprecated|outdated|old)(?:[^a-z]|$)", re.I)
+TEST_DIRS = {"test", "tests", "testing", "benchmark", "benchmarks", "bench", "perf", "ci", ".github"}
+PROJECT_FILES = re.compile(
+    r"^(changelog|changes|history|contributing|code_of_conduct|license|authors|security|news|release)",
+    re.I,
+)
+
+
+def git(repo_dir: Path, *args: str) -> Optional[str]:
+    """Output of a git command in repo_dir, or None if it fails (or git is missing)."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(repo_dir), *args], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout
+
+
+def _ignore_patterns(directory: Path) -> List[Tuple[str, bool, bool]]:
+    """(pattern, directory only, anchored) for each rule of directory/.gitignore."""
+    path = directory / ".gitignore"
+    if not path.is_file():
+        return []
+    rules = []
+    for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+        line = line.strip()
+        # Negation is rare enough in tutorial repos to not be worth emulating
+        if not line or line.startswith("#") or line.startswith("!"):
+            continue
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        anchored = "/" in line
+        rules.append((line.lstrip("/"), dir_only, anchored))
+    return rules
+
+
+def _ignored(rel: str, is_dir: bool, rules: List[Tuple[str, str, bool, bool]]) -> bool:
+    for base, pattern, dir_only, anchored in rules:
+        if dir_only and not is_dir:
+            continue
+        if base and not rel.startswith(base + "/"):
+            continue
+        sub = rel[len(base) + 1 :] if base else rel
+        if anchored:
+            if fnmatch.fnmatchcase(sub, pattern):
+                return True
+        elif fnmatch.fnmatchcase(sub.rsplit("/", 1)[-1], pattern):
+            return True
+    return False
+
+
+def walk_files(repo_dir: Path) -> List[str]:
+    """Files under repo_dir not excluded by the .gitignore files on the way (no git needed)."""
+    files = []
+    rules: List[Tuple[str, str, bool, bool]] = []
+    for root, dirs, names in os.walk(repo_dir):
+        rel_root = os.path.relpath(root, repo_dir).replace(os.sep, "/")
+        rel_root = "" if rel_root == "." else rel_root
+        rules += [(rel_root, *rule) for rule in _ignore_patterns(Path(root))]
+        dirs[:] = sorted(
+            d
+            for d in dirs
+            if d not in SKIP_DIRS and not _ignored(f"{rel_root}/{d}".lstrip("/"), True, rules)
+        )
+        for name in names:
+            rel = f"{rel_root}/{name}".lstrip("/")
+            if not _ignored(rel, False, rules):
+                files.append(rel)
+    return sorted(files)
+
+
+def list_files(repo_dir: Path) -> Tuple[List[str], bool]:
+    """Repository-relative paths of all non-ignored files, and whether git listed them."""
+    out = git(repo_dir, "ls-files", "-z", "--cached", "--others", "--exclude-standard")
+    if out is None:
+        return walk_files(repo_dir), False
+    # Deleted-but-tracked files are still listed by --cached
+    paths = sorted({p for p in out.split("\0") if p and (repo_dir / p).is_file()})
+    return paths, True
+
+
+def tree_key(repo_dir: Path, files: List[str]) -> str:
+    """
+    Cache key of the checkout's content.
+
+    The tree hash of HEAD for repo_dir, plus a digest of `git status` and the
+    size/mtime of every changed file when the work tree is dirty. Outside git,
+    a digest of the size/mtime of every candidate file.
+    """
+    prefix = (git(repo_dir, "rev-parse", "--show-prefix") or "").strip()
+    tree = git(repo_dir, "rev-parse", f"HEAD:{prefix}")
+    if tree is None:
+        digest = hashlib.sha256()
+        for rel in files:
+            stat = (repo_dir / rel).stat()
+            digest.update(f"{rel}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+        return f"walk:{digest.hexdigest()[:16]}"
+
+    key = f"tree:{tree.strip()}"
+    status = git(repo_dir, "status", "--porcelain", "-z", "--untracked-files=all", ".") or ""
+    if status:
+        # Status paths are relative to the top of the work tree
+        top = Path((git(repo_dir, "rev-parse", "--show-toplevel") or str(repo_dir)).strip())
+        digest = hashlib.sha256(status.encode())
+        for entry in status.split("\0"):
+            path = top.joinpath(*entry[3:].split("/")) if len(entry) > 3 else None
+            if path is not None and path.is_file():
+                stat = path.stat()
+                digest.update(f"{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+        key += f"+dirty:{digest.hexdigest()[:16]}"
+    return key
+
+
+def _imports(code: str) -> Set[str]:
+    modules = set()
+    for from_module, import_list in IMPORT_RE.findall(code):
+        if from_module:
+            modules.add(from_module.split(".")[0])
+        else:
+            for name in import_list.split(","):
+                name = name.strip().split(" ")[0]
+                if name:
+                    modules.add(name.split(".")[0])
+    return modules
+
+
+def _headings(text: str, regex=HEADING_RE) -> List[str]:
+    return [title.strip() for _, title in regex.findall(text)][:MAX_HEADINGS]
+
+
+def _code_blocks(text: str) -> Tuple[int, int, str]:
+    """Fenced code blocks, how many are Python, and the Python code itself."""
+    blocks = python = 0
+    code = []
+    lines = text.splitlines()
+    i = 0
+    while i < len(lines):
+        match = FENCE_RE.match(lines[i])
+        if not match:
+            i += 1
+            continue
+        fence, lang = match.group(1), match.group(2).lower()
+        j = i + 1
+        while j < len(lines) and not lines[j].lstrip().startswith(fence):
+            j += 1
+        blocks += 1
+        if lang in ("python", "py", "python3", "ipython", "ipython3", "code-cell", "jupyter-execute"):
+            python += 1
+            code.extend(lines[i + 1 : j])
+        i = j + 1
+    return blocks, python, "\n".join(code)
+
+
+def _links(text: str, rst: bool = False) -> Set[str]:
+    """Stems of the pages/notebooks a document links to."""
+    targets = MD_LINK_RE.findall(text)
+    if rst:
+        targets += [a or b for a, b in RST_REF_RE.findall(text)]
+    stems = set()
+    for target in targets:
+        if "://" in target or target.startswith("mailto:"):
+            continue
+        name = target.rstrip("/").rsplit("/", 1)[-1]
+        stem = name.rsplit(".", 1)[0] if "." in name else name
+        if stem:
+            stems.add(stem.lower())
+    return stems
+
+
+def notebook_features(data: bytes) -> Dict[str, Any]:
+    nb = loads(data)
+    cells = nb.get("cells", [])
+    code, markdown = [], []
+    output_cells = image_outputs = error_outputs = 0
+    for cell in cells:
+        source = cell.get("source", "")
+        source = "".join(source) if isinstance(source, list) else source
+        if cell.get("cell_type") == "code":
+            code.append(source)
+            outputs = cell.get("outputs") or []
+            if outputs:
+                output_cells += 1
+            for output in outputs:
+                if output.get("output_type") == "error":
+                    error_outputs += 1
+                if any(k.startswith("image/") for k in (output.get("data") or {})):
+                    image_outputs += 1
+        elif cell.get("cell_type") == "markdown":
+            markdown.append(source)
+    text = "\n".join(markdown)
+    headings = _headings(text)
+    kernel = (nb.get("metadata", {}).get("kernelspec") or {}).get("language")
+    return {
+        "title": headings[0] if headings else None,
+        "code_cells": len(code),
+        "markdown_cells": len(markdown),
+        "code_lines": sum(len(c.splitlines()) for c in code),
+        "output_cells": output_cells,
+        "image_outputs": image_outputs,
+        "error_outputs": error_outputs,
+        "language": kernel,
+        "imports": sorted(_imports("\n".join(code))),
+        "headings": headings,
+        "links": sorted(_links(text)),
+    }
+
+
+def markdown_features(text: str) -> Dict[str, Any]:
+    headings = _headings(re.sub(r"^\s*(```|~~~).*?^\s*\1", "", text, flags=re.M | re.S))
+    blocks, python, code = _code_blocks(text)
+    return {
+        "title": headings[0] if headings else None,
+        "code_blocks": blocks,
+        "python_blocks": python,
+        "imports": sorted(_imports(code)),
+        "headings": headings,
+        "links": sorted(_links(text)),
+    }
+
+
+def script_features(text: str) -> Dict[str, Any]:
+    headings = _headings(text, PY_MD_HEADING_RE)
+    docstring = re.match(r'\s*(?:#.*\n\s*)*[rRuU]?("""|\'\'\')\s*(.+)', text)
+    title = headings[0] if headings else (docstring.group(2).strip() if docstring else None)
+    return {
+        "title": title,
+        "lines": text.count("\n") + 1,
+        "definitions": len(PY_DEF_RE.findall(text)),
+        "main_guard": bool(PY_MAIN_RE.search(text)),
+        "cells": len(PY_CELL_RE.findall(text)),
+        "imports": sorted(_imports(text)),
+        "headings": headings,
+    }
+
+
+def extract(job: Tuple[str, str]) -> Dict[str, Any]:
+    """Features of one file (runs in a worker process)."""
+    repo_dir, rel = job
+    path = Path(repo_dir) / rel
+    stat = path.stat()
+    suffix = path.suffix.lower()
+    entry: Dict[str, Any] = {
+        "path": rel,
+        "type": SUFFIXES.get(suffix, "doc"),
+        "bytes": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+    if stat.st_size > MAX_BYTES:
+        entry["error"] = "too large to read"
+        return entry
+    try:
+        data = path.read_bytes()
+        if suffix == ".ipynb":
+            entry.update(notebook_features(data))
+        else:
+            text = data.decode("utf-8", errors="replace")
+            if suffix == ".md":
+                entry.update(markdown_features(text))
+            elif suffix == ".py":
+                entry.update(script_features(text))
+            else:
+                entry["links"] = sorted(_links(text, rst=True))
+    except (OSError, ValueError, AttributeError, TypeError) as e:
+        entry["error"] = f"{type(e).__name__}: {e}"
+    return entry
+
+
+def is_candidate(rel: str) -> bool:
+    suffix = Path(rel).suffix.lower()
+    if suffix in SUFFIXES:
+        return True
+    return suffix in DOC_SUFFIXES and rel.split("/", 1)[0] == "docs"
+
+
+def build_index(
+    repo_dir: Path,
+    previous: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Index every candidate file of repo_dir.
+
+    Returns `previous` untouched when the cache key still matches; otherwise
+    re-reads only files whose size or mtime changed since `previous`.
+    """
+    start = time.perf_counter()
+    files, used_git = list_files(repo_dir)
+    candidates = [rel for rel in files if is_candidate(rel)]
+    key = tree_key(repo_dir, candidates)
+    if previous and previous.get("version") == INDEX_VERSION and previous.get("key") == key:
+        previous["cached"] = True
+        return previous
+
+    known = {e["path"]: e for e in (previous or {}).get("files", [])}
+    entries: Dict[str, Dict[str, Any]] = {}
+    jobs = []
+    for rel in candidates:
+        old = known.get(rel)
+        stat = (repo_dir / rel).stat()
+        if old and old["bytes"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+            entries[rel] = old
+        else:
+            jobs.append((str(repo_dir), rel))
+
+    if len(jobs) > 16 and (workers is None or workers > 1):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for entry in pool.map(extract, jobs, chunksize=8):
+                entries[entry["path"]] = entry
+    else:
+        for job in jobs:
+            entry = extract(job)
+            entries[entry["path"]] = entry
+
+    # Top-level packages: directories with an __init__.py whose parent has none
+    inits = {rel for rel in files if rel == "__init__.py" or rel.endswith("/__init__.py")}
+    packages = sorted(
+        {
+            rel.split("/")[-2]
+            for rel in inits
+            if "/" in rel and os.path.join(os.path.dirname(os.path.dirname(rel)), "__init__.py") not in inits
+        }
+    )
+    return {
+        "version": INDEX_VERSION,
+        "key": key,
+        "repo": repo_dir.name,
+        "lister": "git" if used_git else "walk",
+        "total_files": len(files),
+        "packages": packages,
+        "read": len(jobs),
+        "seconds": round(time.perf_counter() - start, 3),
+        "cached": False,
+        "files": [entries[rel] for rel in sorted(entries)],
+    }
+
+
+def score_entry(
+    entry: Dict[str, Any], docs_links: Set[str], packages: Set[str]
+) -> Tuple[Optional[float], List[str]]:
+    """Scanner priority of one file and why; None for files the scanner must skip."""
+    rel = entry["path"]
+    parts = rel.lower().split("/")
+    name = Path(rel).stem
+    if "templates" in parts[:-1]:
+        return None, ["under templates/"]
+    if LEGACY_WORDS.search(rel.replace("_", " ").replace("-", " ")) or LEGACY_WORDS.search(
+        entry.get("title") or ""
+    ):
+        return None, ["legacy/deprecated/outdated/old"]
+    if "error" in entry:
+        return 0.0, [entry["error"]]
+
+    score, reasons = 0.0, []
+    if parts[0] == "docs":
+        score += 3
+        reasons.append("docs/")
+    if name.lower() in docs_links:
+        score += 2
+        reasons.append("linked from docs/")
+    if TUTORIAL_WORDS.search(rel):
+        score += 2
+        reasons.append("tutorial-like path")
+    if set(parts[:-1]) & TEST_DIRS or name.lower().startswith(("test_", "bench")) or name.endswith("_test"):
+        score -= 5
+        reasons.append("test/benchmark/CI path")
+
+    kind = entry["type"]
+    if kind == "notebook":
+        code, prose = entry["code_cells"], entry["markdown_cells"]
+        score += 1 + min(code, 40) / 10 + min(prose, 20) / 10
+        reasons.append(f"{code} code / {prose} markdown cells")
+        if entry["output_cells"]:
+            score += 1
+            reasons.append("executed outputs")
+        if entry["error_outputs"]:
+            score -= 1
+            reasons.append("error outputs")
+        if code < 2:
+            score -= 2
+    elif kind == "markdown":
+        python = entry["python_blocks"]
+        score += min(python, 20) / 5
+        reasons.append(f"{python} Python code blocks")
+        if PROJECT_FILES.match(name):
+            score -= 3
+            reasons.append("project file")
+        if python < 2:
+            score -= 2
+    else:
+        score += min(entry["definitions"], 20) / 10 + min(entry["cells"], 20) / 5
+        if entry["main_guard"]:
+            score += 0.5
+            reasons.append("__main__ guard")
+        if entry["cells"]:
+            reasons.append(f"{entry['cells']} script cells")
+    if packages & set(entry.get("imports", [])):
+        score += 1
+        reasons.append("imports the repo package")
+    return round(score, 2), reasons
+
+
+def rank(index: Dict[str, Any], top: int = 40, tutorial_filter: Optional[str] = None) -> Dict[str, Any]:
+    """Shortlist of tutorial candidates, best first, following the scanner's rules."""
+    docs_links: Set[str] = set()
+    for entry in index["files"]:
+        if entry["path"].split("/", 1)[0] == "docs":
+            docs_links.update(entry.get("links", []))
+    packages = set(index.get("packages", []))
+
+    tutorial_files = [e for e in index["files"] if e["type"] in ("notebook", "markdown")]
+    # Scripts only count when the repo has no notebook or Markdown tutorials
+    has_tutorials = any(
+        (e["type"] == "notebook" and e.get("code_cells", 0) > 0) or e.get("python_blocks", 0) > 0
+        for e in tutorial_files
+    )
+    kinds = {"notebook", "markdown"} if has_tutorials else {"notebook", "markdown", "script"}
+
+    ranked, excluded = [], {}
+    for entry in index["files"]:
+        if entry["type"] not in kinds:
+            continue
+        score, reasons = score_entry(entry, docs_links, packages)
+        if score is None:
+            excluded[entry["path"]] = reasons[0]
+            continue
+        if tutorial_filter:
+            wanted = tutorial_filter.lower()
+            title = (entry.get("title") or "").lower()
+            if wanted not in entry["path"].lower() and wanted != title:
+                continue
+        ranked.append(
+            {
+                "path": entry["path"],
+                "type": entry["type"],
+                "score": score,
+                "title": entry.get("title"),
+                "reasons": reasons,
+                "bytes": entry["bytes"],
+                "imports": entry.get("imports", [])[:15],
+                "headings": entry.get("headings", [])[:8],
+            }
+        )
+    ranked.sort(key=lambda e: (-e["score"], e["path"]))
+    return {
+        "repo": index["repo"],
+        "key": index["key"],
+        "filter": tutorial_filter,
+        "scripts_considered": not has_tutorials,
+        "candidates": len(ranked),
+        "shortlist": ranked[:top],
+        "excluded": excluded,
+    }
+
+
+def print_shortlist(shortlist: Dict[str, Any], limit: int):
+    for i, entry in enumerate(shortlist["shortlist"][:limit], 1):
+        print(f"  {i:3d}. {entry['score']:6.2f}  {entry['path']}  ({'; '.join(entry['reasons'])})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index a repository and rank its tutorial candidates.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Index repo/<name> and write the ranked shortlist")
+    build.add_argument("repo_dir", help="Repository directory (repo/<name>)")
+    build.add_argument("--output", default=str(INDEX), help=f"Index JSON (default: {INDEX})")
+    build.add_argument(
+        "--shortlist", default=str(SHORTLIST), help=f"Shortlist JSON (default: {SHORTLIST})"
+    )
+    build.add_argument("--top", type=int, default=40, help="Shortlist length (default: 40)")
+    build.add_argument("--filter", dest="tutorial_filter", help="Tutorial filter (path substring or title)")
+    build.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    build.add_argument("--rebuild", action="store_true", help="Ignore the cached index")
+    show = sub.add_parser("show", help="Print the ranked shortlist of an index")
+    show.add_argument("index", help="Index JSON")
+    show.add_argument("--top", type=int, default=20)
+    show.add_argument("--filter", dest="tutorial_filter", help="Tutorial filter (path substring or title)")
+
+    args = parser.parse_args()
+    if args.command == "show":
+        if not Path(args.index).exists():
+            print(f"Error: {args.index} does not exist", file=sys.stderr)
+            sys.exit(1)
+        print_shortlist(rank(load_path(args.index), args.top, args.tutorial_filter), args.top)
+        return
+
+    repo_dir = Path(args.repo_dir).resolve()
+    if not repo_dir.is_dir():
+        print(f"Error: {args.repo_dir} is not a directory", file=sys.stderr)
+        sys.exit(1)
+    output = Path(args.output)
+    previous = None
+    if output.exists() and not args.rebuild:
+        try:
+            previous = load_path(output)
+        except ValueError:
+            previous = None
+    index = build_index(repo_dir, previous, args.workers)
+    if not index["cached"]:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        dump_path(index, output, indent=None)
+    shortlist = rank(index, args.top, args.tutorial_filter)
+    Path(args.shortlist).parent.mkdir(parents=True, exist_ok=True)
+    dump_path(shortlist, args.shortlist)
+
+    counts: Dict[str, int] = {}
+    for entry in index["files"]:
+        counts[entry["type"]] = counts.get(entry["type"], 0) + 1
+    print_shortlist(shortlist, min(args.top, 10))
+    print(f"\nSummary:")
+    print(f"  Repository: {index['repo']} ({index['total_files']} files listed by {index['lister']})")
+    print(f"  Indexed: {', '.join(f'{n} {kind}' for kind, n in sorted(counts.items()))}")
+    if index["cached"]:
+        print(f"  Index: unchanged tree, reused {output}")
+    else:
+        print(f"  Index: read {index['read']} files in {index['seconds']:.2f}s -> {output}")
+    print(
+        f"  Shortlist: {len(shortlist['shortlist'])} of {shortlist['candidates']} candidates "
+        f"({len(shortlist['excluded'])} excluded, scripts "
+        f"{'considered' if shortlist['scripts_considered'] else 'skipped'}) -> {args.shortlist}"
+    )
+    print(f"  Size: {len(dumps(index, indent=None)) / 1024:.1f} KB index")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Sequential early stopping for repeated benchmark assessments.
+
+When benchmark_assessor.py runs with --baseline, each new score is compared
+with the baseline run's score for the same question, and the run stops once
+the answer is clear:
+
+1. Questions are ordered by historical informativeness: questions whose
+   scores in the baseline and --history runs sit between 0 and 1, or flip
+   between runs, come first; questions every run got right (or wrong) last.
+2. The paired differences (new score - baseline score) keep a running mean
+   and a normal-approximation confidence interval. The variance includes two
+   pseudo-differences of +1 and -1 (the largest possible, for scores in
+   [0, 1]), so a run of identical differences - common with 0/1 judge
+   scores - does not give a zero-width interval and an instant decision;
+   e.g. 20 unchanged questions are consistent with a 10% regression.
+3. After at least `min_questions` paired scores, the run stops as
+   "improved" / "regressed" when the interval excludes 0, or as "no_change"
+   when it lies within +/- `margin`. Otherwise it ends "inconclusive" once
+   every question has been assessed.
+
+The interval is checked after every question, so the default confidence is
+0.99 to keep the repeated looks from producing false alarms.
+
+Usage:
+    python tools/benchmark_assessor.py ... --baseline results/previous_results.csv
+    python tools/sequential_assessment.py compare results/previous_results.csv results/new_results.csv
+"""
+
+import sys
+import csv
+import math
+import argparse
+import threading
+from pathlib import Path
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional
+
+
+def load_scores(results_csv: Path) -> Dict[str, float]:
+    """question_id -> score of a results CSV (unscored rows are left out)."""
+    scores: Dict[str, float] = {}
+    with open(results_csv, "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            try:
+                scores[row["question_id"]] = float(row["score"])
+            except (KeyError, TypeError, ValueError):
+                continue
+    return scores
+
+
+def informativeness(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    """
+    How much a question's next score is expected to tell, from earlier runs.
+
+    The Bernoulli variance of the smoothed mean score (0.25 at most) plus the
+    variance between runs; questions no run scored are not included.
+    """
+    by_question: Dict[str, List[float]] = {}
+    for run in runs:
+        for question_id, score in run.items():
+            by_question.setdefault(question_id, []).append(score)
+    info = {}
+    for question_id, scores in by_question.items():
+        p = (sum(scores) + 0.5) / (len(scores) + 1)
+        mean = sum(scores) / len(scores)
+        spread = sum((s - mean) ** 2 for s in scores) / len(scores)
+        info[question_id] = p * (1 - p) + spread
+    return info
+
+
+def order_questions(
+    questions: List[Dict[str, Any]], runs: List[Dict[str, float]]
+) -> List[int]:
+    """Indexes of `questions`, most informative first (unseen questions first of all)."""
+    info = informativeness(runs)
+    unseen = 1.0  # above any p(1-p) + spread of scores in [0, 1]
+    return sorted(
+        range(len(questions)),
+        key=lambda i: -info.get(questions[i].get("question_id", ""), unseen),
+    )
+
+
+class SequentialMonitor:
+    """Running confidence interval of paired score differences against a baseline."""
+
+    def __init__(
+        self,
+        baseline: Dict[str, float],
+        confidence: float = 0.99,
+        margin: float = 0.05,
+        min_questions: int = 20,
+    ):
+        self.baseline = baseline
+        self.confidence = confidence
+        self.margin = margin
+        self.min_questions = min_questions
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.lock = threading.Lock()
+        self.diffs: List[float] = []
+        self.unpaired = 0
+        self.decision: Optional[str] = None
+
+    def interval(self) -> Dict[str, Any]:
+        n = len(self.diffs)
+        if n == 0:
+            return {"n": 0, "mean": None, "low": None, "high": None}
+        mean = sum(self.diffs) / n
+        # Pseudo-differences +1 and -1 floor the variance (see module docstring)
+        squares = sum((d - mean) ** 2 for d in self.diffs) + (1 - mean) ** 2 + (1 + mean) ** 2
+        var = squares / (n + 1)
+        half = self.z * math.sqrt(var / n)
+        return {"n": n, "mean": round(mean, 4), "low": round(mean - half, 4), "high": round(mean + half, 4)}
+
+    def add(self, question_id: str, score: Any) -> Optional[str]:
+        """Record a new score; returns the stopping decision once there is one."""
+        with self.lock:
+            if self.decision:
+                return self.decision
+            try:
+                new = float(score)
+            except (TypeError, ValueError):
+                return None  # unscored (failed call): no evidence either way
+            if question_id not in self.baseline:
+                self.unpaired += 1
+                return None
+            self.diffs.append(new - self.baseline[question_id])
+            if len(self.diffs) >= self.min_questions:
+                self.decision = self.decide()
+            return self.decision
+
+    def decide(self) -> Optional[str]:
+        """Decision supported by the current interval (None: keep going)."""
+        ci = self.interval()
+        if ci["n"] == 0:
+            return None
+        if ci["low"] > 0:
+            return "improved"
+        if ci["high"] < 0:
+            return "regressed"
+        if -self.margin <= ci["low"] and ci["high"] <= self.margin:
+            return "no_change"
+        return None
+
+    def summary(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "decision": self.decision or "inconclusive",
+                "confidence": self.confidence,
+                "margin": self.margin,
+                "unpaired": self.unpaired,
+                **self.interval(),
+            }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two assessment runs question by question.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    compare = sub.add_parser("compare", help="Paired confidence interval of new - baseline scores")
+    compare.add_argument("baseline", help="Baseline results CSV")
+    compare.add_argument("new", help="New results CSV")
+    compare.add_argument("--confidence", type=float, default=0.95, help="Confidence level (default: 0.95)")
+    compare.add_argument("--margin", type=float, default=0.05, help="No-change margin (default: 0.05)")
+
+    args = parser.parse_args()
+    for path in (args.baseline, args.new):
+        if not Path(path).exists():
+            print(f"Error: {path} does not exist", file=sys.stderr)
+            sys.exit(1)
+
+    # A single look at two complete runs
+    new_scores = load_scores(Path(args.new))
+    monitor = SequentialMonitor(
+        load_scores(Path(args.baseline)), args.confidence, args.margin, len(new_scores) + 1
+    )
+    for question_id, score in new_scores.items():
+        monitor.add(question_id, score)
+    monitor.decision = monitor.decide()
+
+    summary = monitor.summary()
+    print("\nSummary:")
+    print(f"  Paired questions:  {summary['n']} ({summary['unpaired']} not in the baseline)")
+    if summary["n"]:
+        print(
+            f"  Mean difference:   {summary['mean']:+.4f} "
+            f"({args.confidence:.0%} CI {summary['low']:+.4f} .. {summary['high']:+.4f})"
+        )
+    print(f"  Decision:          {summary['decision']}")
+
+
+if __name__ == "__main__":
+    main()
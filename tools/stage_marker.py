@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Content-hash stage markers for the pipeline.
+
+A marker is a small JSON file under .pipeline/ that records the hashes of a
+stage's inputs (files/directories and plain key=value pairs such as a repo HEAD
+commit or a tool version) and of its outputs. A stage is up to date only when
+every recorded hash still matches, so changed inputs or modified/deleted outputs
+trigger a rerun instead of silently reusing stale results.
+
+Usage from shell scripts:
+    python tools/stage_marker.py check  <marker> --input DIR --value head=SHA --output DIR
+    python tools/stage_marker.py record <marker> --input DIR --value head=SHA --output DIR
+
+`check` exits 0 when the stage is up to date and 1 (with the reason on stderr)
+when it must rerun.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Directories that never contribute to a stage fingerprint
+IGNORED_DIRS = {".git", "__pycache__", ".pytest_cache", ".ipynb_checkpoints"}
+
+MISSING = "missing"
+
+
+def hash_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Return the sha256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_path(path: Path) -> str:
+    """
+    Hash a file or a directory tree.
+
+    Directory hashes cover relative paths and file contents, so renames,
+    additions and deletions all change the result. Symlinks are followed.
+    """
+    if not path.exists():
+        return MISSING
+    if path.is_file():
+        return hash_file(path)
+
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(path, followlinks=True):
+        dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRS)
+        for name in sorted(files):
+            file_path = Path(root) / name
+            rel = file_path.relative_to(path).as_posix()
+            digest.update(rel.encode("utf-8") + b"\0")
+            digest.update(hash_file(file_path).encode("ascii") + b"\n")
+    return digest.hexdigest()
+
+
+def parse_values(values: Optional[List[str]]) -> Dict[str, str]:
+    """Parse key=value pairs from the command line."""
+    parsed = {}
+    for item in values or []:
+        if "=" not in item:
+            raise ValueError(f"Expected key=value, got: {item}")
+        key, value = item.split("=", 1)
+        parsed[key] = value
+    return parsed
+
+
+def fingerprint(
+    inputs: Optional[List[str]] = None,
+    values: Optional[Dict[str, str]] = None,
+    outputs: Optional[List[str]] = None,
+    exists: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, str]]:
+    """Build the marker payload for the given inputs and outputs."""
+    # Key by absolute path so relative and absolute invocations agree
+    return {
+        "inputs": {os.path.abspath(p): hash_path(Path(p)) for p in inputs or []},
+        "values": dict(values or {}),
+        "outputs": {os.path.abspath(p): hash_path(Path(p)) for p in outputs or []},
+        "exists": {os.path.abspath(p): str(Path(p).exists()) for p in exists or []},
+    }
+
+
+def load_marker(marker_path: Path) -> Optional[Dict]:
+    """Load a marker, returning None for missing or legacy (empty) markers."""
+    try:
+        with open(marker_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def check_marker(marker_path: Path, current: Dict) -> Tuple[bool, str]:
+    """
+    Compare a stored marker with the current fingerprint.
+
+    Returns:
+        (up_to_date, reason)
+    """
+    stored = load_marker(marker_path)
+    if stored is None:
+        return False, f"no content-hash marker at {marker_path}"
+
+    for section in ("inputs", "values", "outputs", "exists"):
+        old = stored.get(section, {})
+        new = current.get(section, {})
+        if set(old) != set(new):
+            return False, f"{section} changed: {sorted(set(old) ^ set(new))}"
+        for key, value in new.items():
+            if section == "exists" and value != "True":
+                return False, f"required output missing: {key}"
+            if old[key] != value:
+                return False, f"{section[:-1]} changed: {key}"
+    return True, "up to date"
+
+
+def record_marker(marker_path: Path, current: Dict, stage: Optional[str] = None):
+    """Write the fingerprint to the marker file atomically."""
+    payload = dict(current)
+    payload["stage"] = stage or marker_path.name
+    payload["recorded_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    marker_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = marker_path.with_suffix(marker_path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, marker_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check or record a content-hash pipeline stage marker."
+    )
+    parser.add_argument("action", choices=["check", "record"])
+    parser.add_argument("marker", help="Path to the marker file (e.g. .pipeline/01_setup_done)")
+    parser.add_argument(
+        "--input", action="append", default=[], help="Input file or directory (repeatable)"
+    )
+    parser.add_argument(
+        "--value", action="append", default=[], help="Input key=value such as head=<sha>"
+    )
+    parser.add_argument(
+        "--output", action="append", default=[], help="Output file or directory to hash"
+    )
+    parser.add_argument(
+        "--exists", action="append", default=[], help="Output that only needs to exist"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        current = fingerprint(
+            args.input, parse_values(args.value), args.output, args.exists
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    marker_path = Path(args.marker)
+    if args.action == "check":
+        up_to_date, reason = check_marker(marker_path, current)
+        print(f"{marker_path.name}: {reason}", file=sys.stderr)
+        sys.exit(0 if up_to_date else 1)
+
+    record_marker(marker_path, current)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Content-addressed transcript store for assessor results.
+
+Agent responses and full CLI transcripts are written once per distinct
+content as <root>/<sha[:2]>/<sha>.zst (zstandard, when installed) or .gz
+(gzip). The results CSV keeps only the sha256 reference and a short preview,
+so it stays small enough to rewrite after every question and to load quickly.
+
+load_results() reads a results CSV into rows that fetch `agent_response` and
+`full_agent_response` from the store only when those keys are accessed.
+
+Usage:
+    python tools/transcript_store.py get results/benchmark_results_transcripts <sha256>
+    python tools/transcript_store.py stats results/benchmark_results_transcripts
+"""
+
+import os
+import sys
+import csv
+import gzip
+import hashlib
+import argparse
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import zstandard
+
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+PREVIEW_CHARS = 200
+# Result columns stored by reference: full column -> reference column
+REFERENCED = {
+    "agent_response": "agent_response_ref",
+    "full_agent_response": "transcript_ref",
+}
+
+
+def preview(text: str, limit: int = PREVIEW_CHARS) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+class TranscriptStore:
+    """Compressed blobs keyed by the sha256 of their text."""
+
+    def __init__(self, root: Path, level: Optional[int] = None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.suffix = ".zst" if HAS_ZSTD else ".gz"
+        self.level = level if level is not None else (10 if HAS_ZSTD else 6)
+
+    def _path(self, ref: str, suffix: str) -> Path:
+        return self.root / ref[:2] / f"{ref}{suffix}"
+
+    def _compress(self, data: bytes) -> bytes:
+        if HAS_ZSTD:
+            return zstandard.ZstdCompressor(level=self.level).compress(data)
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def put(self, text: str) -> str:
+        """Store text (once per distinct content) and return its reference ("" for empty)."""
+        if not text:
+            return ""
+        data = text.encode("utf-8")
+        ref = hashlib.sha256(data).hexdigest()
+        if self.exists(ref):
+            return ref
+        path = self._path(ref, self.suffix)
+        path.parent.mkdir(exist_ok=True)
+        # Threads share a PID; concurrent writers of the same content need their own tmp file
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp.write_bytes(self._compress(data))
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            if not path.exists():
+                raise
+        return ref
+
+    def exists(self, ref: str) -> bool:
+        return any(self._path(ref, suffix).exists() for suffix in (".zst", ".gz"))
+
+    def get(self, ref: str) -> str:
+        """Text of a reference ("" for an empty reference); KeyError if missing."""
+        if not ref:
+            return ""
+        zst = self._path(ref, ".zst")
+        if zst.exists():
+            if not HAS_ZSTD:
+                raise RuntimeError(f"{zst} needs zstandard: pip install zstandard")
+            return zstandard.ZstdDecompressor().decompress(zst.read_bytes()).decode("utf-8")
+        gz = self._path(ref, ".gz")
+        if gz.exists():
+            return gzip.decompress(gz.read_bytes()).decode("utf-8")
+        raise KeyError(ref)
+
+    def stats(self) -> Dict[str, Any]:
+        blobs = [p for p in self.root.glob("??/*") if p.suffix in (".zst", ".gz")]
+        return {
+            "blobs": len(blobs),
+            "compressed_bytes": sum(p.stat().st_size for p in blobs),
+        }
+
+
+class ResultRow(dict):
+    """A results CSV row that loads referenced text from the store on first access."""
+
+    def __init__(self, row: Dict[str, str], store: Optional[TranscriptStore]):
+        super().__init__(row)
+        self._store = store
+
+    def __missing__(self, key: str) -> str:
+        ref_key = REFERENCED.get(key)
+        if ref_key is None or ref_key not in self or self._store is None:
+            raise KeyError(key)
+        value = self._store.get(dict.__getitem__(self, ref_key))
+        self[key] = value
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+def store_for(results_csv: Path) -> Path:
+    """Default store next to a results CSV: <stem>_transcripts/."""
+    results_csv = Path(results_csv)
+    return results_csv.with_name(f"{results_csv.stem}_transcripts")
+
+
+def load_results(results_csv: Path, store_root: Optional[Path] = None) -> List[ResultRow]:
+    """Rows of a results CSV; referenced transcripts are fetched lazily."""
+    root = Path(store_root) if store_root else store_for(results_csv)
+    store = TranscriptStore(root) if root.exists() else None
+    with open(results_csv, "r", encoding="utf-8") as f:
+        return [ResultRow(row, store) for row in csv.DictReader(f)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read the assessor's transcript store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    get = sub.add_parser("get", help="Print a stored transcript")
+    get.add_argument("store", help="Store directory")
+    get.add_argument("ref", help="sha256 reference from the results CSV")
+    stats = sub.add_parser("stats", help="Blob count and size")
+    stats.add_argument("store", help="Store directory")
+
+    args = parser.parse_args()
+    if not Path(args.store).is_dir():
+        print(f"Error: {args.store} is not a directory", file=sys.stderr)
+        sys.exit(1)
+    store = TranscriptStore(Path(args.store))
+
+    if args.command == "get":
+        try:
+            sys.stdout.write(store.get(args.ref))
+        except KeyError:
+            print(f"Error: {args.ref} not in {args.store}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    info = store.stats()
+    print(f"{info['blobs']} transcripts, {info['compressed_bytes'] / 1e6:.2f} MB compressed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,660 @@
+#!/usr/bin/env python3
+"""
+Parallel Tutorial Executor
+
+Runs the tutorials selected by the tutorial scanner concurrently, one kernel each:
+1. Reads reports/tutorial-scanner-include-in-tools.json and prepares
+   notebooks/<tutorial>/<tutorial>_execution.ipynb (copy or jupytext conversion,
+   outputs cleared, DPI-300 configuration cell added).
+2. Executes up to --workers notebooks at once. Every notebook runs in its own
+   worker process whose memory (RLIMIT_AS) and CPU time (RLIMIT_CPU) limits are
+   inherited by its kernel, with BLAS/OpenMP threads capped so concurrent
+   kernels do not oversubscribe the machine.
+3. Enforces a per-cell timeout and records per-cell wall time and status.
+   With --cell-cache, a re-run restores unchanged cells and resumes from the
+   first changed or failed one (see cell_cache.py).
+4. Writes <tutorial>_execution_v<N>.ipynb, then the cleaned/final notebooks and
+   images, and updates reports/executed_notebooks.json.
+
+Usage:
+    python tools/tutorial_executor.py run <PROJECT_DIR> --python <repo>-env/bin/python --workers 4
+    python tools/tutorial_executor.py execute <IN.ipynb> <OUT.ipynb> --timing timing.json
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import shutil
+import signal
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from cell_cache import (
+    DUMP_CODE,
+    LOAD_CODE,
+    CellCache,
+    cell_keys,
+    plan_resume,
+    renumber_execution_counts,
+    restore_cell,
+)
+from notebook_postprocess import postprocess_notebook
+from pipeline_orchestrator import find_source_notebook
+
+SCANNER_REPORT = Path("reports") / "tutorial-scanner-include-in-tools.json"
+EXECUTED_REPORT = Path("reports") / "executed_notebooks.json"
+TIMING_REPORT = Path("reports") / "execution_timing.json"
+
+DPI_CELL = (
+    "import matplotlib.pyplot as plt\n"
+    'plt.rcParams["figure.dpi"] = 300       # resolution of figures when shown\n'
+    'plt.rcParams["savefig.dpi"] = 300       # resolution when saving with plt.savefig'
+)
+THREAD_VARS = [
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+]
+
+
+def snake_case(name: str) -> str:
+    """Data-Processing-Tutorial -> data_processing_tutorial"""
+    name = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", name)
+    name = re.sub(r"[^0-9a-zA-Z]+", "_", name)
+    return name.strip("_").lower() or "tutorial"
+
+
+def load_selected_tutorials(project_dir: Path, repo_dir: Path) -> List[Dict[str, Any]]:
+    """Tutorials marked include_in_tools, with their snake_case names and paths."""
+    report = project_dir / SCANNER_REPORT
+    with open(report, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    selected = []
+    seen: Dict[str, int] = {}
+    for entry in data.get("tutorials", []):
+        if not entry.get("include_in_tools"):
+            continue
+        rel = entry["path"]
+        source = repo_dir / rel
+        if not source.exists() and (project_dir / rel).exists():
+            source = project_dir / rel
+        name = snake_case(Path(rel).stem)
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            name = f"{name}_{seen[name]}"
+        selected.append({"name": name, "source": source, "title": entry.get("title", "")})
+    return selected
+
+
+def github_blob_url(repo_dir: Path, source: Path) -> str:
+    """https://github.com/<owner>/<repo>/blob/<branch>/<path> for a file in repo_dir."""
+    def git(*args: str) -> str:
+        result = subprocess.run(
+            ["git", "-C", str(repo_dir), *args], capture_output=True, text=True
+        )
+        return result.stdout.strip() if result.returncode == 0 else ""
+
+    remote = git("remote", "get-url", "origin")
+    match = re.search(r"github\.com[:/](.+?)(?:\.git)?/?$", remote)
+    base = f"https://github.com/{match.group(1)}" if match else remote
+    branch = git("branch", "--show-current") or "main"
+    try:
+        rel = source.resolve().relative_to(repo_dir.resolve()).as_posix()
+    except ValueError:
+        rel = source.name
+    return f"{base}/blob/{branch}/{rel}"
+
+
+def prepare_notebook(source: Path, target: Path, python: str):
+    """Create the execution notebook with cleared outputs and the DPI cell first."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if source.suffix == ".ipynb":
+        shutil.copyfile(source, target)
+    else:
+        result = subprocess.run(
+            [python, "-m", "jupytext", "--to", "notebook", str(source), "-o", str(target)],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"jupytext failed for {source}: {result.stderr[-1000:]}")
+
+    with open(target, "r", encoding="utf-8") as f:
+        nb = json.load(f)
+
+    for cell in nb.get("cells", []):
+        if cell.get("cell_type") == "code":
+            cell["outputs"] = []
+            cell["execution_count"] = None
+
+    cells = nb.setdefault("cells", [])
+    first = "".join(cells[0].get("source", [])) if cells else ""
+    if "figure.dpi" not in first:
+        dpi_cell = {
+            "cell_type": "code",
+            "execution_count": None,
+            "metadata": {},
+            "outputs": [],
+            "source": DPI_CELL,
+        }
+        if nb.get("nbformat", 4) >= 4 and nb.get("nbformat_minor", 0) >= 5:
+            dpi_cell["id"] = uuid.uuid4().hex[:8]
+        cells.insert(0, dpi_cell)
+
+    with open(target, "w", encoding="utf-8") as f:
+        json.dump(nb, f, indent=1, ensure_ascii=False)
+        f.write("\n")
+
+
+def next_version_path(tutorial_dir: Path, tutorial: str) -> Path:
+    latest = find_source_notebook(tutorial_dir, tutorial)
+    match = re.search(r"_execution_v(\d+)\.ipynb$", latest.name) if latest else None
+    version = int(match.group(1)) + 1 if match else 1
+    return tutorial_dir / f"{tutorial}_execution_v{version}.ipynb"
+
+
+def apply_resource_limits(memory_mb: Optional[int], cpu_seconds: Optional[int]):
+    """Cap this process; the kernel it starts inherits the limits."""
+    try:
+        import resource
+    except ImportError:
+        print("Warning: resource limits are not supported on this platform", file=sys.stderr)
+        return
+    if memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if cpu_seconds:
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+
+
+def peak_child_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_helper(client, code: str) -> bool:
+    """Run code in the kernel outside the notebook (no history, outputs dropped)."""
+    import nbformat
+    from nbclient.exceptions import CellExecutionError
+
+    try:
+        client.execute_cell(nbformat.v4.new_code_cell(code), -1, store_history=False)
+    except CellExecutionError:
+        return False
+    return True
+
+
+def execute_notebook(
+    input_path: Path,
+    output_path: Path,
+    cwd: Path,
+    cell_timeout: int,
+    kernel_name: str,
+    cache_dir: Optional[Path] = None,
+    checkpoint_seconds: float = 0,
+) -> Dict[str, Any]:
+    """Execute one notebook with nbclient, returning per-cell timing.
+
+    With cache_dir, cached cells are restored and execution resumes from the
+    latest kernel checkpoint before the first changed or failed cell.
+    """
+    import nbformat
+    from nbclient import NotebookClient
+    from nbclient.exceptions import CellExecutionError, CellTimeoutError, DeadKernelError
+
+    nb = nbformat.read(str(input_path), as_version=4)
+    cells: Dict[int, Dict[str, Any]] = {}
+    started: Dict[int, float] = {}
+
+    def on_cell_start(cell, cell_index):
+        if cell_index >= 0:
+            started[cell_index] = time.perf_counter()
+
+    def on_cell_executed(cell, cell_index, execute_reply):
+        if cell_index < 0:
+            return
+        content = execute_reply.get("content", {}) if execute_reply else {}
+        elapsed = time.perf_counter() - started.get(cell_index, time.perf_counter())
+        cells[cell_index] = {
+            "index": cell_index,
+            "execution_count": cell.get("execution_count"),
+            "seconds": round(elapsed, 3),
+            "status": content.get("status", "ok"),
+            "error": content.get("ename", ""),
+        }
+
+    client = NotebookClient(
+        nb,
+        timeout=cell_timeout,
+        kernel_name=kernel_name,
+        resources={"metadata": {"path": str(cwd)}},
+        on_cell_start=on_cell_start,
+        on_cell_executed=on_cell_executed,
+    )
+
+    cache = CellCache(cache_dir) if cache_dir else None
+    keys = cell_keys(nb.cells, kernel_name) if cache else [None] * len(nb.cells)
+    restored_upto, checkpoint = plan_resume(keys, cache) if cache else (-1, None)
+    for index in range(restored_upto + 1):
+        entry = cache.get(keys[index])
+        if entry is None:
+            continue
+        restore_cell(nb.cells[index], nbformat.from_dict(entry))
+        cells[index] = {
+            "index": index,
+            "execution_count": entry["execution_count"],
+            "seconds": 0.0,
+            "cached_seconds": entry["seconds"],
+            "status": "cached",
+            "error": "",
+        }
+    checkpoints = []
+
+    status, message = "ok", ""
+    start = time.perf_counter()
+    try:
+        if restored_upto < len(nb.cells) - 1:
+            with client.setup_kernel():
+                info = client.wait_for_reply(client.kc.kernel_info())
+                nb.metadata["language_info"] = info["content"]["language_info"]
+                if cache:
+                    cache.put_language_info(nb.metadata["language_info"])
+                if checkpoint and not run_helper(client, LOAD_CODE.format(path=str(checkpoint))):
+                    raise RuntimeError(f"could not load kernel checkpoint {checkpoint}")
+                for index in range(restored_upto + 1, len(nb.cells)):
+                    client.execute_cell(nb.cells[index], index)
+                    key = keys[index]
+                    if cache is None or key is None:
+                        continue
+                    seconds = cells[index]["seconds"] if index in cells else 0.0
+                    cache.put(key, nb.cells[index], seconds)
+                    if checkpoint_seconds and seconds >= checkpoint_seconds:
+                        path = cache.checkpoint_path(key)
+                        if run_helper(client, DUMP_CODE.format(path=str(path))):
+                            checkpoints.append(index)
+                        else:
+                            path.unlink(missing_ok=True)
+                client.set_widgets_metadata()
+        elif cache and cache.get_language_info():
+            nb.metadata["language_info"] = cache.get_language_info()
+    except CellTimeoutError as e:
+        status, message = "timeout", str(e).splitlines()[0] if str(e) else "cell timed out"
+    except DeadKernelError as e:
+        status, message = "dead_kernel", str(e) or "kernel died (resource limit?)"
+    except CellExecutionError as e:
+        status, message = "error", getattr(e, "ename", "") or str(e).splitlines()[-1]
+    except RuntimeError as e:
+        status, message = "error", str(e)
+    wall = time.perf_counter() - start
+
+    # The cell that was running when execution stopped never reported back
+    for index in started:
+        if index not in cells:
+            cells[index] = {
+                "index": index,
+                "execution_count": nb.cells[index].get("execution_count"),
+                "seconds": round(time.perf_counter() - started[index], 3),
+                "status": status,
+                "error": message,
+            }
+
+    if cache:
+        renumber_execution_counts(nb.cells)
+        if status == "ok":
+            cache.prune([k for k in keys if k is not None])
+
+    # Keep partial outputs so the failing cell can be inspected, like papermill
+    nbformat.write(nb, str(output_path))
+
+    code_cells = sum(1 for c in nb.cells if c.cell_type == "code")
+    return {
+        "notebook": str(output_path),
+        "status": status,
+        "message": message,
+        "wall_seconds": round(wall, 3),
+        "cells_executed": sum(1 for c in cells.values() if c["status"] != "cached"),
+        "cells_cached": sum(1 for c in cells.values() if c["status"] == "cached"),
+        "resumed_after": restored_upto if checkpoint else None,
+        "checkpoints": checkpoints,
+        "code_cells": code_cells,
+        "kernel_max_rss_mb": peak_child_rss_mb(),
+        "cells": [cells[i] for i in sorted(cells)],
+    }
+
+
+class TutorialRun:
+    """Prepare, execute (with retries) and post-process one tutorial."""
+
+    def __init__(self, tutorial: Dict[str, Any], args: argparse.Namespace, project_dir: Path):
+        self.name = tutorial["name"]
+        self.source = tutorial["source"]
+        self.args = args
+        self.project_dir = project_dir
+        self.tutorial_dir = project_dir / "notebooks" / self.name
+        self.timing_path = self.tutorial_dir / f"{self.name}_execution_timing.json"
+
+    def worker_env(self) -> Dict[str, str]:
+        env = dict(os.environ)
+        for var in THREAD_VARS:
+            env[var] = str(self.args.threads)
+        return env
+
+    def execute_once(self, input_path: Path, output_path: Path) -> Dict[str, Any]:
+        cmd = [
+            self.args.python,
+            str(Path(__file__).resolve()),
+            "execute",
+            str(input_path),
+            str(output_path),
+            "--timing",
+            str(self.timing_path),
+            "--cwd",
+            str(self.project_dir),
+            "--cell-timeout",
+            str(self.args.cell_timeout),
+            "--kernel",
+            self.args.kernel,
+        ]
+        if self.args.memory_mb:
+            cmd += ["--memory-mb", str(self.args.memory_mb)]
+        if self.args.cpu_seconds:
+            cmd += ["--cpu-seconds", str(self.args.cpu_seconds)]
+        if self.args.cell_cache:
+            cache_dir = self.project_dir / ".pipeline" / "cell_cache" / self.name
+            cmd += ["--cell-cache", str(cache_dir)]
+            cmd += ["--checkpoint-seconds", str(self.args.checkpoint_seconds)]
+
+        self.timing_path.unlink(missing_ok=True)
+        # Own session so a notebook timeout takes the kernel down with the worker
+        proc = subprocess.Popen(
+            cmd,
+            cwd=str(self.project_dir),
+            env=self.worker_env(),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=True,
+        )
+        try:
+            _, stderr = proc.communicate(timeout=self.args.notebook_timeout or None)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.communicate()
+            return {"status": "timeout", "message": "notebook timeout exceeded", "cells": []}
+
+        if self.timing_path.exists():
+            with open(self.timing_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {
+            "status": "worker_failed",
+            "message": stderr.strip().splitlines()[-1] if stderr.strip() else "",
+            "cells": [],
+        }
+
+    def run(self) -> Dict[str, Any]:
+        execution = self.tutorial_dir / f"{self.name}_execution.ipynb"
+        if self.args.fresh or not execution.exists():
+            prepare_notebook(self.source, execution, self.args.python)
+
+        attempts = []
+        start = time.perf_counter()
+        for _ in range(self.args.attempts):
+            output = next_version_path(self.tutorial_dir, self.name)
+            result = self.execute_once(execution, output)
+            result["notebook"] = os.path.relpath(output, self.project_dir)
+            attempts.append(result)
+            if result["status"] == "ok":
+                break
+
+        summary: Dict[str, Any] = {
+            "tutorial": self.name,
+            "source": str(self.source),
+            "status": attempts[-1]["status"],
+            "attempts": len(attempts),
+            "wall_seconds": round(time.perf_counter() - start, 3),
+            "runs": attempts,
+        }
+        if summary["status"] == "ok" and not self.args.no_postprocess:
+            try:
+                executed = self.project_dir / attempts[-1]["notebook"]
+                result = postprocess_notebook(
+                    executed,
+                    self.tutorial_dir,
+                    self.name,
+                    self.project_dir / ".paper2agent-sanitize.yaml",
+                )
+                summary["execution_path"] = os.path.relpath(result["final"], self.project_dir)
+            except (OSError, ValueError) as e:
+                summary["status"] = "postprocess_failed"
+                summary["message"] = str(e)
+        elif summary["status"] == "ok":
+            summary["execution_path"] = attempts[-1]["notebook"]
+
+        with open(self.timing_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+
+def previous_durations(project_dir: Path) -> Dict[str, float]:
+    path = project_dir / TIMING_REPORT
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {t["tutorial"]: t.get("wall_seconds", 0.0) for t in data.get("tutorials", [])}
+
+
+def update_executed_report(
+    project_dir: Path,
+    repo_dir: Path,
+    tutorials: List[Dict[str, Any]],
+    results: List[Dict[str, Any]],
+):
+    """Add successful tutorials to executed_notebooks.json and drop failed ones."""
+    path = project_dir / EXECUTED_REPORT
+    report: Dict[str, Any] = {}
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            report = json.load(f)
+    sources = {t["name"]: t["source"] for t in tutorials}
+    for result in results:
+        name = result["tutorial"]
+        if result["status"] == "ok":
+            report[name] = {
+                "execution_path": result["execution_path"],
+                "http_url": github_blob_url(repo_dir, sources[name]),
+            }
+        else:
+            report.pop(name, None)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+def find_repo_dir(project_dir: Path, repo_dir: Optional[str]) -> Path:
+    if repo_dir:
+        return Path(repo_dir).resolve()
+    candidates = [p for p in sorted((project_dir / "repo").glob("*")) if p.is_dir()]
+    if len(candidates) != 1:
+        print(
+            f"Error: expected one repository under {project_dir / 'repo'}, "
+            f"found {len(candidates)}; pass --repo-dir",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    return candidates[0]
+
+
+def run_command(args: argparse.Namespace):
+    project_dir = Path(args.project_dir).resolve()
+    if not (project_dir / SCANNER_REPORT).exists():
+        print(f"Error: {project_dir / SCANNER_REPORT} does not exist", file=sys.stderr)
+        sys.exit(1)
+    if args.workers < 1 or args.attempts < 1:
+        print("Error: --workers and --attempts must be at least 1", file=sys.stderr)
+        sys.exit(1)
+    repo_dir = find_repo_dir(project_dir, args.repo_dir)
+
+    tutorials = load_selected_tutorials(project_dir, repo_dir)
+    if args.only:
+        tutorials = [t for t in tutorials if t["name"] in args.only]
+    missing = [str(t["source"]) for t in tutorials if not t["source"].exists()]
+    if missing:
+        print(f"Error: tutorial files not found: {', '.join(missing)}", file=sys.stderr)
+        sys.exit(1)
+    if not tutorials:
+        print("No tutorials selected for execution", file=sys.stderr)
+        return
+
+    # Longest tutorials first so one slow notebook does not start last
+    durations = previous_durations(project_dir)
+    tutorials.sort(key=lambda t: durations.get(t["name"], float("inf")), reverse=True)
+
+    if args.threads is None:
+        args.threads = max(1, (os.cpu_count() or 1) // args.workers)
+    print(
+        f"Executing {len(tutorials)} tutorials with {args.workers} workers "
+        f"({args.threads} threads per kernel)...",
+        file=sys.stderr,
+    )
+
+    start = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(TutorialRun(t, args, project_dir).run): t["name"] for t in tutorials
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"tutorial": futures[future], "status": "failed", "message": str(e)}
+            results.append(result)
+            print(
+                f"  {result['tutorial']}: {result['status']} "
+                f"({result.get('wall_seconds', 0.0):.1f}s)",
+                file=sys.stderr,
+            )
+    wall = time.perf_counter() - start
+
+    results.sort(key=lambda r: r["tutorial"])
+    update_executed_report(project_dir, repo_dir, tutorials, results)
+    timing_path = project_dir / TIMING_REPORT
+    with open(timing_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"workers": args.workers, "wall_seconds": round(wall, 3), "tutorials": results},
+            f,
+            indent=2,
+        )
+
+    failed = [r for r in results if r["status"] != "ok"]
+    serial = sum(r.get("wall_seconds", 0.0) for r in results)
+    print(f"\nExecution Summary:")
+    print(f"  Tutorials: {len(results)} ({len(results) - len(failed)} ok, {len(failed)} failed)")
+    print(f"  Wall time: {wall:.1f}s (sum of tutorials: {serial:.1f}s)")
+    for r in failed:
+        print(f"  FAILED {r['tutorial']}: {r['status']} {r.get('message', '')}".rstrip())
+    print(f"  Report: {project_dir / EXECUTED_REPORT}")
+    print(f"  Timing: {timing_path}")
+    if failed:
+        sys.exit(1)
+
+
+def execute_command(args: argparse.Namespace):
+    apply_resource_limits(args.memory_mb, args.cpu_seconds)
+    try:
+        result = execute_notebook(
+            Path(args.input),
+            Path(args.output),
+            Path(args.cwd),
+            args.cell_timeout,
+            args.kernel,
+            Path(args.cell_cache) if args.cell_cache else None,
+            args.checkpoint_seconds,
+        )
+    except ImportError as e:
+        print(f"Error: {e}. Install nbclient>=0.6 in the project environment.", file=sys.stderr)
+        sys.exit(1)
+    if args.timing:
+        with open(args.timing, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    print(
+        f"{args.output}: {result['status']} in {result['wall_seconds']:.1f}s "
+        f"({result['cells_executed']} executed, {result['cells_cached']} cached "
+        f"of {result['code_cells']} cells)",
+        file=sys.stderr,
+    )
+    if result["status"] != "ok":
+        sys.exit(1)
+
+
+def add_limit_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--cell-timeout", type=int, default=1800, help="Seconds per cell")
+    parser.add_argument("--kernel", default="python3", help="Jupyter kernel name")
+    parser.add_argument("--memory-mb", type=int, help="Address-space limit per kernel")
+    parser.add_argument("--cpu-seconds", type=int, help="CPU-time limit per kernel")
+    parser.add_argument(
+        "--checkpoint-seconds",
+        type=float,
+        default=30,
+        help="With a cell cache, checkpoint kernel state (dill) after cells this slow; 0 disables",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Execute scanner-selected tutorials concurrently with per-kernel limits."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Execute every tutorial selected by the scanner")
+    run.add_argument("project_dir", help="Project directory")
+    run.add_argument("--python", default=sys.executable, help="Project environment interpreter")
+    run.add_argument("--repo-dir", help="Cloned repository (default: the only repo/<name>)")
+    run.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    run.add_argument("--threads", type=int, help="BLAS/OpenMP threads per kernel")
+    run.add_argument("--attempts", type=int, default=1, help="Executions per tutorial")
+    run.add_argument("--notebook-timeout", type=int, default=0, help="Seconds per notebook")
+    run.add_argument("--only", nargs="+", help="Tutorial names (snake_case) to run")
+    run.add_argument("--fresh", action="store_true", help="Re-create _execution.ipynb")
+    run.add_argument(
+        "--no-postprocess", action="store_true", help="Skip cleaned/final/images outputs"
+    )
+    run.add_argument(
+        "--cell-cache",
+        action="store_true",
+        help="Resume re-runs from cached cells (.pipeline/cell_cache/<tutorial>)",
+    )
+    add_limit_arguments(run)
+
+    execute = sub.add_parser("execute", help="Execute one notebook with per-cell timing")
+    execute.add_argument("input", help="Notebook to execute")
+    execute.add_argument("output", help="Executed notebook path")
+    execute.add_argument("--timing", help="Write per-cell timing JSON here")
+    execute.add_argument("--cwd", default=".", help="Kernel working directory")
+    execute.add_argument("--cell-cache", help="Cell cache directory to resume from")
+    add_limit_arguments(execute)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run_command(args)
+    else:
+        execute_command(args)
+
+
+if __name__ == "__main__":
+    main()